@@ -1,62 +1,594 @@
-from datetime import datetime
-from typing import List
+import json
+import os
+import tempfile
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlmodel import Session, select
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
-from app.db.database import get_session
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+)
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy import Row, insert
+from sqlalchemy.exc import IntegrityError
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.db.bulk_import import ImportFormatError, import_reading_logs
+from app.db.database import engine, get_async_session
+from app.db.export import stream_reading_logs
+from app.db.idempotency import (
+    BULK_ROUTE,
+    CREATE_ROUTE,
+    IdempotencyKeyMismatchError,
+    find_response,
+    request_fingerprint,
+    store_response,
+)
+from app.db.ingest import IngestQueueFullError, create_ingest_queue
+from app.db.listing import list_statement
+from app.db.rollup import apply_daily_deltas, daily_deltas
+from app.db.search import search_reading_logs
+from app.db.stats import reading_stats
+from app.models.reading_log import (
+    ExportFormat,
+    ReadingLogCreate,
+    ReadingLogImportResult,
+    ReadingLogRead,
+    ReadingLogSearchResult,
+    ReadingLogSort,
+    ReadingLogStats,
+    ReadingLogUpdate,
+    StatsBucket,
+    naive_utc,
+)
 from app.models.reading_log import ReadingLog as ReadingLogModel
-from app.models.reading_log import ReadingLogCreate, ReadingLogRead, ReadingLogUpdate
+from app.support.cache import create_cache
+from app.support.etag import etag_matches, make_etag
+from app.support.json_response import FAST_JSON, FastJSONResponse, rows_to_dicts
+from app.support.metrics import registry
+from app.support.pagination import InvalidCursorError, decode_cursor, encode_cursor
+from app.support.request_timing import TimedRoute
 
-router = APIRouter(prefix="/reading-logs", tags=["reading-logs"])
+router = APIRouter(
+    prefix="/reading-logs", tags=["reading-logs"], route_class=TimedRoute
+)
 
+# Maximum number of reading logs accepted by a single bulk create request
+BULK_MAX_BATCH_SIZE = int(os.getenv("BULK_MAX_BATCH_SIZE", "1000"))
 
-@router.post("/", response_model=ReadingLogRead)
-def create_reading_log(
-    *, reading_log: ReadingLogCreate, db: Session = Depends(get_session)
-) -> ReadingLogModel:
-    """Create a new reading log."""
+# Import uploads larger than this are spooled to disk instead of memory
+IMPORT_SPOOL_MAX_MEMORY = 8 * 1024 * 1024
+
+# Read-through cache for single reading logs, keyed by ID and holding the
+# serialized ReadingLogRead. Updates and deletes invalidate their entry after
+# committing; the tombstone that leaves stops racing reads re-caching old rows.
+reading_log_cache = create_cache("reading-logs")
+
+# Write-behind queue for POST /reading-logs, or None when INGEST_MODE=sync.
+# Started and stopped by the application's lifespan.
+ingest_queue = create_ingest_queue()
+
+# Successful reading log operations by kind, exposed on /metrics. Replayed
+# idempotent requests aren't counted.
+reading_log_operations = registry.counter(
+    "reading_log_operations_total",
+    "Successful reading log operations",
+    ("operation",),
+)
+
+# Fields of ReadingLogRead in response order
+READ_FIELDS = tuple(ReadingLogRead.model_fields)
+
+# Columns the list endpoint needs for its cursor and ETag, whatever is returned
+LIST_KEY_FIELDS = ("id", "created_at", "updated_at")
+
+
+def _serialize(reading_log: ReadingLogModel) -> Dict[str, Any]:
+    return ReadingLogRead.model_validate(reading_log, from_attributes=True).model_dump(
+        mode="json"
+    )
+
+
+def _reading_log_etag(data: Dict[str, Any]) -> str:
+    # Every update sets updated_at, so (id, last modification) identifies a version
+    return make_etag(data["id"], data["updated_at"] or data["created_at"])
+
+
+def _parse_fields(fields: Optional[str]) -> Tuple[str, ...]:
+    """Turn a `fields=` sparse fieldset into ReadingLogRead field names."""
+    if fields is None:
+        return READ_FIELDS
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested.difference(READ_FIELDS)
+    if not requested or unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid fields {fields!r}; expected a comma-separated subset of {', '.join(READ_FIELDS)}",
+        )
+    return tuple(name for name in READ_FIELDS if name in requested)
+
+
+def _check_if_match(if_match: Optional[str], reading_log: ReadingLogModel) -> None:
+    if if_match is not None and not etag_matches(
+        if_match, _reading_log_etag(_serialize(reading_log))
+    ):
+        raise HTTPException(
+            status_code=412, detail="Reading log has been modified since it was read"
+        )
+
+
+async def _replay(
+    db: AsyncSession, idempotency_key: str, fingerprint: str
+) -> Optional[JSONResponse]:
+    """The stored response for an Idempotency-Key, if it has been used."""
+    try:
+        record = await find_response(db, idempotency_key, fingerprint)
+    except IdempotencyKeyMismatchError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
+    if record is None:
+        return None
+    return JSONResponse(
+        status_code=record.status_code,
+        content=json.loads(record.response),
+        headers={"Idempotent-Replayed": "true"},
+    )
+
+
+async def _commit(
+    db: AsyncSession, idempotency_key: Optional[str], fingerprint: str
+) -> Optional[JSONResponse]:
+    """
+    Commit, or if a concurrent request with the same Idempotency-Key committed
+    first, roll back and return that request's response instead.
+    """
+    try:
+        await db.commit()
+    except IntegrityError:
+        if idempotency_key is None:
+            raise
+        await db.rollback()
+        replay = await _replay(db, idempotency_key, fingerprint)
+        if replay is None:
+            raise
+        return replay
+    return None
+
+
+@router.post(
+    "/",
+    response_model=ReadingLogRead,
+    responses={202: {"description": "Queued for writing (INGEST_MODE=queue)"}},
+)
+async def create_reading_log(
+    *,
+    reading_log: ReadingLogCreate,
+    db: AsyncSession = Depends(get_async_session),
+    idempotency_key: Optional[str] = Header(default=None, max_length=255),
+) -> Union[Response, ReadingLogModel]:
+    """
+    Create a new reading log.
+
+    With an Idempotency-Key header, the response is stored with the reading log
+    and a retry with the same key returns it (marked Idempotent-Replayed)
+    without creating another one. Reusing a key for a different request is a
+    422. Keys are remembered for IDEMPOTENCY_KEY_TTL_HOURS.
+
+    With INGEST_MODE=queue the reading log is queued and written in a batch
+    shortly afterwards: the request must carry an Idempotency-Key header, and
+    the response is a 202 echoing it. Retries of a key this worker accepted are
+    acknowledged without queueing the reading log again, and reusing such a key
+    for a different request is a 422. Keys another worker already wrote are
+    skipped when the batch is written. If the queue stays full the request
+    fails with a 503 and should be retried after the Retry-After delay.
+    """
     db_reading_log = ReadingLogModel.model_validate(reading_log.model_dump())
+    fingerprint = request_fingerprint(CREATE_ROUTE, reading_log.model_dump(mode="json"))
+
+    if ingest_queue is not None:
+        if not idempotency_key:
+            raise HTTPException(
+                status_code=400, detail="Idempotency-Key header is required"
+            )
+        # Keys are only checked against this worker's queue, so the request
+        # never waits on the database; the writer skips keys already stored
+        try:
+            accepted = await ingest_queue.enqueue(
+                idempotency_key, fingerprint, db_reading_log
+            )
+        except IdempotencyKeyMismatchError as e:
+            raise HTTPException(status_code=422, detail=str(e)) from e
+        except IngestQueueFullError as e:
+            raise HTTPException(
+                status_code=503, detail=str(e), headers={"Retry-After": "1"}
+            ) from e
+        if accepted:
+            reading_log_operations.inc("create")
+        return JSONResponse(
+            status_code=202,
+            content={"status": "queued", "idempotency_key": idempotency_key},
+        )
+
+    if idempotency_key:
+        replay = await _replay(db, idempotency_key, fingerprint)
+        if replay is not None:
+            return replay
+
     db.add(db_reading_log)
-    db.commit()
-    db.refresh(db_reading_log)
+    await apply_daily_deltas(
+        db, daily_deltas([(db_reading_log.created_at, db_reading_log.duration, 1)])
+    )
+    if idempotency_key:
+        # Assigns the ID that the stored response needs
+        await db.flush()
+        store_response(
+            db, idempotency_key, fingerprint, 200, _serialize(db_reading_log)
+        )
+    replay = await _commit(db, idempotency_key, fingerprint)
+    if replay is not None:
+        return replay
+    await db.refresh(db_reading_log)
+    reading_log_operations.inc("create")
     return db_reading_log
 
 
+@router.post("/bulk", response_model=List[ReadingLogRead])
+async def create_reading_logs_bulk(
+    *,
+    reading_logs: List[Dict[str, Any]] = Body(
+        ..., description="Reading logs to create, in the ReadingLogCreate shape"
+    ),
+    db: AsyncSession = Depends(get_async_session),
+    idempotency_key: Optional[str] = Header(default=None, max_length=255),
+) -> Union[Response, List[ReadingLogModel]]:
+    """
+    Create many reading logs in a single transaction.
+
+    Every item is validated before anything is written; if any item is invalid
+    the request fails with a 422 listing the errors for each offending index.
+    Valid batches are written with one multi-row INSERT ... RETURNING.
+    Idempotency-Key works as for single creates.
+    """
+    if len(reading_logs) > BULK_MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch size {len(reading_logs)} exceeds the maximum of {BULK_MAX_BATCH_SIZE}",
+        )
+    if not reading_logs:
+        return []
+
+    rows: List[Dict[str, Any]] = []
+    errors: List[Dict[str, Any]] = []
+    for index, item in enumerate(reading_logs):
+        try:
+            reading_log = ReadingLogCreate.model_validate(item)
+        except ValidationError as e:
+            errors.append(
+                {
+                    "index": index,
+                    "errors": e.errors(include_url=False, include_context=False),
+                }
+            )
+            continue
+        db_reading_log = ReadingLogModel.model_validate(reading_log.model_dump())
+        rows.append(db_reading_log.model_dump(exclude={"id"}))
+
+    if errors:
+        raise HTTPException(status_code=422, detail=errors)
+
+    fingerprint = request_fingerprint(BULK_ROUTE, reading_logs)
+    if idempotency_key:
+        replay = await _replay(db, idempotency_key, fingerprint)
+        if replay is not None:
+            return replay
+
+    # sort_by_parameter_order keeps RETURNING rows in the order of `rows`, even
+    # when SQLAlchemy splits the batch into several statements
+    created = (
+        await db.scalars(
+            insert(ReadingLogModel).returning(
+                ReadingLogModel, sort_by_parameter_order=True
+            ),
+            rows,
+        )
+    ).all()
+    await apply_daily_deltas(
+        db, daily_deltas((row["created_at"], row["duration"], 1) for row in rows)
+    )
+    if idempotency_key:
+        store_response(
+            db,
+            idempotency_key,
+            fingerprint,
+            200,
+            [_serialize(reading_log) for reading_log in created],
+        )
+    replay = await _commit(db, idempotency_key, fingerprint)
+    if replay is not None:
+        return replay
+    reading_log_operations.inc("bulk_create")
+    return list(created)
+
+
+@router.post("/import", response_model=ReadingLogImportResult)
+async def import_reading_logs_endpoint(
+    *,
+    request: Request,
+    format: ExportFormat = ExportFormat.ndjson,
+) -> ReadingLogImportResult:
+    """
+    Bulk load historical reading logs from a CSV or NDJSON request body.
+
+    Records may carry created_at/updated_at. The upload is streamed to a spool
+    file and loaded in one transaction, through COPY on PostgreSQL and batched
+    INSERTs on SQLite. Any invalid record fails the whole import with a 422.
+    """
+    with tempfile.SpooledTemporaryFile(max_size=IMPORT_SPOOL_MAX_MEMORY) as spool:
+        async for chunk in request.stream():
+            spool.write(chunk)
+        spool.seek(0)
+        try:
+            # COPY goes through psycopg2, so run the load on the sync engine
+            result = await run_in_threadpool(import_reading_logs, engine, spool, format)
+        except ImportFormatError as e:
+            raise HTTPException(status_code=422, detail=str(e)) from e
+    reading_log_operations.inc("import")
+    return result
+
+
 @router.get("/", response_model=List[ReadingLogRead])
-def read_reading_logs(
+async def read_reading_logs(
     *,
-    db: Session = Depends(get_session),
+    db: AsyncSession = Depends(get_async_session),
+    response: Response,
     offset: int = 0,
     limit: int = Query(default=100, lte=100),
-) -> List[ReadingLogModel]:
-    """Get all reading logs with pagination."""
-    reading_logs = db.exec(select(ReadingLogModel).offset(offset).limit(limit)).all()
+    cursor: Optional[str] = Query(
+        default=None,
+        description="Opaque cursor from a previous page's X-Next-Cursor header",
+    ),
+    sort: ReadingLogSort = Query(
+        default=ReadingLogSort.created_at,
+        description='Sort key, prefixed with "-" for descending order',
+    ),
+    created_after: Optional[datetime] = Query(
+        default=None, description="Only reading logs created at or after this time"
+    ),
+    created_before: Optional[datetime] = Query(
+        default=None, description="Only reading logs created before this time"
+    ),
+    min_duration: Optional[int] = Query(
+        default=None, description="Minimum duration in minutes, inclusive"
+    ),
+    max_duration: Optional[int] = Query(
+        default=None, description="Maximum duration in minutes, inclusive"
+    ),
+    fields: Optional[str] = Query(
+        default=None,
+        description="Comma-separated fields to return, e.g. id,duration (default: all)",
+    ),
+    if_none_match: Optional[str] = Header(default=None),
+) -> Union[Response, Sequence[Row]]:
+    """
+    Get reading logs with filtering and pagination.
+
+    Results are ordered by `sort` (created_at by default) with id as the
+    tiebreaker; each ordering has a matching (column, id) index, which also
+    serves the created_at or duration range filter on the same column. Passing
+    `cursor` switches to keyset pagination, which costs the same on every page;
+    `offset` is kept for compatibility. When a full page is returned, the cursor
+    for the next page is sent in the X-Next-Cursor header. Cursors encode the
+    sort key, so they must be used with the same `sort` (filters may change).
+
+    Only the needed columns are selected, as plain rows rather than ORM
+    objects. `fields` limits the response to a sparse fieldset, so clients that
+    don't need `description` don't pay for it.
+
+    The ETag is a version of the page computed from the ID and last modification
+    time of each row, so a matching If-None-Match gets an empty 304 without the
+    page being serialized.
+
+    Sparse fieldsets, and every page when FAST_JSON is enabled, are rendered
+    straight from the rows instead of being validated against ReadingLogRead.
+    """
+    # Stored timestamps are naive UTC; bounds with an offset are converted
+    if created_after is not None:
+        created_after = naive_utc(created_after)
+    if created_before is not None:
+        created_before = naive_utc(created_before)
+    if created_after and created_before and created_after >= created_before:
+        raise HTTPException(
+            status_code=400, detail="created_after must be before created_before"
+        )
+    if (
+        min_duration is not None
+        and max_duration is not None
+        and min_duration > max_duration
+    ):
+        raise HTTPException(
+            status_code=400, detail="min_duration must not exceed max_duration"
+        )
+
+    selected = _parse_fields(fields)
+    after = None
+    if cursor is not None:
+        try:
+            after = decode_cursor(cursor, sort.value)
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+
+    statement = list_statement(
+        [
+            name
+            for name in READ_FIELDS
+            if name in selected or name in LIST_KEY_FIELDS or name == sort.field
+        ],
+        sort,
+        created_after=created_after,
+        created_before=created_before,
+        min_duration=min_duration,
+        max_duration=max_duration,
+        after=after,
+        offset=offset,
+        limit=limit,
+    )
+    reading_logs = (await db.exec(statement)).all()
+
+    headers = {
+        "ETag": make_etag(
+            limit,
+            sort.value,
+            ",".join(selected),
+            *(
+                f"{reading_log.id}:{reading_log.updated_at or reading_log.created_at}"
+                for reading_log in reading_logs
+            ),
+        )
+    }
+    if reading_logs and len(reading_logs) == limit:
+        last = reading_logs[-1]
+        headers["X-Next-Cursor"] = encode_cursor(
+            getattr(last, sort.field), last.id, sort.value
+        )
+
+    reading_log_operations.inc("list")
+    if etag_matches(if_none_match, headers["ETag"], weak=True):
+        return Response(status_code=304, headers=headers)
+
+    if fields is not None or FAST_JSON:
+        return FastJSONResponse(rows_to_dicts(reading_logs, selected), headers=headers)
+
+    response.headers.update(headers)
     return reading_logs
 
 
+@router.get("/stats", response_model=ReadingLogStats)
+async def read_reading_log_stats(
+    *,
+    db: AsyncSession = Depends(get_async_session),
+    start: Optional[date] = Query(default=None, description="First day to include"),
+    end: Optional[date] = Query(default=None, description="Last day to include"),
+    bucket: StatsBucket = StatsBucket.day,
+) -> ReadingLogStats:
+    """
+    Get total minutes and session counts per day, week or month.
+
+    Aggregation happens in SQL with GROUP BY, so no rows are loaded. Dates are
+    inclusive and in UTC; weeks start on Monday.
+    """
+    if start and end and start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+    return await reading_stats(db, start=start, end=end, bucket=bucket)
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_reading_logs(
+    format: ExportFormat = ExportFormat.ndjson,
+) -> StreamingResponse:
+    """
+    Export every reading log as NDJSON or CSV.
+
+    Rows are streamed from a server-side cursor in batches, so memory use stays
+    flat however large the table is.
+    """
+    media_type = "text/csv" if format == ExportFormat.csv else "application/x-ndjson"
+    return StreamingResponse(
+        stream_reading_logs(format),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="reading-logs.{format.value}"'
+        },
+    )
+
+
+@router.get("/search", response_model=List[ReadingLogSearchResult])
+async def search_reading_logs_endpoint(
+    *,
+    db: AsyncSession = Depends(get_async_session),
+    q: str = Query(..., min_length=1, description="Words to search descriptions for"),
+    offset: int = 0,
+    limit: int = Query(default=20, lte=100),
+) -> Sequence[Row]:
+    """
+    Full-text search over reading-log descriptions, best match first.
+
+    Uses a tsvector GIN index on PostgreSQL and an FTS5 table on SQLite, both
+    kept in sync with every write, so no rows are scanned with LIKE. Every word
+    in `q` must match; on PostgreSQL `q` also accepts web-search syntax such as
+    "quoted phrases", `or` and `-excluded`.
+    """
+    if not q.split():
+        raise HTTPException(status_code=400, detail="q must contain a search term")
+    results = await search_reading_logs(db, q, limit=limit, offset=offset)
+    reading_log_operations.inc("search")
+    return results
+
+
 @router.get("/{reading_log_id}", response_model=ReadingLogRead)
-def read_reading_log(
-    *, db: Session = Depends(get_session), reading_log_id: int
-) -> ReadingLogModel:
-    """Get a specific reading log by ID."""
-    reading_log = db.get(ReadingLogModel, reading_log_id)
-    if not reading_log:
-        raise HTTPException(status_code=404, detail="Reading log not found")
-    return reading_log
+async def read_reading_log(
+    *,
+    db: AsyncSession = Depends(get_async_session),
+    response: Response,
+    reading_log_id: int,
+    if_none_match: Optional[str] = Header(default=None),
+) -> Union[Response, Dict[str, Any]]:
+    """
+    Get a specific reading log by ID.
+
+    The ETag is derived from the ID and last modification time; a matching
+    If-None-Match gets an empty 304.
+    """
+    data = await reading_log_cache.get(str(reading_log_id))
+    if data is None:
+        reading_log = await db.get(ReadingLogModel, reading_log_id)
+        if not reading_log:
+            raise HTTPException(status_code=404, detail="Reading log not found")
+        data = _serialize(reading_log)
+        await reading_log_cache.set(str(reading_log_id), data)
+
+    reading_log_operations.inc("read")
+    etag = _reading_log_etag(data)
+    if etag_matches(if_none_match, etag, weak=True):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    if FAST_JSON:
+        # The cached representation is already JSON-ready
+        return FastJSONResponse(data, headers={"ETag": etag})
+
+    response.headers["ETag"] = etag
+    return data
 
 
 @router.patch("/{reading_log_id}", response_model=ReadingLogRead)
-def update_reading_log(
+async def update_reading_log(
     *,
-    db: Session = Depends(get_session),
+    db: AsyncSession = Depends(get_async_session),
+    response: Response,
     reading_log_id: int,
     reading_log_update: ReadingLogUpdate,
+    if_match: Optional[str] = Header(default=None),
 ) -> ReadingLogModel:
-    """Update a reading log."""
-    db_reading_log = db.get(ReadingLogModel, reading_log_id)
+    """
+    Update a reading log.
+
+    With If-Match, the update only happens if the reading log still has that
+    ETag; otherwise the request fails with a 412.
+    """
+    # Lock the row while checking If-Match so a concurrent update can't slip in
+    db_reading_log = await db.get(
+        ReadingLogModel, reading_log_id, with_for_update=if_match is not None
+    )
     if not db_reading_log:
         raise HTTPException(status_code=404, detail="Reading log not found")
+    _check_if_match(if_match, db_reading_log)
 
     # Update only the fields that are provided
     update_data = reading_log_update.model_dump(exclude_unset=True)
@@ -64,24 +596,56 @@ def update_reading_log(
     # Always set updated_at to current time
     update_data["updated_at"] = datetime.utcnow()
 
+    previous_duration = db_reading_log.duration
     for key, value in update_data.items():
         setattr(db_reading_log, key, value)
 
     db.add(db_reading_log)
-    db.commit()
-    db.refresh(db_reading_log)
+    await apply_daily_deltas(
+        db,
+        daily_deltas(
+            [
+                (
+                    db_reading_log.created_at,
+                    db_reading_log.duration - previous_duration,
+                    0,
+                )
+            ]
+        ),
+    )
+    await db.commit()
+    await reading_log_cache.delete(str(reading_log_id))
+    await db.refresh(db_reading_log)
+    reading_log_operations.inc("update")
+    response.headers["ETag"] = _reading_log_etag(_serialize(db_reading_log))
     return db_reading_log
 
 
 @router.delete("/{reading_log_id}", response_model=ReadingLogRead)
-def delete_reading_log(
-    *, db: Session = Depends(get_session), reading_log_id: int
+async def delete_reading_log(
+    *,
+    db: AsyncSession = Depends(get_async_session),
+    reading_log_id: int,
+    if_match: Optional[str] = Header(default=None),
 ) -> ReadingLogModel:
-    """Delete a reading log."""
-    reading_log = db.get(ReadingLogModel, reading_log_id)
+    """
+    Delete a reading log.
+
+    With If-Match, the reading log is only deleted if it still has that ETag;
+    otherwise the request fails with a 412.
+    """
+    reading_log = await db.get(
+        ReadingLogModel, reading_log_id, with_for_update=if_match is not None
+    )
     if not reading_log:
         raise HTTPException(status_code=404, detail="Reading log not found")
+    _check_if_match(if_match, reading_log)
 
-    db.delete(reading_log)
-    db.commit()
+    await db.delete(reading_log)
+    await apply_daily_deltas(
+        db, daily_deltas([(reading_log.created_at, -reading_log.duration, -1)])
+    )
+    await db.commit()
+    await reading_log_cache.delete(str(reading_log_id))
+    reading_log_operations.inc("delete")
     return reading_log
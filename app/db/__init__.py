@@ -1,3 +1,3 @@
-from app.db.database import create_db_and_tables, get_session
+from app.db.database import create_db_and_tables, get_async_session, get_session
 
-__all__ = ["create_db_and_tables", "get_session"]
+__all__ = ["create_db_and_tables", "get_async_session", "get_session"]
@@ -0,0 +1,219 @@
+"""
+Bulk loading of historical reading logs from CSV or NDJSON.
+
+Input is parsed, validated and written as a stream, so memory use doesn't grow
+with the size of the file. PostgreSQL loads through `COPY ... FROM STDIN`;
+other backends fall back to batched executemany INSERTs. The whole load is one
+transaction, together with the matching reading_log_daily rollup update.
+"""
+
+import csv
+import io
+import json
+import time
+
+from collections import defaultdict
+from datetime import date
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.engine import Connection, Engine
+
+from app.db.rollup import DailyDeltas, upsert_statement
+from app.models.reading_log import (
+    ExportFormat,
+    ReadingLog,
+    ReadingLogImport,
+    ReadingLogImportResult,
+)
+from app.support.logging_support import get_logger
+
+# Set up logger
+logger = get_logger(__name__)
+
+# Rows per executemany batch on backends without COPY
+IMPORT_BATCH_SIZE = 5000
+
+IMPORT_COLUMNS = ("duration", "description", "created_at", "updated_at")
+
+
+class ImportFormatError(ValueError):
+    """Raised when an input record can't be parsed or validated."""
+
+    def __init__(self, line: int, message: str) -> None:
+        super().__init__(f"Line {line}: {message}")
+        self.line = line
+
+
+def _parse_records(
+    text_stream: IO[str], import_format: ExportFormat
+) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Yield (line number, raw record) pairs from CSV or NDJSON text."""
+    if import_format == ExportFormat.csv:
+        reader = csv.DictReader(text_stream)
+        try:
+            for record in reader:
+                # Empty CSV cells mean "no value"
+                yield (
+                    reader.line_num,
+                    {key: value for key, value in record.items() if value != ""},
+                )
+        except csv.Error as e:
+            raise ImportFormatError(reader.line_num, str(e)) from e
+    else:
+        for line, text in enumerate(text_stream, start=1):
+            if not text.strip():
+                continue
+            try:
+                yield line, json.loads(text)
+            except ValueError as e:
+                raise ImportFormatError(line, str(e)) from e
+
+
+def iter_reading_logs(
+    stream: IO[bytes], import_format: ExportFormat
+) -> Iterator[ReadingLogImport]:
+    """Parse and validate reading logs from a binary stream, one at a time."""
+    text_stream = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+    line = 0
+    try:
+        for line, record in _parse_records(text_stream, import_format):
+            try:
+                yield ReadingLogImport.model_validate(record)
+            except ValidationError as e:
+                raise ImportFormatError(
+                    line, "; ".join(error["msg"] for error in e.errors())
+                ) from e
+    except UnicodeDecodeError as e:
+        # The decoder reads ahead, so this is the first line not yet parsed
+        # rather than necessarily the offending one
+        raise ImportFormatError(line + 1, f"invalid UTF-8: {e.reason}") from e
+    finally:
+        # Don't let the wrapper close the caller's stream
+        text_stream.detach()
+
+
+class _Loader:
+    """Consumes validated reading logs, tracking the row count and rollup deltas."""
+
+    def __init__(self, reading_logs: Iterator[ReadingLogImport]) -> None:
+        self.reading_logs = reading_logs
+        self.rows = 0
+        self.totals: Dict[date, List[int]] = defaultdict(lambda: [0, 0])
+
+    def __iter__(self) -> Iterator[ReadingLogImport]:
+        for reading_log in self.reading_logs:
+            self.rows += 1
+            total = self.totals[reading_log.created_at.date()]
+            total[0] += reading_log.duration
+            total[1] += 1
+            yield reading_log
+
+    def deltas(self) -> DailyDeltas:
+        return {day: (total[0], total[1]) for day, total in self.totals.items()}
+
+
+class _CopySource:
+    """File-like object feeding COPY ... FROM STDIN with CSV text on demand."""
+
+    def __init__(self, reading_logs: Iterator[ReadingLogImport]) -> None:
+        self.reading_logs = iter(reading_logs)
+        self.buffer = ""
+        # psycopg2 replaces exceptions raised by read() with a generic COPY
+        # error, so keep the original to re-raise
+        self.error: Optional[ImportFormatError] = None
+
+    def _encode(self, reading_log: ReadingLogImport) -> str:
+        out = io.StringIO()
+        csv.writer(out, lineterminator="\n").writerow(
+            [
+                reading_log.duration,
+                # COPY reads an unquoted empty field as NULL
+                reading_log.description,
+                reading_log.created_at.isoformat(),
+                reading_log.updated_at.isoformat() if reading_log.updated_at else None,
+            ]
+        )
+        return out.getvalue()
+
+    def read(self, size: int = -1) -> str:
+        while size < 0 or len(self.buffer) < size:
+            try:
+                reading_log = next(self.reading_logs, None)
+            except ImportFormatError as e:
+                self.error = e
+                raise
+            if reading_log is None:
+                break
+            self.buffer += self._encode(reading_log)
+        if size < 0:
+            size = len(self.buffer)
+        chunk, self.buffer = self.buffer[:size], self.buffer[size:]
+        return chunk
+
+    def readline(self, size: int = -1) -> str:
+        return self.read(size)
+
+
+def _copy_postgresql(connection: Connection, loader: _Loader) -> None:
+    source = _CopySource(iter(loader))
+    cursor = connection.connection.dbapi_connection.cursor()  # type: ignore[union-attr]
+    try:
+        cursor.copy_expert(
+            f"COPY readinglog ({', '.join(IMPORT_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+            source,
+        )
+    except Exception:
+        if source.error is not None:
+            raise source.error from None
+        raise
+    finally:
+        cursor.close()
+
+
+def _insert_batches(connection: Connection, loader: _Loader) -> None:
+    table = ReadingLog.__table__  # type: ignore[attr-defined]
+    batch: List[Dict[str, Any]] = []
+    for reading_log in loader:
+        batch.append(reading_log.model_dump(include=set(IMPORT_COLUMNS)))
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            connection.execute(insert(table), batch)
+            batch = []
+    if batch:
+        connection.execute(insert(table), batch)
+
+
+def import_reading_logs(
+    engine: Engine, stream: IO[bytes], import_format: ExportFormat
+) -> ReadingLogImportResult:
+    """
+    Load every reading log in `stream` in a single transaction.
+    Raises ImportFormatError (and writes nothing) if any record is invalid.
+    """
+    started = time.perf_counter()
+    loader = _Loader(iter_reading_logs(stream, import_format))
+
+    with engine.begin() as connection:
+        if connection.dialect.name == "postgresql":
+            _copy_postgresql(connection, loader)
+        else:
+            _insert_batches(connection, loader)
+
+        deltas = loader.deltas()
+        if deltas:
+            connection.execute(upsert_statement(connection.dialect.name, deltas))
+
+    seconds = time.perf_counter() - started
+    result = ReadingLogImportResult(
+        rows=loader.rows,
+        seconds=round(seconds, 3),
+        rows_per_second=round(loader.rows / seconds, 1) if seconds else 0.0,
+    )
+    logger.info(
+        "Imported %s reading logs in %.2f s (%.0f rows/s)",
+        result.rows,
+        result.seconds,
+        result.rows_per_second,
+    )
+    return result
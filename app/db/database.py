@@ -3,16 +3,24 @@ import socket
 import time
 import traceback
 
-from typing import Generator
+from typing import AsyncGenerator, Generator
 
 from sqlalchemy.exc import OperationalError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.db.pool import TimedAsyncAdaptedQueuePool, TimedQueuePool, instrument_pool
+from app.db.query_timing import instrument_queries
+from app.db.settings import EngineSettings
 from app.support.logging_support import get_logger
 
 # Set up logger
 logger = get_logger(__name__)
 
+# Engine echo and pool options, configured through DB_* environment variables
+engine_settings = EngineSettings.from_env()
+
 # Get database URL from environment variable or use SQLite as default
 DATABASE_URL = os.getenv("DATABASE_URL")
 ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
@@ -65,14 +73,28 @@ if DATABASE_URL and DATABASE_URL.startswith("postgresql"):
 
     try:
         logger.info("Connecting to PostgreSQL database...")
+        logger.info("Engine settings: %s", engine_settings)
         engine = create_engine(
             DATABASE_URL,
-            echo=True,  # Set to True to see all SQL queries for debugging
-            pool_pre_ping=True,
-            pool_recycle=300,  # Recycle connections after 5 minutes
+            echo=engine_settings.echo,
+            poolclass=TimedQueuePool,
+            **engine_settings.pool_kwargs(),
             connect_args={"connect_timeout": 10},  # 10 seconds connection timeout
         )
         logger.info("PostgreSQL engine created successfully")
+
+        # Async engine for the request handlers, using the asyncpg driver
+        ASYNC_DATABASE_URL = DATABASE_URL.replace(
+            "postgresql+psycopg2://", "postgresql+asyncpg://"
+        )
+        async_engine = create_async_engine(
+            ASYNC_DATABASE_URL,
+            echo=engine_settings.echo,
+            poolclass=TimedAsyncAdaptedQueuePool,
+            **engine_settings.pool_kwargs(),
+            connect_args={"timeout": 10},  # asyncpg's name for connect_timeout
+        )
+        logger.info("PostgreSQL async engine created successfully")
     except Exception as e:
         logger.exception(
             "Failed to create PostgreSQL engine: %s\n%s", str(e), traceback.format_exc()
@@ -81,18 +103,54 @@ if DATABASE_URL and DATABASE_URL.startswith("postgresql"):
 else:
     # Use SQLite for local development
     logger.info("Using SQLite database for local development")
-    SQLITE_DATABASE_URL = "sqlite:///./reading_app.db"
+    # DATABASE_URL=sqlite:///path picks another file (tests, benchmarks)
+    SQLITE_DATABASE_URL = (
+        DATABASE_URL
+        if DATABASE_URL and DATABASE_URL.startswith("sqlite://")
+        else "sqlite:///./reading_app.db"
+    )
+    ASYNC_DATABASE_URL = SQLITE_DATABASE_URL.replace(
+        "sqlite://", "sqlite+aiosqlite://", 1
+    )
     try:
         engine = create_engine(
-            SQLITE_DATABASE_URL, echo=True, connect_args={"check_same_thread": False}
+            SQLITE_DATABASE_URL,
+            echo=engine_settings.echo,
+            poolclass=TimedQueuePool,
+            connect_args={"check_same_thread": False},
         )
         logger.info("SQLite engine created successfully")
+
+        async_engine = create_async_engine(
+            ASYNC_DATABASE_URL,
+            echo=engine_settings.echo,
+            poolclass=TimedAsyncAdaptedQueuePool,
+        )
+        logger.info("SQLite async engine created successfully")
     except Exception as e:
         logger.exception(
             "Failed to create SQLite engine: %s\n%s", str(e), traceback.format_exc()
         )
         raise
 
+# Count connects, checkouts and checkins for the pool statistics endpoint
+instrument_pool(engine)
+instrument_pool(async_engine.sync_engine)
+
+# Time SQL statements for the per-request Server-Timing metrics
+instrument_queries(engine)
+instrument_queries(async_engine.sync_engine)
+
+
+def dispose_engines_after_fork() -> None:
+    """
+    Give a forked worker process its own connection pools. Connections the
+    parent opened (for example while migrating) are dropped without being
+    closed, so they are never shared between processes.
+    """
+    engine.dispose(close=False)
+    async_engine.sync_engine.dispose(close=False)
+
 
 def create_db_and_tables() -> None:
     """Create database tables if they don't exist."""
@@ -101,10 +159,12 @@ def create_db_and_tables() -> None:
     # Explicitly import all models to ensure they're registered with SQLModel
     try:
         # Import all models here to ensure they're registered
+        from app.models.idempotency_key import IdempotencyKey
         from app.models.reading_log import ReadingLog
+        from app.models.reading_log_daily import ReadingLogDaily
 
         # Log the imported models and their __tablename__ attributes
-        models = [ReadingLog]
+        models = [ReadingLog, ReadingLogDaily, IdempotencyKey]
         model_names = [model.__name__ for model in models]
         logger.info("Imported models: %s", ", ".join(model_names))
 
@@ -178,3 +238,18 @@ def get_session() -> Generator[Session, None, None]:
     finally:
         if session:
             session.close()
+
+
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    """Get an async database session."""
+    # Instances stay loaded after commit so that serializing a response never
+    # triggers lazy IO outside of an awaited call.
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        try:
+            yield session
+        except SQLAlchemyError as e:
+            logger.exception(
+                "Database session error: %s\n%s", str(e), traceback.format_exc()
+            )
+            await session.rollback()
+            raise
@@ -0,0 +1,69 @@
+import csv
+import io
+import json
+
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Sequence
+
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.db.database import async_engine
+from app.models.reading_log import ExportFormat, ReadingLog
+from app.support.json_response import json_default
+
+# Rows fetched from the server-side cursor per round trip
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_COLUMNS = ("id", "duration", "description", "created_at", "updated_at")
+
+
+def _encode_ndjson(rows: Sequence[Dict[str, Any]]) -> bytes:
+    return "".join(
+        json.dumps(row, default=json_default, separators=(",", ":")) + "\n"
+        for row in rows
+    ).encode()
+
+
+def _encode_csv(rows: Sequence[Dict[str, Any]], header: bool = False) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS, lineterminator="\n")
+    if header:
+        writer.writeheader()
+    writer.writerows(
+        {
+            key: value.isoformat() if isinstance(value, datetime) else value
+            for key, value in row.items()
+        }
+        for row in rows
+    )
+    return buffer.getvalue().encode()
+
+
+async def stream_reading_logs(export_format: ExportFormat) -> AsyncIterator[bytes]:
+    """
+    Yield every reading log, encoded, one batch at a time.
+
+    Rows come from a server-side cursor as plain column tuples, so memory use
+    depends on EXPORT_BATCH_SIZE rather than on the size of the table. The
+    generator owns its session because it keeps reading after the endpoint
+    has returned.
+    """
+    columns = [getattr(ReadingLog, name) for name in EXPORT_COLUMNS]
+    statement = (
+        select(*columns)
+        .order_by(col(ReadingLog.created_at), col(ReadingLog.id))
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+
+    if export_format == ExportFormat.csv:
+        yield _encode_csv([], header=True)
+
+    async with AsyncSession(async_engine) as session:
+        result = await session.stream(statement)
+        async for partition in result.mappings().partitions():
+            rows: List[Dict[str, Any]] = [dict(row) for row in partition]
+            if export_format == ExportFormat.csv:
+                yield _encode_csv(rows)
+            else:
+                yield _encode_ndjson(rows)
@@ -0,0 +1,148 @@
+"""
+Idempotency keys for reading-log creation.
+
+A request carrying an Idempotency-Key stores its response in the
+idempotency_key table in the same transaction as its writes. A retry with the
+same key gets that response back without writing again, and a concurrent
+duplicate loses on the primary key and is answered the same way. Keys expire
+after IDEMPOTENCY_KEY_TTL_HOURS; `run_idempotency_cleanup` purges them.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+
+from datetime import datetime, timedelta
+from typing import Any, Iterable, Optional, Set, cast
+
+from sqlalchemy import CursorResult, delete
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.db.database import async_engine
+from app.models.idempotency_key import IdempotencyKey
+from app.support.logging_support import get_logger
+
+# Set up logger
+logger = get_logger(__name__)
+
+# How long a key is remembered
+IDEMPOTENCY_KEY_TTL = timedelta(
+    hours=float(os.getenv("IDEMPOTENCY_KEY_TTL_HOURS", "24"))
+)
+
+# Seconds between purges of expired keys; 0 disables the cleanup job
+IDEMPOTENCY_CLEANUP_INTERVAL = float(os.getenv("IDEMPOTENCY_CLEANUP_INTERVAL", "3600"))
+
+# Routes included in request fingerprints
+CREATE_ROUTE = "POST /reading-logs"
+BULK_ROUTE = "POST /reading-logs/bulk"
+
+# Expired keys deleted per statement, to keep each purge transaction short
+PURGE_BATCH_SIZE = 5000
+
+
+class IdempotencyKeyMismatchError(ValueError):
+    """Raised when a key is reused for a request with different content."""
+
+
+def request_fingerprint(route: str, payload: Any) -> str:
+    """Hash a request's route and JSON payload to detect reuse of a key."""
+    body = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(f"{route}\n{body}".encode()).hexdigest()
+
+
+def _expiry_cutoff() -> datetime:
+    return datetime.utcnow() - IDEMPOTENCY_KEY_TTL
+
+
+async def find_response(
+    db: AsyncSession, key: str, fingerprint: str
+) -> Optional[IdempotencyKey]:
+    """
+    Return the stored response for `key`, or None if it hasn't been used (or
+    has expired, in which case the stale row is deleted in this transaction).
+    Raises IdempotencyKeyMismatchError if it was used for a different request.
+    """
+    record = await db.get(IdempotencyKey, key)
+    if record is None:
+        return None
+    if record.created_at < _expiry_cutoff():
+        await db.delete(record)
+        await db.flush()
+        return None
+    if record.request_hash != fingerprint:
+        raise IdempotencyKeyMismatchError(
+            "Idempotency-Key was already used for a different request"
+        )
+    return record
+
+
+def store_response(
+    db: AsyncSession, key: str, fingerprint: str, status_code: int, body: Any
+) -> None:
+    """Record the response for `key`; it is written when the session commits."""
+    db.add(
+        IdempotencyKey(
+            key=key,
+            request_hash=fingerprint,
+            status_code=status_code,
+            response=json.dumps(body, separators=(",", ":")),
+        )
+    )
+
+
+async def claim_unused_keys(db: AsyncSession, keys: Iterable[str]) -> Set[str]:
+    """
+    Of `keys`, return those without a live stored response, deleting expired
+    rows so they can be stored again. Used by the write-behind queue to skip
+    reading logs that were already written.
+    """
+    keys = set(keys)
+    if not keys:
+        return keys
+    key_column = col(IdempotencyKey.key)
+    await db.execute(
+        delete(IdempotencyKey).where(
+            key_column.in_(keys), col(IdempotencyKey.created_at) < _expiry_cutoff()
+        )
+    )
+    used = (await db.exec(select(IdempotencyKey.key).where(key_column.in_(keys)))).all()
+    return keys.difference(used)
+
+
+async def purge_expired_keys() -> int:
+    """Delete expired keys in batches and return how many were removed."""
+    removed = 0
+    cutoff = _expiry_cutoff()
+    while True:
+        async with AsyncSession(async_engine) as session:
+            expired = (
+                select(IdempotencyKey.key)
+                .where(col(IdempotencyKey.created_at) < cutoff)
+                .limit(PURGE_BATCH_SIZE)
+            )
+            result = cast(
+                CursorResult,
+                await session.execute(
+                    delete(IdempotencyKey).where(col(IdempotencyKey.key).in_(expired))
+                ),
+            )
+            await session.commit()
+        removed += result.rowcount
+        if result.rowcount < PURGE_BATCH_SIZE:
+            return removed
+
+
+async def run_idempotency_cleanup(interval: float) -> None:
+    """Purge expired keys every `interval` seconds until cancelled."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            removed = await purge_expired_keys()
+        except Exception:
+            logger.exception("Failed to purge expired idempotency keys")
+            continue
+        if removed:
+            logger.info("Purged %s expired idempotency keys", removed)
@@ -0,0 +1,431 @@
+"""
+Write-behind ingestion of new reading logs.
+
+With INGEST_MODE=queue, POST /reading-logs hands each reading log to an
+in-process bounded queue and returns 202 straight away. A background task
+started by the application's lifespan drains the queue and writes batches with
+one multi-row INSERT and rollup update per transaction.
+
+Every accepted reading log is first appended to an on-disk spool file owned by
+this process, and the spool is truncated whenever everything in it has been
+committed. Entries are therefore never only in memory: on shutdown the queue is
+drained, and anything that couldn't be written (or was lost to a crash) is
+replayed from the spool by the next process to start. Each process holds an
+exclusive lock on its own spool file, taken before the file is renamed to a
+name other workers look for, so workers only replay spools whose owner has
+exited.
+
+Each batch also stores the 202 response for its Idempotency-Keys in the
+idempotency_key table, and skips reading logs whose key is already stored, so
+replaying a spool (or a retry reaching another worker) never writes a reading
+log twice.
+"""
+
+import asyncio
+import fcntl
+import json
+import os
+import time
+
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Any, Dict, List, Optional
+
+from sqlalchemy import insert
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.db.database import async_engine
+from app.db.idempotency import (
+    CREATE_ROUTE,
+    IdempotencyKeyMismatchError,
+    claim_unused_keys,
+    request_fingerprint,
+    store_response,
+)
+from app.db.rollup import apply_daily_deltas, daily_deltas
+from app.models.reading_log import ReadingLog
+from app.support.logging_support import get_logger
+
+# Set up logger
+logger = get_logger(__name__)
+
+INGEST_COLUMNS = ("duration", "description", "created_at")
+
+# Longest pause between retries of a batch the database rejected
+MAX_RETRY_DELAY = 30.0
+
+# Spool files, and the name a new spool has until its owner holds the lock
+SPOOL_SUFFIX = ".ndjson"
+LOCKING_SUFFIX = ".locking"
+STALE_LOCKING_SECONDS = 60
+# Spool lines that can't be replayed (say, torn by a crash mid-write) are moved
+# to a file with this suffix for inspection
+CORRUPT_SUFFIX = ".corrupt"
+
+SPOOL_ITEM_KEYS = ("idempotency_key", *INGEST_COLUMNS)
+
+
+def _fingerprint(item: Dict[str, Any]) -> str:
+    # Spools written before fingerprints were spooled lack request_hash
+    return item.get("request_hash") or request_fingerprint(
+        CREATE_ROUTE, {"duration": item["duration"], "description": item["description"]}
+    )
+
+
+def _parse_spool_line(line: str) -> Optional[Dict[str, Any]]:
+    """The entry on a spool line, or None if the line isn't a complete entry."""
+    try:
+        item = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(item, dict) or any(key not in item for key in SPOOL_ITEM_KEYS):
+        return None
+    return item
+
+
+class IngestQueueFullError(Exception):
+    """Raised when the ingestion queue stays full for the whole enqueue timeout."""
+
+
+class IngestQueue:
+    """Bounded queue of reading logs written to the database in batches."""
+
+    def __init__(
+        self,
+        spool_dir: str,
+        max_size: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 0.05,
+        enqueue_timeout: float = 1.0,
+    ) -> None:
+        self.spool_dir = Path(spool_dir)
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+
+        self._queue: "asyncio.Queue[Optional[Dict[str, Any]]]" = asyncio.Queue(max_size)
+        self._space = asyncio.Event()
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._spool: Optional[IO[str]] = None
+        self._spool_path: Optional[Path] = None
+        self._stopping = False
+
+        # Request fingerprints of the keys accepted but not yet committed, and
+        # of a window of committed ones, so that client retries don't enqueue a
+        # reading log twice and reused keys are caught
+        self._pending_keys: Dict[str, str] = {}
+        self._committed_keys: "OrderedDict[str, str]" = OrderedDict()
+
+        self.accepted = 0
+        self.duplicates = 0
+        self.rejected = 0
+        self.written = 0
+        self.batches = 0
+        self.failures = 0
+
+    async def start(self) -> None:
+        """Open this process's spool and start the background writer."""
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        name = f"{os.getpid()}-{time.time_ns()}"
+        # Lock the file before it appears under a name other workers replay,
+        # so none of them can take it for an orphan between open and flock
+        locking_path = self.spool_dir / f"{name}{LOCKING_SUFFIX}"
+        self._spool = open(locking_path, "a", encoding="utf-8")
+        fcntl.flock(self._spool, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        spool_path = self.spool_dir / f"{name}{SPOOL_SUFFIX}"
+        locking_path.rename(spool_path)
+        self._spool_path = spool_path
+        self._task = asyncio.create_task(self._run())
+        self._task.add_done_callback(self._writer_done)
+        logger.info("Ingestion queue started with spool %s", spool_path)
+
+    async def stop(self) -> None:
+        """Drain the queue to the database and stop the background writer."""
+        if self._task is None:
+            return
+        self._stopping = True
+        if not self._queue.full():
+            # Wake the writer if it is waiting on an empty queue
+            self._queue.put_nowait(None)
+        try:
+            await self._task
+        except Exception:  # noqa: S110
+            # Already logged by _writer_done; the spool keeps what is unwritten
+            pass
+        self._task = None
+
+        assert self._spool is not None and self._spool_path is not None
+        remaining = self._spool.tell()
+        if remaining == 0:
+            # Unlink while still holding the lock, so a worker that opened the
+            # spool meanwhile finds it gone once it gets the lock
+            self._spool_path.unlink()
+        self._spool.close()
+        if remaining:
+            logger.warning(
+                "Ingestion spool %s kept for replay on the next start",
+                self._spool_path,
+            )
+        logger.info("Ingestion queue stopped")
+
+    def seen(self, idempotency_key: str, fingerprint: str) -> bool:
+        """
+        Whether this queue recently accepted `idempotency_key`. Raises
+        IdempotencyKeyMismatchError if it was for a request with another
+        fingerprint.
+        """
+        known = self._pending_keys.get(
+            idempotency_key, self._committed_keys.get(idempotency_key)
+        )
+        if known is None:
+            return False
+        if known != fingerprint:
+            raise IdempotencyKeyMismatchError(
+                "Idempotency-Key was already used for a different request"
+            )
+        return True
+
+    async def enqueue(
+        self, idempotency_key: str, fingerprint: str, reading_log: ReadingLog
+    ) -> bool:
+        """
+        Accept a reading log for writing. Returns False, without queueing it
+        again, if `idempotency_key` was already accepted for the same request
+        (see `seen`). Waits up to `enqueue_timeout` for room and then raises
+        IngestQueueFullError, as it does when the writer isn't running.
+        """
+        if self._task is None or self._task.done() or self._stopping:
+            raise IngestQueueFullError("Ingestion queue is not running")
+        if self.seen(idempotency_key, fingerprint):
+            self.duplicates += 1
+            return False
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.enqueue_timeout
+        while self._queue.full():
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                self.rejected += 1
+                raise IngestQueueFullError("Ingestion queue is full")
+            self._space.clear()
+            try:
+                await asyncio.wait_for(self._space.wait(), remaining)
+            except asyncio.TimeoutError:
+                continue
+
+        item = {
+            "idempotency_key": idempotency_key,
+            "request_hash": fingerprint,
+            **reading_log.model_dump(include=set(INGEST_COLUMNS), mode="json"),
+        }
+        # Spool and queue together, with no await in between, so the spool is
+        # never truncated while it holds an uncommitted entry
+        assert self._spool is not None
+        self._spool.write(json.dumps(item, separators=(",", ":")) + "\n")
+        self._spool.flush()
+        self._queue.put_nowait(item)
+        self._pending_keys[idempotency_key] = fingerprint
+        self.accepted += 1
+        return True
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "queued": self._queue.qsize(),
+            "max_size": self.max_size,
+            "batch_size": self.batch_size,
+            "accepted": self.accepted,
+            "duplicates": self.duplicates,
+            "rejected": self.rejected,
+            "written": self.written,
+            "batches": self.batches,
+            "failures": self.failures,
+            "spool_bytes": self._spool.tell()
+            if self._spool and not self._spool.closed
+            else 0,
+        }
+
+    def _writer_done(self, task: "asyncio.Task[None]") -> None:
+        if task.cancelled() or task.exception() is None:
+            return
+        logger.error(
+            "Ingestion writer stopped; queued reading logs stay in the spool "
+            "and new ones are rejected",
+            exc_info=task.exception(),
+        )
+
+    async def _run(self) -> None:
+        await self._replay_orphaned_spools()
+        while not (self._stopping and self._queue.empty()):
+            first = await self._queue.get()
+            if first is None:
+                continue
+            if self._queue.qsize() < self.batch_size and not self._stopping:
+                # Give a burst a moment to fill the batch
+                await asyncio.sleep(self.flush_interval)
+
+            batch = [first]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                item = self._queue.get_nowait()
+                if item is not None:
+                    batch.append(item)
+            self._space.set()
+
+            if not await self._write_with_retry(batch):
+                # Only reachable while stopping; the spool keeps the rest
+                return
+            if self._queue.empty():
+                self._truncate_spool()
+        # Drained: everything spooled has been committed
+        self._truncate_spool()
+
+    async def _write_with_retry(self, batch: List[Dict[str, Any]]) -> bool:
+        delay = 0.5
+        while True:
+            try:
+                await self._write(batch)
+            except Exception:
+                self.failures += 1
+                logger.exception("Failed to write %s queued reading logs", len(batch))
+                if self._stopping:
+                    return False
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, MAX_RETRY_DELAY)
+                continue
+
+            for item in batch:
+                key = item["idempotency_key"]
+                self._pending_keys.pop(key, None)
+                self._committed_keys[key] = _fingerprint(item)
+            while len(self._committed_keys) > self.max_size:
+                self._committed_keys.popitem(last=False)
+            self.written += len(batch)
+            self.batches += 1
+            return True
+
+    async def _write(self, batch: List[Dict[str, Any]]) -> None:
+        # Last entry wins if a key appears twice (only possible across spools)
+        items = {item["idempotency_key"]: item for item in batch}
+        async with AsyncSession(async_engine) as session:
+            unused = await claim_unused_keys(session, items)
+            if len(unused) < len(items):
+                # Retries accepted by another worker, or replayed spool entries
+                logger.info(
+                    "Skipped %s queued reading logs whose Idempotency-Key is "
+                    "already stored",
+                    len(items) - len(unused),
+                )
+            rows = [
+                {
+                    "duration": item["duration"],
+                    "description": item["description"],
+                    "created_at": datetime.fromisoformat(item["created_at"]),
+                }
+                for key, item in items.items()
+                if key in unused
+            ]
+            if rows:
+                await session.execute(insert(ReadingLog.__table__), rows)  # type: ignore[attr-defined]
+                await apply_daily_deltas(
+                    session,
+                    daily_deltas(
+                        (row["created_at"], row["duration"], 1) for row in rows
+                    ),
+                )
+            for key in unused:
+                store_response(
+                    session,
+                    key,
+                    _fingerprint(items[key]),
+                    202,
+                    {"status": "queued", "idempotency_key": key},
+                )
+            await session.commit()
+
+    def _truncate_spool(self) -> None:
+        assert self._spool is not None
+        self._spool.truncate(0)
+        self._spool.seek(0)
+
+    async def _replay_orphaned_spools(self) -> None:
+        """Write out spools left behind by processes that have exited."""
+        for path in self.spool_dir.glob(f"*{LOCKING_SUFFIX}"):
+            # Empty files of processes that died before renaming them. Recent
+            # ones may belong to a worker that is just starting up.
+            try:
+                if time.time() - path.stat().st_mtime > STALE_LOCKING_SECONDS:
+                    path.unlink()
+            except FileNotFoundError:
+                continue
+
+        for path in sorted(self.spool_dir.glob(f"*{SPOOL_SUFFIX}")):
+            if path == self._spool_path:
+                continue
+            try:
+                spool = open(path, "r+", encoding="utf-8")
+            except FileNotFoundError:
+                # Replayed and removed by another worker since the glob
+                continue
+            with spool:
+                try:
+                    fcntl.flock(spool, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    # Owned by a live process
+                    continue
+                if not path.exists():
+                    # Another worker replayed it between our open and flock
+                    continue
+                items = []
+                corrupt = []
+                for line in spool:
+                    if not line.strip():
+                        continue
+                    item = _parse_spool_line(line)
+                    if item is None:
+                        corrupt.append(line if line.endswith("\n") else line + "\n")
+                    else:
+                        items.append(item)
+                if corrupt:
+                    quarantine = path.with_suffix(CORRUPT_SUFFIX)
+                    with open(quarantine, "a", encoding="utf-8") as rejected:
+                        rejected.writelines(corrupt)
+                    logger.warning(
+                        "Skipped %s unreadable lines in spool %s; moved to %s",
+                        len(corrupt),
+                        path,
+                        quarantine,
+                    )
+                for start in range(0, len(items), self.batch_size):
+                    if not await self._write_with_retry(
+                        items[start : start + self.batch_size]
+                    ):
+                        return
+                path.unlink()
+            logger.info("Replayed %s reading logs from spool %s", len(items), path)
+
+
+def create_ingest_queue() -> Optional[IngestQueue]:
+    """
+    Build the ingestion queue selected by the environment, or None when
+    INGEST_MODE is "sync" (the default):
+
+    - INGEST_MODE: sync or queue
+    - INGEST_QUEUE_SIZE: queue capacity (default 10000)
+    - INGEST_BATCH_SIZE: reading logs per INSERT (default 500)
+    - INGEST_FLUSH_INTERVAL: seconds to wait for a batch to fill (default 0.05)
+    - INGEST_ENQUEUE_TIMEOUT: seconds a POST waits for room (default 1)
+    - INGEST_SPOOL_DIR: directory for spool files (default ./ingest-spool)
+    """
+    mode = os.getenv("INGEST_MODE", "sync").lower()
+    if mode == "sync":
+        return None
+    if mode != "queue":
+        raise ValueError(f"Unknown INGEST_MODE {mode!r}; expected sync or queue")
+    return IngestQueue(
+        spool_dir=os.getenv("INGEST_SPOOL_DIR", "ingest-spool"),
+        max_size=int(os.getenv("INGEST_QUEUE_SIZE", "10000")),
+        batch_size=int(os.getenv("INGEST_BATCH_SIZE", "500")),
+        flush_interval=float(os.getenv("INGEST_FLUSH_INTERVAL", "0.05")),
+        enqueue_timeout=float(os.getenv("INGEST_ENQUEUE_TIMEOUT", "1")),
+    )
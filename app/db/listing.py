@@ -0,0 +1,70 @@
+"""
+Query behind the reading-log list endpoint.
+
+Each ordering is (column, id) and has a matching index, which also serves the
+created_at or duration range filter on the same column. Keyset pages compare
+(column, id) as a row value so the index seeks straight to the first row after
+the cursor. `list_statement` is what the endpoint runs, so scripts and tests
+can check the plan of exactly that statement.
+"""
+
+from datetime import datetime
+from typing import Any, Optional, Sequence, Tuple
+
+from sqlalchemy import literal, tuple_
+from sqlmodel import col, select
+from sqlmodel.sql.expression import Select
+
+from app.models.reading_log import ReadingLog, ReadingLogSort
+from app.support.pagination import SortValue
+
+
+def list_statement(
+    columns: Sequence[str],
+    sort: ReadingLogSort,
+    *,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    min_duration: Optional[int] = None,
+    max_duration: Optional[int] = None,
+    after: Optional[Tuple[SortValue, int]] = None,
+    offset: int = 0,
+    limit: int = 100,
+) -> Select[Any]:
+    """
+    Build one page of the list query selecting `columns`, ordered by `sort`.
+    With `after` (a cursor's sort value and id) the page starts after that
+    position and `offset` is ignored.
+    """
+    sort_column = col(getattr(ReadingLog, sort.field))
+    id_column = col(ReadingLog.id)
+    statement = select(*(getattr(ReadingLog, name) for name in columns)).order_by(
+        *(
+            (sort_column.desc(), id_column.desc())
+            if sort.descending
+            else (sort_column, id_column)
+        )
+    )
+
+    if created_after is not None:
+        statement = statement.where(col(ReadingLog.created_at) >= created_after)
+    if created_before is not None:
+        statement = statement.where(col(ReadingLog.created_at) < created_before)
+    if min_duration is not None:
+        statement = statement.where(col(ReadingLog.duration) >= min_duration)
+    if max_duration is not None:
+        statement = statement.where(col(ReadingLog.duration) <= max_duration)
+
+    if after is not None:
+        position = tuple_(sort_column, id_column)
+        sort_value, reading_log_id = after
+        cursor_position = tuple_(literal(sort_value), literal(reading_log_id))
+        statement = statement.where(
+            position < cursor_position
+            if sort.descending
+            else position > cursor_position
+        )
+    else:
+        statement = statement.offset(offset)
+
+    return statement.limit(limit)
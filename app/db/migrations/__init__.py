@@ -0,0 +1,247 @@
+"""
+Versioned schema migrations.
+
+Each migration runs once per database and is recorded in the schema_migrations
+table, so changes such as new indexes reach databases whose tables already exist
+(which `SQLModel.metadata.create_all` never alters). Migration scripts live in
+`app/db/migrations/versions`.
+"""
+
+import importlib
+import pkgutil
+import time
+
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Set
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    func,
+    inspect,
+    select,
+    text,
+)
+from sqlalchemy.engine import Connection, Engine
+
+from app.db.migrations import versions
+from app.support.logging_support import get_logger
+
+# Set up logger
+logger = get_logger(__name__)
+
+# Arbitrary key for the PostgreSQL advisory lock serializing migration runners
+MIGRATION_LOCK_KEY = 727_274_001
+
+# How the application prepares the schema on startup (see ensure_schema)
+STARTUP_MODES = ("migrate", "check", "skip")
+
+# Kept out of SQLModel.metadata so create_all never manages it
+migrations_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    migrations_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("description", String, nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+@dataclass(frozen=True)
+class Migration:
+    """A single schema change, applied in version order."""
+
+    version: int
+    description: str
+    upgrade: Callable[[Connection], None]
+    # Non-transactional migrations run in autocommit mode, which online
+    # operations such as CREATE INDEX CONCURRENTLY require.
+    transactional: bool = True
+
+
+def load_migrations() -> List[Migration]:
+    """Load every migration module in the versions package, ordered by version."""
+    migrations: Dict[int, Migration] = {}
+    for module_info in pkgutil.iter_modules(versions.__path__):
+        if not module_info.name.startswith("v"):
+            continue
+        module = importlib.import_module(f"{versions.__name__}.{module_info.name}")
+        migration = Migration(
+            version=module.VERSION,
+            description=module.DESCRIPTION,
+            upgrade=module.upgrade,
+            transactional=getattr(module, "TRANSACTIONAL", True),
+        )
+        if migration.version in migrations:
+            raise ValueError(
+                f"Duplicate migration version {migration.version} in {module_info.name}"
+            )
+        migrations[migration.version] = migration
+    return [migrations[version] for version in sorted(migrations)]
+
+
+MIGRATIONS = load_migrations()
+LATEST_VERSION = MIGRATIONS[-1].version if MIGRATIONS else 0
+
+
+def _has_history(connection: Connection) -> bool:
+    # Checked explicitly: treating any error from the query as "no history"
+    # would report a database outage as an unmigrated database
+    return inspect(connection).has_table(schema_migrations.name)
+
+
+def applied_versions(engine: Engine) -> Set[int]:
+    """
+    Return the versions recorded in schema_migrations.
+    A database without the history table has nothing applied.
+    """
+    with engine.connect() as connection:
+        if not _has_history(connection):
+            return set()
+        return set(connection.execute(select(schema_migrations.c.version)).scalars())
+
+
+def current_version(engine: Engine) -> int:
+    """Return the highest applied version, or 0 for an unmigrated database."""
+    with engine.connect() as connection:
+        if not _has_history(connection):
+            return 0
+        version = connection.execute(
+            select(func.max(schema_migrations.c.version))
+        ).scalar()
+    return version or 0
+
+
+def pending_migrations(engine: Engine) -> List[Migration]:
+    """Return the migrations not yet applied, in order. Costs two small queries."""
+    done = applied_versions(engine)
+    return [migration for migration in MIGRATIONS if migration.version not in done]
+
+
+@contextmanager
+def migration_lock(engine: Engine) -> Iterator[None]:
+    """Serialize migration runners, e.g. several replicas starting at once."""
+    if engine.dialect.name != "postgresql":
+        yield
+        return
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        logger.info("Waiting for migration lock...")
+        connection.execute(
+            text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY}
+        )
+        try:
+            yield
+        finally:
+            connection.execute(
+                text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY}
+            )
+
+
+def _record(connection: Connection, migration: Migration) -> None:
+    connection.execute(
+        schema_migrations.insert().values(
+            version=migration.version,
+            description=migration.description,
+            applied_at=datetime.utcnow(),
+        )
+    )
+
+
+def apply_migration(engine: Engine, migration: Migration) -> None:
+    """Apply one migration and record it in schema_migrations."""
+    logger.info("Applying migration %s: %s", migration.version, migration.description)
+    started = time.perf_counter()
+
+    if migration.transactional:
+        # The migration and its history row commit together
+        with engine.begin() as connection:
+            migration.upgrade(connection)
+            _record(connection, migration)
+    else:
+        # Operations must be idempotent: if recording fails the migration
+        # runs again next time.
+        with engine.connect().execution_options(
+            isolation_level="AUTOCOMMIT"
+        ) as connection:
+            migration.upgrade(connection)
+        with engine.begin() as connection:
+            _record(connection, migration)
+
+    logger.info(
+        "Applied migration %s in %.1f ms",
+        migration.version,
+        (time.perf_counter() - started) * 1000,
+    )
+
+
+def run_migrations(engine: Engine) -> List[int]:
+    """
+    Apply every pending migration in order and return the versions applied.
+    When the schema is current this is two small queries and takes no lock.
+    """
+    if not pending_migrations(engine):
+        logger.info("Database schema is up to date (version %s)", LATEST_VERSION)
+        return []
+
+    applied: List[int] = []
+    with migration_lock(engine):
+        with engine.begin() as connection:
+            migrations_metadata.create_all(connection, checkfirst=True)
+
+        # Another runner may have applied some while we waited for the lock
+        for migration in pending_migrations(engine):
+            apply_migration(engine, migration)
+            applied.append(migration.version)
+
+    logger.info("Applied migrations: %s", applied)
+    return applied
+
+
+def ensure_schema(engine: Engine, mode: str) -> None:
+    """
+    Prepare the schema for the application according to `mode`:
+
+    - "migrate": apply pending migrations (two small queries when none are
+      pending)
+    - "check": compare the schema version stamp with this build and refuse to
+      start if the database is behind; errors reaching the database are raised
+    - "skip": trust that a deploy step already migrated the database
+    """
+    if mode not in STARTUP_MODES:
+        raise ValueError(
+            f"Unknown DB_STARTUP_MODE {mode!r}; expected one of {', '.join(STARTUP_MODES)}"
+        )
+
+    if mode == "migrate":
+        run_migrations(engine)
+    elif mode == "check":
+        version = current_version(engine)
+        if version < LATEST_VERSION:
+            raise RuntimeError(
+                f"Database schema is at version {version} but this build needs "
+                f"{LATEST_VERSION}; run `make db-migrate`"
+            )
+        logger.info("Database schema version %s is current", version)
+    else:
+        logger.info("Skipping database schema check")
+
+
+__all__ = [
+    "LATEST_VERSION",
+    "MIGRATIONS",
+    "STARTUP_MODES",
+    "Migration",
+    "applied_versions",
+    "current_version",
+    "ensure_schema",
+    "pending_migrations",
+    "run_migrations",
+    "schema_migrations",
+]
@@ -0,0 +1,87 @@
+"""
+Schema operations for migrations.
+
+Operations are idempotent so a migration interrupted part-way can simply be run
+again. Index operations accept `concurrently=True`, which on PostgreSQL builds
+the index without blocking writes; such migrations must set
+`TRANSACTIONAL = False` because PostgreSQL refuses CONCURRENTLY inside a
+transaction block.
+"""
+
+from typing import Sequence
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+
+from app.support.logging_support import get_logger
+
+# Set up logger
+logger = get_logger(__name__)
+
+
+def is_postgresql(connection: Connection) -> bool:
+    return connection.dialect.name == "postgresql"
+
+
+def has_column(connection: Connection, table: str, column: str) -> bool:
+    """Return whether `table` already has `column`."""
+    return any(c["name"] == column for c in inspect(connection).get_columns(table))
+
+
+def _drop_invalid_index(connection: Connection, name: str) -> None:
+    # A failed CREATE INDEX CONCURRENTLY leaves an INVALID index behind that
+    # IF NOT EXISTS would otherwise treat as done.
+    invalid = connection.execute(
+        text(
+            "SELECT 1 FROM pg_class c JOIN pg_index i ON i.indexrelid = c.oid "
+            "WHERE c.relname = :name AND NOT i.indisvalid"
+        ),
+        {"name": name},
+    ).first()
+    if invalid:
+        logger.warning("Dropping invalid index %s left by an earlier run", name)
+        connection.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+
+
+def create_index(
+    connection: Connection,
+    name: str,
+    table: str,
+    columns: Sequence[str],
+    *,
+    unique: bool = False,
+    concurrently: bool = False,
+    using: str = "",
+) -> None:
+    """Create an index if it doesn't exist, without blocking writes when concurrent."""
+    concurrent = concurrently and is_postgresql(connection)
+    if concurrent:
+        _drop_invalid_index(connection, name)
+
+    parts = ["CREATE"]
+    if unique:
+        parts.append("UNIQUE")
+    parts.append("INDEX")
+    if concurrent:
+        parts.append("CONCURRENTLY")
+    parts.append(f"IF NOT EXISTS {name} ON {table}")
+    if using and is_postgresql(connection):
+        parts.append(f"USING {using}")
+    parts.append(f"({', '.join(columns)})")
+
+    connection.execute(text(" ".join(parts)))
+
+
+def drop_index(
+    connection: Connection, name: str, *, concurrently: bool = False
+) -> None:
+    """Drop an index if it exists."""
+    concurrent = " CONCURRENTLY" if concurrently and is_postgresql(connection) else ""
+    connection.execute(text(f"DROP INDEX{concurrent} IF EXISTS {name}"))
+
+
+def add_column(connection: Connection, table: str, column: str, ddl: str) -> None:
+    """Add a column if it doesn't exist. `ddl` is the type and constraints."""
+    if has_column(connection, table, column):
+        return
+    connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
@@ -0,0 +1,7 @@
+"""
+Migration scripts, one module per version.
+
+Modules are named `vNNNN_<slug>.py` and define VERSION, DESCRIPTION and
+`upgrade(connection)`. Set TRANSACTIONAL = False for migrations that use
+online operations such as `CREATE INDEX CONCURRENTLY`.
+"""
@@ -0,0 +1,36 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.db.migrations.operations import is_postgresql
+
+VERSION = 1
+DESCRIPTION = "Create readinglog table"
+
+# The table as this version created it; later migrations add its indexes. Kept
+# literal so replaying the migration doesn't follow later model changes.
+POSTGRESQL_DDL = """
+    CREATE TABLE IF NOT EXISTS readinglog (
+        duration INTEGER NOT NULL,
+        description VARCHAR,
+        id SERIAL NOT NULL,
+        created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+        updated_at TIMESTAMP WITHOUT TIME ZONE,
+        PRIMARY KEY (id)
+    )
+"""
+SQLITE_DDL = """
+    CREATE TABLE IF NOT EXISTS readinglog (
+        duration INTEGER NOT NULL,
+        description VARCHAR,
+        id INTEGER NOT NULL,
+        created_at DATETIME NOT NULL,
+        updated_at DATETIME,
+        PRIMARY KEY (id)
+    )
+"""
+
+
+def upgrade(connection: Connection) -> None:
+    connection.execute(
+        text(POSTGRESQL_DDL if is_postgresql(connection) else SQLITE_DDL)
+    )
@@ -0,0 +1,24 @@
+from sqlalchemy.engine import Connection
+
+from app.db.migrations.operations import create_index
+
+VERSION = 2
+DESCRIPTION = "Index readinglog on (created_at, id) and updated_at"
+TRANSACTIONAL = False
+
+
+def upgrade(connection: Connection) -> None:
+    create_index(
+        connection,
+        "ix_readinglog_created_at_id",
+        "readinglog",
+        ["created_at", "id"],
+        concurrently=True,
+    )
+    create_index(
+        connection,
+        "ix_readinglog_updated_at",
+        "readinglog",
+        ["updated_at"],
+        concurrently=True,
+    )
@@ -0,0 +1,39 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.db.migrations.operations import is_postgresql
+
+VERSION = 3
+DESCRIPTION = "Create reading_log_daily rollup and backfill it from readinglog"
+
+# Literal so that replaying the migration creates this version's schema
+CREATE_ROLLUP = """
+    CREATE TABLE IF NOT EXISTS reading_log_daily (
+        day DATE NOT NULL,
+        total_duration INTEGER NOT NULL,
+        count INTEGER NOT NULL,
+        PRIMARY KEY (day)
+    )
+"""
+
+# Backfill per UTC day, computed as app.db.stats.period_start does
+POSTGRESQL_BACKFILL = """
+    INSERT INTO reading_log_daily (day, total_duration, count)
+    SELECT CAST(date_trunc('day', created_at) AS DATE), sum(duration), count(*)
+    FROM readinglog
+    GROUP BY CAST(date_trunc('day', created_at) AS DATE)
+"""
+SQLITE_BACKFILL = """
+    INSERT INTO reading_log_daily (day, total_duration, count)
+    SELECT date(created_at), sum(duration), count(*)
+    FROM readinglog
+    GROUP BY date(created_at)
+"""
+
+
+def upgrade(connection: Connection) -> None:
+    connection.execute(text(CREATE_ROLLUP))
+    connection.execute(text("DELETE FROM reading_log_daily"))
+    connection.execute(
+        text(POSTGRESQL_BACKFILL if is_postgresql(connection) else SQLITE_BACKFILL)
+    )
@@ -0,0 +1,17 @@
+from sqlalchemy.engine import Connection
+
+from app.db.migrations.operations import create_index
+
+VERSION = 4
+DESCRIPTION = "Index readinglog on (duration, id)"
+TRANSACTIONAL = False
+
+
+def upgrade(connection: Connection) -> None:
+    create_index(
+        connection,
+        "ix_readinglog_duration_id",
+        "readinglog",
+        ["duration", "id"],
+        concurrently=True,
+    )
@@ -0,0 +1,62 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.db.migrations.operations import create_index, is_postgresql
+
+VERSION = 5
+DESCRIPTION = "Full-text search over readinglog.description"
+TRANSACTIONAL = False
+
+# SQLite keeps an external-content FTS5 table in step with readinglog
+SQLITE_STATEMENTS = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS readinglog_fts USING fts5(
+        description, content='readinglog', content_rowid='id',
+        tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS readinglog_fts_insert AFTER INSERT ON readinglog
+    BEGIN
+        INSERT INTO readinglog_fts (rowid, description)
+        VALUES (new.id, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS readinglog_fts_delete AFTER DELETE ON readinglog
+    BEGIN
+        INSERT INTO readinglog_fts (readinglog_fts, rowid, description)
+        VALUES ('delete', old.id, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS readinglog_fts_update
+    AFTER UPDATE OF description ON readinglog
+    BEGIN
+        INSERT INTO readinglog_fts (readinglog_fts, rowid, description)
+        VALUES ('delete', old.id, old.description);
+        INSERT INTO readinglog_fts (rowid, description)
+        VALUES (new.id, new.description);
+    END
+    """,
+    # Index the rows that existed before the triggers
+    "INSERT INTO readinglog_fts (readinglog_fts) VALUES ('rebuild')",
+)
+
+
+def upgrade(connection: Connection) -> None:
+    if is_postgresql(connection):
+        # An expression index is maintained by PostgreSQL itself, so no column
+        # or trigger is needed. app.db.search repeats this expression verbatim.
+        create_index(
+            connection,
+            "ix_readinglog_description_fts",
+            "readinglog",
+            ["to_tsvector('english', coalesce(description, ''))"],
+            concurrently=True,
+            using="gin",
+        )
+        return
+
+    for statement in SQLITE_STATEMENTS:
+        connection.execute(text(statement))
@@ -0,0 +1,39 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.db.migrations.operations import create_index, is_postgresql
+
+VERSION = 6
+DESCRIPTION = "Create idempotency_key table"
+
+# Literal so that replaying the migration creates this version's schema
+POSTGRESQL_DDL = """
+    CREATE TABLE IF NOT EXISTS idempotency_key (
+        key VARCHAR NOT NULL,
+        request_hash VARCHAR NOT NULL,
+        status_code INTEGER NOT NULL,
+        response TEXT NOT NULL,
+        created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+        PRIMARY KEY (key)
+    )
+"""
+SQLITE_DDL = """
+    CREATE TABLE IF NOT EXISTS idempotency_key (
+        "key" VARCHAR NOT NULL,
+        request_hash VARCHAR NOT NULL,
+        status_code INTEGER NOT NULL,
+        response TEXT NOT NULL,
+        created_at DATETIME NOT NULL,
+        PRIMARY KEY ("key")
+    )
+"""
+
+
+def upgrade(connection: Connection) -> None:
+    connection.execute(
+        text(POSTGRESQL_DDL if is_postgresql(connection) else SQLITE_DDL)
+    )
+    # The purge job deletes by age
+    create_index(
+        connection, "ix_idempotency_key_created_at", "idempotency_key", ["created_at"]
+    )
@@ -0,0 +1,158 @@
+import time
+
+from typing import Any, Dict, List
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.support.metrics import Counter, Gauge, Metric
+
+
+class PoolStats:
+    """
+    Running counters for a connection pool.
+
+    Updates are plain attribute increments. They may race under heavy threaded
+    use, which is an acceptable error for diagnostics and keeps locks off the
+    checkout path.
+    """
+
+    def __init__(self) -> None:
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.wait_count = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        self.wait_count += 1
+        self.wait_seconds_total += seconds
+        if seconds > self.wait_seconds_max:
+            self.wait_seconds_max = seconds
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "connects": self.connects,
+            "checkouts": self.checkouts,
+            "checkins": self.checkins,
+            "invalidations": self.invalidations,
+            "timeouts": self.timeouts,
+            "wait_seconds_total": round(self.wait_seconds_total, 6),
+            "wait_seconds_max": round(self.wait_seconds_max, 6),
+            "wait_seconds_avg": round(self.wait_seconds_total / self.wait_count, 6)
+            if self.wait_count
+            else 0.0,
+        }
+
+
+class _TimedPoolMixin:
+    """Measures how long each checkout waits for a connection."""
+
+    stats: PoolStats
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()  # type: ignore[misc]
+        except PoolTimeoutError:
+            self.stats.timeouts += 1
+            raise
+        finally:
+            self.stats.record_wait(time.perf_counter() - started)
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    """QueuePool that records checkout wait statistics."""
+
+
+class TimedAsyncAdaptedQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records checkout wait statistics."""
+
+
+def instrument_pool(engine: Engine) -> None:
+    """Attach event listeners that count connects, checkouts and checkins."""
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        engine.pool.stats.connects += 1
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        engine.pool.stats.checkouts += 1
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        engine.pool.stats.checkins += 1
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        engine.pool.stats.invalidations += 1
+
+
+def pool_status(engine: Engine) -> Dict[str, Any]:
+    """Return the current occupancy and running statistics of an engine's pool."""
+    pool = engine.pool
+    status: Dict[str, Any] = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            {
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+            }
+        )
+    stats = getattr(pool, "stats", None)
+    if isinstance(stats, PoolStats):
+        status.update(stats.as_dict())
+    return status
+
+
+def pool_metrics(engines: Dict[str, Engine]) -> List[Metric]:
+    """Build pool gauges and counters for /metrics, labelled by engine name."""
+    checked_out = Gauge(
+        "db_pool_checked_out_connections", "Connections in use", ("engine",)
+    )
+    overflow = Gauge(
+        "db_pool_overflow_connections",
+        "Connections open beyond the pool size (negative while below it)",
+        ("engine",),
+    )
+    size = Gauge("db_pool_size", "Configured pool size", ("engine",))
+    checkouts = Counter("db_pool_checkouts_total", "Connection checkouts", ("engine",))
+    timeouts = Counter(
+        "db_pool_timeouts_total", "Checkouts that timed out waiting", ("engine",)
+    )
+    wait_seconds = Counter(
+        "db_pool_checkout_wait_seconds_total",
+        "Time spent waiting for a pooled connection",
+        ("engine",),
+    )
+    wait_max = Gauge(
+        "db_pool_checkout_wait_seconds_max",
+        "Longest wait for a pooled connection",
+        ("engine",),
+    )
+
+    for name, engine in engines.items():
+        pool = engine.pool
+        if isinstance(pool, QueuePool):
+            checked_out.set(pool.checkedout(), name)
+            overflow.set(pool.overflow(), name)
+            size.set(pool.size(), name)
+        stats = getattr(pool, "stats", None)
+        if isinstance(stats, PoolStats):
+            checkouts.inc(name, amount=stats.checkouts)
+            timeouts.inc(name, amount=stats.timeouts)
+            wait_seconds.inc(name, amount=stats.wait_seconds_total)
+            wait_max.set(stats.wait_seconds_max, name)
+    return [checked_out, overflow, size, checkouts, timeouts, wait_seconds, wait_max]
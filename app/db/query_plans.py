@@ -0,0 +1,28 @@
+"""
+Query plan inspection, used to check that queries use their indexes.
+"""
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.sql import ClauseElement
+from sqlalchemy.sql.compiler import SQLCompiler
+
+
+def explain(engine: Engine, statement: ClauseElement) -> str:
+    """
+    Return the plan for `statement` as a single string: EXPLAIN on PostgreSQL,
+    EXPLAIN QUERY PLAN on SQLite.
+    """
+    compiled = statement.compile(dialect=engine.dialect)
+    assert isinstance(compiled, SQLCompiler)
+    if compiled.positional:
+        params = tuple(compiled.params[name] for name in compiled.positiontup or [])
+    else:
+        params = compiled.params
+
+    prefix = "EXPLAIN QUERY PLAN " if engine.dialect.name == "sqlite" else "EXPLAIN "
+    with engine.connect() as connection:
+        # Discourage PostgreSQL from picking a seq scan on a tiny table
+        if engine.dialect.name == "postgresql":
+            connection.exec_driver_sql("SET enable_seqscan = off")
+        rows = connection.exec_driver_sql(prefix + str(compiled), params).all()
+    return "\n".join(" ".join(str(value) for value in row) for row in rows)
@@ -0,0 +1,39 @@
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.support.request_timing import current_timings
+
+
+def instrument_queries(engine: Engine) -> None:
+    """
+    Attach cursor event listeners that add each statement's duration to the
+    current request's timings. Statements run outside a request are ignored.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ) -> None:
+        conn.info.setdefault("query_started", []).append((context, time.perf_counter()))
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ) -> None:
+        _, started = conn.info["query_started"].pop()
+        timings = current_timings.get()
+        if timings is not None:
+            timings.record_query(statement, time.perf_counter() - started)
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context) -> None:
+        # A failed statement never reaches after_cursor_execute, so drop its
+        # start time here or the connection's stack grows with every error
+        connection = exception_context.connection
+        if connection is None:
+            return
+        started = connection.info.get("query_started")
+        if started and started[-1][0] is exception_context.execution_context:
+            started.pop()
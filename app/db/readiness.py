@@ -0,0 +1,63 @@
+"""
+Cached database readiness probe.
+
+Orchestrators probe every replica every few seconds. `ReadinessCheck` runs a raw
+`SELECT 1` at most once per `cache_seconds` and answers other probes from the
+last result; concurrent probes arriving after it expires share a single query.
+"""
+
+import asyncio
+import time
+
+from typing import Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.support.logging_support import get_logger
+
+# Set up logger
+logger = get_logger(__name__)
+
+
+class ReadinessCheck:
+    """Database connectivity check whose result is reused for a while."""
+
+    def __init__(
+        self, engine: AsyncEngine, cache_seconds: float = 5.0, timeout: float = 2.0
+    ) -> None:
+        self.engine = engine
+        self.cache_seconds = cache_seconds
+        self.timeout = timeout
+        self._lock = asyncio.Lock()
+        self._checked_at: Optional[float] = None
+        self._result: Tuple[bool, Optional[str]] = (False, None)
+
+    async def check(self) -> Tuple[bool, Optional[str]]:
+        """Return (ready, error), querying the database only when the cache expired."""
+        if self._fresh():
+            return self._result
+        async with self._lock:
+            # Another probe may have refreshed the result while we waited
+            if not self._fresh():
+                self._result = await self._query()
+                self._checked_at = time.monotonic()
+        return self._result
+
+    def _fresh(self) -> bool:
+        return (
+            self._checked_at is not None
+            and time.monotonic() - self._checked_at < self.cache_seconds
+        )
+
+    async def _query(self) -> Tuple[bool, Optional[str]]:
+        try:
+            async with asyncio.timeout(self.timeout):
+                async with self.engine.connect() as connection:
+                    await connection.execute(text("SELECT 1"))
+        except Exception as e:
+            logger.warning("Readiness check failed: %s", str(e) or type(e).__name__)
+            # Only the exception type is returned, keeping connection details
+            # out of unauthenticated probe responses
+            return False, type(e).__name__
+        return True, None
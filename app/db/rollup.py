@@ -0,0 +1,147 @@
+"""
+Maintenance of the reading_log_daily rollup table.
+
+Write paths describe their effect on the raw rows as per-day deltas and apply
+them with a single upsert in the same transaction, so the rollup never drifts
+from readinglog. `rebuild_daily_rollup` recomputes it from scratch.
+"""
+
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, Tuple
+
+from sqlalchemy import Table, delete, func, insert, select, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.sql.base import ColumnCollection
+from sqlalchemy.sql.dml import Insert
+from sqlalchemy.sql.elements import ColumnElement
+from sqlmodel import col
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.db.stats import date_range_bounds, period_start
+from app.models.reading_log import ReadingLog, StatsBucket
+from app.models.reading_log_daily import ReadingLogDaily
+from app.support.logging_support import get_logger
+
+# Set up logger
+logger = get_logger(__name__)
+
+rollup_table: Table = ReadingLogDaily.__table__  # type: ignore[attr-defined]
+
+# Per-day change to (total_duration, count)
+DailyDeltas = Dict[date, Tuple[int, int]]
+
+
+def daily_deltas(changes: Iterable[Tuple[datetime, int, int]]) -> DailyDeltas:
+    """Sum (created_at, duration delta, count delta) changes into per-day deltas."""
+    totals: Dict[date, list] = defaultdict(lambda: [0, 0])
+    for created_at, duration, count in changes:
+        total = totals[created_at.date()]
+        total[0] += duration
+        total[1] += count
+    return {
+        day: (duration, count)
+        for day, (duration, count) in totals.items()
+        if duration or count
+    }
+
+
+def _added_to_rollup(excluded: ColumnCollection) -> Dict[str, ColumnElement]:
+    # SET clause adding the proposed row's totals to the existing row
+    return {
+        "total_duration": rollup_table.c.total_duration + excluded.total_duration,
+        "count": rollup_table.c.count + excluded.count,
+    }
+
+
+def upsert_statement(dialect_name: str, deltas: DailyDeltas) -> Insert:
+    """One multi-row INSERT ... ON CONFLICT that adds `deltas` to the rollup."""
+    rows = [
+        {"day": day, "total_duration": duration, "count": count}
+        for day, (duration, count) in sorted(deltas.items())
+    ]
+    if dialect_name == "postgresql":
+        postgresql_statement = postgresql.insert(rollup_table).values(rows)
+        return postgresql_statement.on_conflict_do_update(
+            index_elements=[rollup_table.c.day],
+            set_=_added_to_rollup(postgresql_statement.excluded),
+        )
+    sqlite_statement = sqlite.insert(rollup_table).values(rows)
+    return sqlite_statement.on_conflict_do_update(
+        index_elements=[rollup_table.c.day],
+        set_=_added_to_rollup(sqlite_statement.excluded),
+    )
+
+
+async def apply_daily_deltas(db: AsyncSession, deltas: DailyDeltas) -> None:
+    """Add `deltas` to the rollup within the session's current transaction."""
+    if not deltas:
+        return
+    await db.execute(upsert_statement(db.bind.dialect.name, deltas))  # type: ignore[union-attr]
+
+
+def _lock_rollup(connection: Connection) -> None:
+    # Blocks the write handlers' upserts (but not reads) until the transaction ends
+    if connection.dialect.name == "postgresql":
+        connection.execute(
+            text("LOCK TABLE reading_log_daily IN SHARE ROW EXCLUSIVE MODE")
+        )
+
+
+def rebuild_daily_rollup(engine: Engine, batch_days: int = 31) -> int:
+    """
+    Recompute the rollup from the raw rows, `batch_days` days per transaction.
+
+    Each window is aggregated in SQL, so raw rows are never loaded. On
+    PostgreSQL the rollup table is locked against concurrent upserts for the
+    duration of each window so that writes landing mid-rebuild are neither lost
+    nor double counted. Returns the number of days written.
+    """
+    with engine.begin() as connection:
+        _lock_rollup(connection)
+        first, last = connection.execute(
+            select(func.min(ReadingLog.created_at), func.max(ReadingLog.created_at))
+        ).one()
+        if first is None:
+            connection.execute(delete(rollup_table))
+            logger.info("No reading logs; rollup cleared")
+            return 0
+        # Drop days outside the range of the raw rows
+        connection.execute(
+            delete(rollup_table).where(
+                (rollup_table.c.day < first.date()) | (rollup_table.c.day > last.date())
+            )
+        )
+
+    day_expr = period_start(
+        engine.dialect.name, col(ReadingLog.created_at), StatsBucket.day
+    )
+    written = 0
+    window_start = first.date()
+    while window_start <= last.date():
+        window_end = window_start + timedelta(days=batch_days)
+        with engine.begin() as connection:
+            _lock_rollup(connection)
+            connection.execute(
+                delete(rollup_table).where(
+                    rollup_table.c.day >= window_start, rollup_table.c.day < window_end
+                )
+            )
+            aggregated = (
+                select(day_expr, func.sum(ReadingLog.duration), func.count())
+                .where(*date_range_bounds(window_start, window_end - timedelta(days=1)))
+                .group_by(day_expr)
+            )
+            result = connection.execute(
+                insert(rollup_table).from_select(
+                    ["day", "total_duration", "count"], aggregated
+                )
+            )
+            written += max(result.rowcount, 0)
+        logger.info(
+            "Rebuilt rollup for %s to %s", window_start, window_end - timedelta(days=1)
+        )
+        window_start = window_end
+
+    return written
@@ -0,0 +1,73 @@
+"""
+Full-text search over reading-log descriptions.
+
+PostgreSQL matches `websearch_to_tsquery` against a GIN expression index on the
+description's tsvector and ranks with `ts_rank`. SQLite matches against the
+readinglog_fts FTS5 table, which triggers keep in step with readinglog, and
+ranks with `bm25`. Both indexes are created by migration v0005 and live outside
+the ORM model. Results are ordered best match first, with `rank` normalised so
+that higher is better on both backends.
+"""
+
+from typing import Any, Sequence
+
+from sqlalchemy import Row, column, func, literal_column, table
+from sqlalchemy.sql.elements import ColumnElement
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.sql.expression import Select
+
+from app.models.reading_log import ReadingLog
+
+SEARCH_COLUMNS = ("id", "duration", "description", "created_at", "updated_at")
+
+# Must match the expression of ix_readinglog_description_fts exactly, or
+# PostgreSQL won't use the index
+SEARCH_DOCUMENT = "to_tsvector('english', coalesce(description, ''))"
+
+fts_table = table("readinglog_fts", column("rowid"))
+
+
+def fts5_query(q: str) -> str:
+    """
+    Turn free text into an FTS5 query matching every term. Each term is quoted
+    so user input can't inject FTS5 operators or cause syntax errors.
+    """
+    return " ".join('"' + term.replace('"', '""') + '"' for term in q.split())
+
+
+def search_statement(dialect_name: str, q: str) -> Select[Any]:
+    """Build the ranked search query for `q` on the given dialect."""
+    columns = [getattr(ReadingLog, name) for name in SEARCH_COLUMNS]
+    id_column = col(ReadingLog.id)
+
+    rank: ColumnElement[float]
+    if dialect_name == "postgresql":
+        query = func.websearch_to_tsquery(literal_column("'english'"), q)
+        document: ColumnElement[Any] = literal_column(SEARCH_DOCUMENT)
+        rank = func.ts_rank(document, query)
+        ranked = [*columns, rank.label("rank")]
+        return (
+            select(*ranked)
+            .where(document.op("@@")(query))
+            .order_by(rank.desc(), id_column.desc())
+        )
+
+    fts: ColumnElement[Any] = literal_column("readinglog_fts")
+    # bm25 scores better matches lower, so negate it
+    rank = -func.bm25(fts)
+    ranked = [*columns, rank.label("rank")]
+    return (
+        select(*ranked)
+        .select_from(fts_table.join(ReadingLog, id_column == fts_table.c.rowid))
+        .where(fts.op("MATCH")(fts5_query(q)))
+        .order_by(rank.desc(), id_column.desc())
+    )
+
+
+async def search_reading_logs(
+    db: AsyncSession, q: str, *, limit: int, offset: int = 0
+) -> Sequence[Row]:
+    """Return one page of reading logs matching `q`, best match first."""
+    statement = search_statement(db.bind.dialect.name, q)  # type: ignore[union-attr]
+    return (await db.exec(statement.offset(offset).limit(limit))).all()
@@ -0,0 +1,52 @@
+import os
+
+from dataclasses import dataclass
+from typing import Any, Dict
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+@dataclass(frozen=True)
+class EngineSettings:
+    """Tunable options passed to the SQLAlchemy engines."""
+
+    # Log every SQL statement. Expensive, so only enable it for debugging.
+    echo: bool = False
+    # Connections kept open in the pool
+    pool_size: int = 10
+    # Extra connections allowed above pool_size under burst load
+    max_overflow: int = 20
+    # Seconds to wait for a free connection before giving up
+    pool_timeout: float = 30.0
+    # Recycle connections after this many seconds
+    pool_recycle: int = 300
+    # Test connections for liveness on checkout
+    pool_pre_ping: bool = True
+
+    @classmethod
+    def from_env(cls) -> "EngineSettings":
+        """Build settings from DB_* environment variables, using defaults for unset ones."""
+        defaults = cls()
+        return cls(
+            echo=_env_bool("DB_ECHO", defaults.echo),
+            pool_size=int(os.getenv("DB_POOL_SIZE", defaults.pool_size)),
+            max_overflow=int(os.getenv("DB_MAX_OVERFLOW", defaults.max_overflow)),
+            pool_timeout=float(os.getenv("DB_POOL_TIMEOUT", defaults.pool_timeout)),
+            pool_recycle=int(os.getenv("DB_POOL_RECYCLE", defaults.pool_recycle)),
+            pool_pre_ping=_env_bool("DB_POOL_PRE_PING", defaults.pool_pre_ping),
+        )
+
+    def pool_kwargs(self) -> Dict[str, Any]:
+        """Keyword arguments for `create_engine` that configure the connection pool."""
+        return {
+            "pool_size": self.pool_size,
+            "max_overflow": self.max_overflow,
+            "pool_timeout": self.pool_timeout,
+            "pool_recycle": self.pool_recycle,
+            "pool_pre_ping": self.pool_pre_ping,
+        }
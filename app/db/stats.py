@@ -0,0 +1,99 @@
+from datetime import date, datetime, time, timedelta
+from typing import Any, List, Optional
+
+from sqlalchemy import Date, cast, func, literal_column
+from sqlalchemy.sql.elements import ColumnElement
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.reading_log import (
+    ReadingLog,
+    ReadingLogStats,
+    ReadingLogStatsBucket,
+    StatsBucket,
+)
+from app.models.reading_log_daily import ReadingLogDaily
+
+
+def period_start(dialect_name: str, column: Any, bucket: StatsBucket) -> ColumnElement:
+    """
+    SQL expression for the first day of the period containing `column`.
+    Weeks start on Monday on both backends.
+    """
+    if dialect_name == "postgresql":
+        # Inline the unit: a bound parameter would make the SELECT and GROUP BY
+        # expressions differ and PostgreSQL would reject the query.
+        unit: ColumnElement[str] = literal_column(f"'{bucket.value}'")
+        return cast(func.date_trunc(unit, column), Date)
+
+    # SQLite stores datetimes as text and has no date_trunc
+    if bucket == StatsBucket.week:
+        # Move forward to Sunday (no-op on a Sunday), then back to Monday
+        return func.date(column, "weekday 0", "-6 days")
+    if bucket == StatsBucket.month:
+        return func.date(column, "start of month")
+    return func.date(column)
+
+
+def date_range_bounds(
+    start: Optional[date], end: Optional[date]
+) -> List[ColumnElement]:
+    """Predicates limiting `created_at` to the inclusive [start, end] date range."""
+    conditions = []
+    if start is not None:
+        conditions.append(
+            col(ReadingLog.created_at) >= datetime.combine(start, time.min)
+        )
+    if end is not None:
+        conditions.append(
+            col(ReadingLog.created_at)
+            < datetime.combine(end + timedelta(days=1), time.min)
+        )
+    return conditions
+
+
+async def reading_stats(
+    db: AsyncSession,
+    *,
+    start: Optional[date],
+    end: Optional[date],
+    bucket: StatsBucket,
+) -> ReadingLogStats:
+    """
+    Aggregate reading totals per period in SQL from the reading_log_daily
+    rollup, which holds one row per day instead of one per session.
+    """
+    period = period_start(db.bind.dialect.name, col(ReadingLogDaily.day), bucket)  # type: ignore[union-attr]
+    conditions = [col(ReadingLogDaily.count) > 0]
+    if start is not None:
+        conditions.append(col(ReadingLogDaily.day) >= start)
+    if end is not None:
+        conditions.append(col(ReadingLogDaily.day) <= end)
+    statement = (
+        select(
+            period.label("period_start"),
+            func.sum(ReadingLogDaily.total_duration).label("total_minutes"),
+            func.sum(ReadingLogDaily.count).label("session_count"),
+        )
+        .where(*conditions)
+        .group_by(period)
+        .order_by(period)
+    )
+
+    rows = (await db.exec(statement)).all()  # type: ignore[call-overload]
+    buckets = [
+        ReadingLogStatsBucket(
+            period_start=first_day,
+            total_minutes=total_minutes,
+            session_count=session_count,
+        )
+        for first_day, total_minutes, session_count in rows
+    ]
+    return ReadingLogStats(
+        start=start,
+        end=end,
+        bucket=bucket,
+        total_minutes=sum(b.total_minutes for b in buckets),
+        session_count=sum(b.session_count for b in buckets),
+        buckets=buckets,
+    )
@@ -1,4 +1,6 @@
+import asyncio
 import os
+import time
 import traceback
 
 from contextlib import asynccontextmanager
@@ -7,13 +9,22 @@ from typing import Any, Dict, List
 from dotenv import load_dotenv
 from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from sqlmodel import Session, select
+from fastapi.responses import JSONResponse, PlainTextResponse
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.api.reading_logs import ingest_queue, reading_log_cache
 from app.api.reading_logs import router as reading_logs_router
-from app.db.database import create_db_and_tables, get_session
+from app.db.database import async_engine, engine, get_async_session
+from app.db.idempotency import IDEMPOTENCY_CLEANUP_INTERVAL, run_idempotency_cleanup
+from app.db.migrations import ensure_schema
+from app.db.pool import pool_metrics, pool_status
+from app.db.readiness import ReadinessCheck
 from app.models import ReadingLog
 from app.support.logging_support import get_logger
+from app.support.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE
+from app.support.metrics import MetricsMiddleware, multiprocess_dir, registry
+from app.support.request_timing import ServerTimingMiddleware
 
 # Set up logger
 logger = get_logger(__name__)
@@ -21,23 +32,82 @@ logger = get_logger(__name__)
 # Load environment variables from .env file
 load_dotenv()
 
+# /readyz reuses its SELECT 1 result for this many seconds, and fails if the
+# query takes longer than READINESS_TIMEOUT seconds
+READINESS_CACHE_SECONDS = float(os.getenv("READINESS_CACHE_SECONDS", "5"))
+READINESS_TIMEOUT = float(os.getenv("READINESS_TIMEOUT", "2"))
+
+# With METRICS_MULTIPROCESS_DIR, how often this worker publishes its metrics
+METRICS_SNAPSHOT_INTERVAL = float(os.getenv("METRICS_SNAPSHOT_INTERVAL", "5"))
+
+readiness = ReadinessCheck(
+    async_engine, cache_seconds=READINESS_CACHE_SECONDS, timeout=READINESS_TIMEOUT
+)
+
+# Environment details reported by /health; they don't change while running
+ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
+DATABASE_TYPE = (
+    "postgresql" if os.getenv("DATABASE_URL", "").startswith("postgresql") else "sqlite"
+)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
     Lifespan event handler for FastAPI application.
-    Creates database tables on startup.
+    Prepares the database schema on startup according to DB_STARTUP_MODE
+    ("migrate" by default, or "check" / "skip" for fast starts) and records how
+    long each startup phase took. With INGEST_MODE=queue it also runs the
+    write-behind ingestion queue, draining it on shutdown, and it runs the job
+    purging expired idempotency keys. With METRICS_MULTIPROCESS_DIR it publishes
+    this worker's metrics snapshot for the others.
     """
     try:
         # Log startup information
+        started = time.perf_counter()
         logger.info("Application starting up...")
         logger.info("Environment: %s", os.getenv("ENVIRONMENT", "development"))
 
-        # Create database tables on startup
-        create_db_and_tables()
-        logger.info("Application startup complete")
+        startup_mode = os.getenv("DB_STARTUP_MODE", "migrate")
+        logger.info("Database startup mode: %s", startup_mode)
+        ensure_schema(engine, startup_mode)
+        schema_done = time.perf_counter()
+
+        if ingest_queue is not None:
+            await ingest_queue.start()
+        cleanup_task = (
+            asyncio.create_task(run_idempotency_cleanup(IDEMPOTENCY_CLEANUP_INTERVAL))
+            if IDEMPOTENCY_CLEANUP_INTERVAL > 0
+            else None
+        )
+        metrics_dir = multiprocess_dir()
+        snapshot_task = (
+            asyncio.create_task(
+                registry.write_snapshots(metrics_dir, METRICS_SNAPSHOT_INTERVAL)
+            )
+            if metrics_dir is not None
+            else None
+        )
+
+        app.state.startup_timings = {
+            "schema_ms": round((schema_done - started) * 1000, 1),
+            "total_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+        logger.info(
+            "Application startup complete: %s",
+            ", ".join(f"{k}={v}" for k, v in app.state.startup_timings.items()),
+        )
         yield
         logger.info("Application shutting down...")
+        if cleanup_task is not None:
+            cleanup_task.cancel()
+        if ingest_queue is not None:
+            # Writes out everything still queued
+            await ingest_queue.stop()
+        if snapshot_task is not None and metrics_dir is not None:
+            snapshot_task.cancel()
+            # Final counts; this worker's gauges no longer apply
+            registry.write_snapshot(metrics_dir, live=False)
     except Exception as e:
         logger.exception("Error during application lifecycle: %s", str(e))
         raise
@@ -58,8 +128,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
+)
+
+
+# Count requests and record latency per route for /metrics
+app.add_middleware(MetricsMiddleware)
+
+# Pool occupancy and wait times are read from the engines when scraped
+registry.add_collector(
+    lambda: pool_metrics({"async": async_engine.sync_engine, "sync": engine})
 )
 
+# Time every request and report it in a Server-Timing header. Added last so it
+# is the outermost middleware and also times CORS handling.
+app.add_middleware(ServerTimingMiddleware)
+
 
 # Add exception handler for unhandled exceptions
 @app.exception_handler(Exception)
@@ -89,15 +173,40 @@ app.include_router(reading_logs_router)
 @app.get("/")
 async def root():
     """Root endpoint."""
-    logger.info("Root endpoint accessed")
+    logger.debug("Root endpoint accessed")
     return {"message": "Welcome to the Reading App API"}
 
 
+@app.get("/livez")
+async def livez():
+    """
+    Liveness probe.
+    Answers as long as the process is serving requests; never touches the database.
+    """
+    return {"status": "alive"}
+
+
+@app.get("/readyz")
+async def readyz():
+    """
+    Readiness probe.
+    Runs SELECT 1 against the database at most once every READINESS_CACHE_SECONDS
+    and returns 503 while the database is unreachable.
+    """
+    ready, error = await readiness.check()
+    if not ready:
+        return JSONResponse(
+            status_code=503, content={"status": "unavailable", "error": error}
+        )
+    return {"status": "ready"}
+
+
 @app.get("/health")
-async def health(db: Session = Depends(get_session)):
+async def health(db: AsyncSession = Depends(get_async_session)):
     """
-    Health check endpoint.
-    Checks if the application is running and if the database is accessible.
+    Detailed health diagnostic.
+    Checks if the application is running and if the database is accessible through
+    the ORM, and reports environment details. Use /livez and /readyz for probes.
     """
     db_status = "unknown"
     errors: List[str] = []  # List to collect any errors
@@ -107,9 +216,9 @@ async def health(db: Session = Depends(get_session)):
 
     try:
         # Try to execute a simple query to check database connectivity
-        db.exec(select(ReadingLog).limit(1))
+        await db.exec(select(ReadingLog).limit(1))
         db_status = "healthy"
-        logger.info("Health check passed - Database connection successful")
+        logger.debug("Health check passed - Database connection successful")
     except Exception as e:
         db_status = "unhealthy"
         error_msg = str(e)
@@ -117,28 +226,60 @@ async def health(db: Session = Depends(get_session)):
         logger.exception("Database health check failed: %s", error_msg)
         # Don't raise an exception here, just report the issue in the response
 
-    # Get environment information
-    environment = os.getenv("ENVIRONMENT", "development")
-    database_url = os.getenv("DATABASE_URL", "Not set")
-    # Mask the password in the database URL if present
-    if database_url != "Not set" and ":" in database_url and "@" in database_url:
-        parts = database_url.split("@")
-        credentials = parts[0].split(":")
-        if len(credentials) > 2:
-            masked_url = f"{credentials[0]}:***@{parts[1]}"
-            database_url = masked_url
-
     response: Dict[str, Any] = {
         "status": "healthy" if db_status == "healthy" else "degraded",
         "database": db_status,
         "version": app.version,
-        "environment": environment,
-        "database_type": "postgresql"
-        if database_url != "Not set" and database_url.startswith("postgresql")
-        else "sqlite",
+        "environment": ENVIRONMENT,
+        "database_type": DATABASE_TYPE,
+        "startup_timings": getattr(app.state, "startup_timings", None),
     }
 
     if errors:
         response["errors"] = errors
 
     return response
+
+
+@app.get("/health/pool")
+async def health_pool():
+    """
+    Connection pool statistics.
+    Reports occupancy, overflow, checkout counts and checkout wait times for the
+    async engine used by request handlers and the sync engine used by scripts.
+    """
+    return {
+        "async": pool_status(async_engine.sync_engine),
+        "sync": pool_status(engine),
+    }
+
+
+@app.get("/health/cache")
+async def health_cache():
+    """
+    Reading log cache statistics.
+    Reports the cache backend with its hit, miss, eviction and invalidation counts.
+    """
+    return reading_log_cache.info()
+
+
+@app.get("/health/ingest")
+async def health_ingest():
+    """
+    Write-behind ingestion queue statistics.
+    Reports queue depth and accepted, duplicate, rejected and written counts when
+    INGEST_MODE=queue.
+    """
+    if ingest_queue is None:
+        return {"mode": "sync"}
+    return {"mode": "queue", **ingest_queue.info()}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """
+    Prometheus metrics in the text exposition format.
+    Covers request latency per route, in-flight requests, connection pool
+    occupancy and wait times, and reading log operation counts.
+    """
+    return PlainTextResponse(registry.render(), media_type=METRICS_CONTENT_TYPE)
@@ -1,15 +1,35 @@
+from app.models.idempotency_key import IdempotencyKey
 from app.models.reading_log import (
+    ExportFormat,
     ReadingLog,
     ReadingLogBase,
     ReadingLogCreate,
+    ReadingLogImport,
+    ReadingLogImportResult,
     ReadingLogRead,
+    ReadingLogSearchResult,
+    ReadingLogSort,
+    ReadingLogStats,
+    ReadingLogStatsBucket,
     ReadingLogUpdate,
+    StatsBucket,
 )
+from app.models.reading_log_daily import ReadingLogDaily
 
 __all__ = [
+    "ExportFormat",
+    "IdempotencyKey",
     "ReadingLog",
     "ReadingLogBase",
     "ReadingLogCreate",
+    "ReadingLogDaily",
+    "ReadingLogImport",
+    "ReadingLogImportResult",
     "ReadingLogRead",
+    "ReadingLogSearchResult",
+    "ReadingLogSort",
+    "ReadingLogStats",
+    "ReadingLogStatsBucket",
     "ReadingLogUpdate",
+    "StatsBucket",
 ]
@@ -0,0 +1,27 @@
+from datetime import datetime
+
+from sqlalchemy import Column, Text
+from sqlmodel import Field, SQLModel
+
+
+class IdempotencyKey(SQLModel, table=True):
+    """
+    Response recorded for a client-supplied Idempotency-Key.
+
+    Written in the same transaction as the reading logs the request created, so
+    a retried request can be answered from here without writing again. Rows
+    older than IDEMPOTENCY_KEY_TTL_HOURS are purged by a background job.
+    """
+
+    __tablename__ = "idempotency_key"
+
+    key: str = Field(primary_key=True, max_length=255)
+    request_hash: str = Field(
+        max_length=64, description="Fingerprint of the request the key was used for"
+    )
+    status_code: int = Field(description="Status code of the original response")
+    response: str = Field(
+        sa_column=Column(Text, nullable=False),
+        description="JSON body of the original response",
+    )
+    created_at: datetime = Field(default_factory=datetime.utcnow, index=True)
@@ -1,9 +1,22 @@
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime, timezone
+from enum import Enum
+from typing import List, Optional
 
+from pydantic import field_validator
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel
 
 
+def naive_utc(value: datetime) -> datetime:
+    """
+    Timestamps are stored as naive UTC. Convert an aware datetime to that;
+    naive ones are taken to be UTC already.
+    """
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
 class ReadingLogBase(SQLModel):
     """Base model for reading logs."""
 
@@ -16,12 +29,23 @@ class ReadingLogBase(SQLModel):
 class ReadingLog(ReadingLogBase, table=True):
     """Reading log model."""
 
+    # (created_at, id) and (duration, id) back the orderings, keyset pagination
+    # and range filters of the list endpoint. Changes to indexes must also ship
+    # as a migration in app/db/migrations/versions so they reach existing
+    # databases.
+    __table_args__ = (
+        Index("ix_readinglog_created_at_id", "created_at", "id"),
+        Index("ix_readinglog_duration_id", "duration", "id"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     created_at: datetime = Field(
         default_factory=datetime.utcnow, description="Date and time of the reading log"
     )
     updated_at: Optional[datetime] = Field(
-        default=None, description="Date the reading log was updated, if it was"
+        default=None,
+        index=True,
+        description="Date the reading log was updated, if it was",
     )
 
 
@@ -38,6 +62,42 @@ class ReadingLogUpdate(SQLModel):
     description: Optional[str] = None
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
+    @field_validator("duration")
+    @classmethod
+    def _duration_not_null(cls, value: Optional[int]) -> int:
+        # Leaving duration out keeps it; the column is NOT NULL, so null can't
+        # be stored (the default None isn't validated)
+        if value is None:
+            raise ValueError("duration can be omitted but not null")
+        return value
+
+
+class ReadingLogImport(ReadingLogBase):
+    """Schema for a historical reading log loaded by the bulk import."""
+
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: Optional[datetime] = None
+
+    @field_validator("created_at", "updated_at")
+    @classmethod
+    def _to_naive_utc(cls, value: Optional[datetime]) -> Optional[datetime]:
+        # PostgreSQL would drop the offset and the rollup would bucket by it
+        return naive_utc(value) if value is not None else None
+
+    @field_validator("description")
+    @classmethod
+    def _empty_description_is_none(cls, value: Optional[str]) -> Optional[str]:
+        # COPY loads an empty field as NULL, so store "" as NULL on every backend
+        return value or None
+
+
+class ReadingLogImportResult(SQLModel):
+    """Outcome of a bulk import."""
+
+    rows: int
+    seconds: float
+    rows_per_second: float
+
 
 class ReadingLogRead(ReadingLogBase):
     """Schema for reading a reading log."""
@@ -45,3 +105,60 @@ class ReadingLogRead(ReadingLogBase):
     id: int
     created_at: datetime
     updated_at: Optional[datetime] = None
+
+
+class ReadingLogSearchResult(ReadingLogRead):
+    """A reading log matching a full-text search."""
+
+    rank: float = Field(description="Relevance of the match; higher is better")
+
+
+class StatsBucket(str, Enum):
+    """Period used to group reading statistics."""
+
+    day = "day"
+    week = "week"
+    month = "month"
+
+
+class ReadingLogSort(str, Enum):
+    """Ordering of the reading-log list; a leading "-" sorts descending."""
+
+    created_at = "created_at"
+    created_at_desc = "-created_at"
+    duration = "duration"
+    duration_desc = "-duration"
+
+    @property
+    def field(self) -> str:
+        return self.value.lstrip("-")
+
+    @property
+    def descending(self) -> bool:
+        return self.value.startswith("-")
+
+
+class ExportFormat(str, Enum):
+    """Encoding used by the reading-log export and import."""
+
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+class ReadingLogStatsBucket(SQLModel):
+    """Reading totals for one period."""
+
+    period_start: date = Field(description="First day of the period")
+    total_minutes: int
+    session_count: int
+
+
+class ReadingLogStats(SQLModel):
+    """Aggregated reading statistics over a date range."""
+
+    start: Optional[date] = None
+    end: Optional[date] = None
+    bucket: StatsBucket
+    total_minutes: int
+    session_count: int
+    buckets: List[ReadingLogStatsBucket]
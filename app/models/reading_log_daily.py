@@ -0,0 +1,19 @@
+from datetime import date
+
+from sqlmodel import Field, SQLModel
+
+
+class ReadingLogDaily(SQLModel, table=True):
+    """
+    Daily rollup of reading logs.
+
+    Kept current by the reading-log write handlers in the same transaction as
+    the change to the raw rows, and rebuilt from them by
+    scripts/rebuild_daily_rollup.py.
+    """
+
+    __tablename__ = "reading_log_daily"
+
+    day: date = Field(primary_key=True, description="UTC day the sessions started")
+    total_duration: int = Field(default=0, description="Total minutes read that day")
+    count: int = Field(default=0, description="Number of reading sessions that day")
@@ -0,0 +1,244 @@
+"""
+Pluggable caches for API reads.
+
+Backends share a small async interface (get / set / delete) and keep hit, miss
+and eviction counters. `delete` leaves a short-lived tombstone instead of just
+dropping the entry, and `set` never replaces an entry or tombstone, so a read
+that loaded a row before a write committed can't put the old row back after the
+write invalidated it. The in-process LRU is the default for a single worker;
+the Redis backend works with any client exposing the async `get`, `set(ex=...)`
+and `delete` calls of `redis.asyncio.Redis`, so a local stand-in such as
+fakeredis can take its place. Redis failures never fail a request: reads fall
+back to the database and failed writes are logged.
+"""
+
+import json
+import os
+import time
+
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.support.logging_support import get_logger
+
+# Set up logger
+logger = get_logger(__name__)
+
+# How long a deleted key refuses new values; longer than a read takes between
+# loading a row and caching it
+TOMBSTONE_SECONDS = 5.0
+
+# Marks an invalidated key. Not valid JSON, so no cached value can equal it.
+_TOMBSTONE = "~"
+
+
+class CacheStats:
+    """Counters for a cache backend."""
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.errors = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "errors": self.errors,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class Cache:
+    """Cache interface. The base class caches nothing."""
+
+    backend = "none"
+
+    def __init__(self) -> None:
+        self.stats = CacheStats()
+
+    async def get(self, key: str) -> Optional[Any]:
+        self.stats.misses += 1
+        return None
+
+    async def set(self, key: str, value: Any) -> None:
+        """Store `value` unless `key` already has a value or a tombstone."""
+        return None
+
+    async def delete(self, key: str) -> None:
+        """Invalidate `key`, refusing new values for TOMBSTONE_SECONDS."""
+        self.stats.invalidations += 1
+
+    def info(self) -> Dict[str, Any]:
+        return {"backend": self.backend, **self.stats.as_dict()}
+
+
+class LRUCache(Cache):
+    """
+    In-process LRU cache with a per-entry TTL.
+
+    Only used from the event loop thread, so it needs no locking.
+    """
+
+    backend = "memory"
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        super().__init__()
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.stats.evictions += 1
+            self.stats.misses += 1
+            return None
+        if value is _TOMBSTONE:
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    async def set(self, key: str, value: Any) -> None:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return
+        self._store(key, value, self.ttl_seconds)
+
+    async def delete(self, key: str) -> None:
+        self._store(key, _TOMBSTONE, TOMBSTONE_SECONDS)
+        self.stats.invalidations += 1
+
+    def _store(self, key: str, value: Any, ttl_seconds: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            **super().info(),
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+
+class RedisCache(Cache):
+    """
+    Cache backed by Redis, shared between workers. Values are stored as JSON
+    and expire server-side, so evictions aren't visible to this process.
+    """
+
+    backend = "redis"
+
+    def __init__(self, client: Any, ttl_seconds: float, prefix: str = "") -> None:
+        super().__init__()
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[Any]:
+        try:
+            raw = await self.client.get(self.prefix + key)
+        except Exception as e:
+            # Fail open: the caller reads from the database instead
+            self.stats.errors += 1
+            self.stats.misses += 1
+            logger.warning("Redis cache get failed for %s: %s", key, e)
+            return None
+        if raw is None or raw in (_TOMBSTONE, _TOMBSTONE.encode()):
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return json.loads(raw)
+
+    async def set(self, key: str, value: Any) -> None:
+        try:
+            # NX: leave a value another worker stored, or a tombstone, alone
+            await self.client.set(
+                self.prefix + key,
+                json.dumps(value),
+                ex=max(1, int(self.ttl_seconds)),
+                nx=True,
+            )
+        except Exception as e:
+            self.stats.errors += 1
+            logger.warning("Redis cache set failed for %s: %s", key, e)
+
+    async def delete(self, key: str) -> None:
+        try:
+            await self.client.set(
+                self.prefix + key, _TOMBSTONE, ex=max(1, int(TOMBSTONE_SECONDS))
+            )
+        except Exception as e:
+            # The write has already been committed; the stale entry expires
+            # after ttl_seconds
+            self.stats.errors += 1
+            logger.error(
+                "Redis cache delete failed for %s, may be stale for up to %ss: %s",
+                key,
+                self.ttl_seconds,
+                e,
+            )
+            return
+        self.stats.invalidations += 1
+
+
+def create_cache(prefix: str) -> Cache:
+    """
+    Build the cache selected by the environment:
+
+    - CACHE_BACKEND: memory, redis or none. Defaults to memory with a single
+      worker process and to none when WEB_CONCURRENCY > 1, where each worker
+      would keep serving its own copy after another worker's update
+    - CACHE_MAX_ENTRIES: LRU capacity (default 10000)
+    - CACHE_TTL_SECONDS: entry lifetime (default 60)
+    - REDIS_URL: Redis connection URL for the redis backend
+    """
+    workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+    backend = os.getenv("CACHE_BACKEND", "memory" if workers <= 1 else "none").lower()
+    if backend == "memory" and workers > 1:
+        logger.warning(
+            "CACHE_BACKEND=memory with %s workers: reads may be stale for up to "
+            "CACHE_TTL_SECONDS after an update handled by another worker",
+            workers,
+        )
+    ttl_seconds = float(os.getenv("CACHE_TTL_SECONDS", "60"))
+
+    if backend == "none":
+        return Cache()
+    if backend == "redis":
+        try:
+            from redis import asyncio as redis_asyncio
+        except ImportError as e:
+            raise RuntimeError(
+                "CACHE_BACKEND=redis requires the redis package (pip install redis)"
+            ) from e
+        redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+        logger.info("Using Redis cache for %s", prefix)
+        return RedisCache(
+            redis_asyncio.from_url(redis_url), ttl_seconds, prefix=f"{prefix}:"
+        )
+    if backend != "memory":
+        raise ValueError(
+            f"Unknown CACHE_BACKEND {backend!r}; expected memory, redis or none"
+        )
+
+    return LRUCache(
+        max_entries=int(os.getenv("CACHE_MAX_ENTRIES", "10000")),
+        ttl_seconds=ttl_seconds,
+    )
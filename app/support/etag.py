@@ -0,0 +1,42 @@
+"""
+Entity tags for conditional requests.
+
+ETags are strong validators built from a hash of whatever identifies a
+representation's version, so computing one never requires serializing the
+response body.
+"""
+
+import hashlib
+
+from typing import Any, Optional
+
+
+def make_etag(*parts: Any) -> str:
+    """Build a quoted ETag from the parts identifying a representation."""
+    digest = hashlib.blake2b(digest_size=12)
+    for part in parts:
+        digest.update(str(part).encode())
+        digest.update(b"\0")
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(header: Optional[str], etag: str, weak: bool = False) -> bool:
+    """
+    Check `etag` against an If-Match / If-None-Match header value.
+
+    `*` matches any current representation. If-None-Match uses weak comparison
+    (`weak=True`), which ignores a `W/` prefix; If-Match requires a strong match.
+    """
+    if not header:
+        return False
+    for value in header.split(","):
+        candidate = value.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            if not weak:
+                continue
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
@@ -0,0 +1,48 @@
+"""
+Fast JSON rendering for API responses.
+
+By default FastAPI validates a handler's return value against its
+response_model, runs it through jsonable_encoder and renders it with the
+standard library. With FAST_JSON=true, row-returning handlers instead build
+plain dicts straight from model attributes and render them with orjson (or the
+standard library when orjson isn't installed), skipping both Pydantic passes.
+"""
+
+import json
+import os
+
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Sequence
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional extra
+    orjson = None  # type: ignore[assignment]
+
+# Opt in to the fast serialization path
+FAST_JSON = os.getenv("FAST_JSON", "false").lower() == "true"
+
+
+def json_default(value: Any) -> str:
+    """`default` hook for json.dumps that renders datetimes as ISO 8601."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson when it is available."""
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content)
+        return json.dumps(
+            content, default=json_default, ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
+
+
+def rows_to_dicts(rows: Iterable[Any], fields: Sequence[str]) -> List[Dict[str, Any]]:
+    """Copy `fields` from each row into a plain dict, without validation."""
+    return [{name: getattr(row, name) for name in fields} for row in rows]
@@ -1,13 +1,196 @@
+"""
+Logging configuration.
+
+LOG_FORMAT selects the output:
+
+- rich (the default outside production): colourised console output through
+  RichHandler, written synchronously. Meant for development.
+- json (the default when ENVIRONMENT=production): one JSON object per line on
+  stdout. Callers only put records on an in-memory queue; a QueueListener
+  thread formats and writes them, so slow log output never blocks a request.
+
+In both modes LOG_LEVEL sets the root level, LOG_LEVELS overrides it per logger
+("app.main=WARNING,uvicorn.access=WARNING") and LOG_SAMPLE_RATES keeps only a
+fraction of the records below WARNING from noisy loggers and their children
+("app.support.request_timing=0.1").
+"""
+
+import atexit
+import json
 import logging
+import os
+import queue
+import random
+import sys
+
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
 
 from rich.logging import RichHandler
 
-# Configure rich logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(message)s",
-    handlers=[RichHandler(rich_tracebacks=True, markup=True)],
-)
+ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
+LOG_FORMAT = os.getenv(
+    "LOG_FORMAT", "json" if ENVIRONMENT == "production" else "rich"
+).lower()
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+def _parse_mapping(value: str) -> Dict[str, str]:
+    """Parse "name=value,name=value" settings, ignoring malformed entries."""
+    mapping = {}
+    for item in value.split(","):
+        name, sep, setting = item.partition("=")
+        if sep and name.strip() and setting.strip():
+            mapping[name.strip()] = setting.strip()
+    return mapping
+
+
+LOG_LEVELS = {
+    name: level.upper()
+    for name, level in _parse_mapping(os.getenv("LOG_LEVELS", "")).items()
+}
+LOG_SAMPLE_RATES = {
+    name: float(rate)
+    for name, rate in _parse_mapping(os.getenv("LOG_SAMPLE_RATES", "")).items()
+}
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep a random fraction of the records below WARNING from the configured
+    loggers (and their children); warnings and errors always pass.
+    """
+
+    def __init__(self, rates: Dict[str, float]) -> None:
+        super().__init__()
+        self.rates = rates
+        # Resolved rate per logger name, None when the logger isn't sampled
+        self._resolved: Dict[str, Optional[float]] = {}
+
+    def _rate(self, name: str) -> Optional[float]:
+        if name not in self._resolved:
+            rate = None
+            candidate = name
+            while candidate:
+                if candidate in self.rates:
+                    rate = self.rates[candidate]
+                    break
+                candidate = candidate.rpartition(".")[0]
+            self._resolved[name] = rate
+        return self._resolved[name]
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate(record.name)
+        return rate is None or random.random() < rate  # noqa: S311
+
+
+class JSONFormatter(logging.Formatter):
+    """Format records as single-line JSON objects, including `extra` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc)
+            .isoformat(timespec="milliseconds")
+            .replace("+00:00", "Z"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = record.stack_info
+        return json.dumps(entry, default=str)
+
+
+class _NonBlockingQueueHandler(QueueHandler):
+    """
+    QueueHandler that only renders the message and traceback on the calling
+    thread, while args and exc_info are still valid, and leaves JSON formatting
+    to the listener thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = logging.makeLogRecord(vars(record))
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class JSONLogPipeline:
+    """Queue handler for callers and a listener thread writing JSON lines to stdout."""
+
+    def __init__(self) -> None:
+        self.handler = _NonBlockingQueueHandler(queue.SimpleQueue())
+        self._listener: Optional[QueueListener] = None
+
+    def start(self) -> None:
+        """Start the listener thread (again, in a forked child)."""
+        # A fresh queue, in case a forked child inherited one mid-operation
+        log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        self.handler.queue = log_queue
+        output = logging.StreamHandler(sys.stdout)
+        output.setFormatter(JSONFormatter())
+        self._listener = QueueListener(log_queue, output, respect_handler_level=True)
+        self._listener.start()
+
+    def stop(self) -> None:
+        """Write out the remaining queued records and stop the listener thread."""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+
+
+def configure_logging() -> None:
+    """Install the handlers, levels and sampling selected by the environment."""
+    handler: logging.Handler
+    if LOG_FORMAT == "json":
+        pipeline = JSONLogPipeline()
+        pipeline.start()
+        atexit.register(pipeline.stop)
+        # Threads don't survive fork; give worker processes their own listener
+        os.register_at_fork(after_in_child=pipeline.start)
+        handler = pipeline.handler
+    else:
+        handler = RichHandler(rich_tracebacks=True, markup=True)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+
+    if LOG_SAMPLE_RATES:
+        handler.addFilter(SamplingFilter(LOG_SAMPLE_RATES))
+
+    logging.basicConfig(level=LOG_LEVEL, handlers=[handler], force=True)
+    for name, level in LOG_LEVELS.items():
+        logging.getLogger(name).setLevel(level)
+
+
+def uvicorn_log_config() -> Optional[Dict[str, Any]]:
+    """
+    The `log_config` to pass to uvicorn. In JSON mode uvicorn leaves logging
+    alone, so its loggers propagate into the JSON pipeline.
+    """
+    if LOG_FORMAT == "json":
+        return None
+    from uvicorn.config import LOGGING_CONFIG
+
+    return LOGGING_CONFIG
+
+
+configure_logging()
 
 # Create a function to get loggers
 
@@ -0,0 +1,371 @@
+"""
+Prometheus-style metrics in the text exposition format.
+
+Counters, gauges and histograms are plain Python numbers in dicts keyed by
+label values. They are only updated from the event loop thread (middleware and
+async handlers), so they need no locks; values that live elsewhere, such as
+connection pool statistics, are read by collectors when /metrics is scraped.
+
+Under gunicorn every worker has its own registry, and a scrape reaches whichever
+worker accepts the connection. With METRICS_MULTIPROCESS_DIR set (the
+production server sets it when it runs more than one worker) each worker writes
+a snapshot of its metrics there every METRICS_SNAPSHOT_INTERVAL seconds and on
+each scrape, and /metrics renders the sum over all snapshots, so any worker
+reports the same totals. Snapshots of exited workers keep counting towards
+counters and histograms, which would otherwise appear to reset, but not towards
+gauges.
+"""
+
+import asyncio
+import json
+import os
+import time
+
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+Labels = Tuple[str, ...]
+
+# Starlette appends the charset
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+# Seconds; the Prometheus client defaults
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.075,
+    0.1,
+    0.25,
+    0.5,
+    0.75,
+    1.0,
+    2.5,
+    5.0,
+    7.5,
+    10.0,
+)
+
+
+def multiprocess_dir() -> Optional[Path]:
+    """Directory shared by the worker processes, or None for a single process."""
+    # Read at call time: the production server sets it after this is imported
+    directory = os.getenv("METRICS_MULTIPROCESS_DIR")
+    return Path(directory) if directory else None
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)
+    )
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """Base class for a named metric family with fixed label names."""
+
+    kind = "untyped"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def samples(self) -> Iterable[Tuple[str, Labels, Sequence[str], float]]:
+        """Yield (sample name, label names, label values, value)."""
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        return _render_family(
+            self.name, self.documentation, self.kind, list(self.samples())
+        )
+
+
+def _render_family(
+    name: str,
+    documentation: str,
+    kind: str,
+    samples: Sequence[Tuple[str, Sequence[str], Sequence[str], float]],
+) -> List[str]:
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+    for sample_name, names, values, value in samples:
+        lines.append(
+            f"{sample_name}{_format_labels(names, values)} {_format_value(value)}"
+        )
+    return lines
+
+
+class Counter(Metric):
+    """Monotonically increasing value per label set."""
+
+    kind = "counter"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self):
+        for labels, value in self._values.items():
+            yield self.name, self.labelnames, labels, value
+
+
+class Gauge(Metric):
+    """Value per label set that can go up and down."""
+
+    kind = "gauge"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Labels, float] = {}
+
+    def set(self, value: float, *labels: str) -> None:
+        self._values[labels] = value
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def samples(self):
+        for labels, value in self._values.items():
+            yield self.name, self.labelnames, labels, value
+
+
+class Histogram(Metric):
+    """Observations counted into cumulative buckets per label set."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: non-cumulative bucket counts (last is +Inf), sum
+        self._series: Dict[Labels, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+        counts, total = series
+        counts[bisect_left(self.buckets, value)] += 1
+        total[0] += value
+
+    def samples(self):
+        bucket_names = (*self.labelnames, "le")
+        for labels, (counts, total) in self._series.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                yield (
+                    f"{self.name}_bucket",
+                    bucket_names,
+                    (*labels, _format_value(bound)),
+                    cumulative,
+                )
+            yield f"{self.name}_sum", self.labelnames, labels, total[0]
+            yield f"{self.name}_count", self.labelnames, labels, cumulative
+
+
+class MetricsRegistry:
+    """Metrics rendered together by /metrics."""
+
+    def __init__(self) -> None:
+        self._metrics: List[Metric] = []
+        self._collectors: List[Callable[[], Iterable[Metric]]] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))  # type: ignore[return-value]
+
+    def gauge(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))  # type: ignore[return-value]
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))  # type: ignore[return-value]
+
+    def add_collector(self, collector: Callable[[], Iterable[Metric]]) -> None:
+        """Register a callable returning freshly built metrics at each scrape."""
+        self._collectors.append(collector)
+
+    def collect(self) -> List[Metric]:
+        """The registered metrics followed by those the collectors build."""
+        metrics = list(self._metrics)
+        for collector in self._collectors:
+            metrics.extend(collector())
+        return metrics
+
+    def render(self) -> str:
+        """This process's metrics, or every worker's when they share a directory."""
+        directory = multiprocess_dir()
+        if directory is not None:
+            self.write_snapshot(directory)
+            return render_snapshots(directory)
+        lines: List[str] = []
+        for metric in self.collect():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def write_snapshot(self, directory: Path, live: bool = True) -> None:
+        """Write this process's metrics to `directory` for the other workers."""
+        snapshot = {
+            "live": live,
+            "families": [
+                {
+                    "name": metric.name,
+                    "documentation": metric.documentation,
+                    "kind": metric.kind,
+                    "samples": [list(sample) for sample in metric.samples()],
+                }
+                for metric in self.collect()
+            ],
+        }
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{os.getpid()}.json"
+        # Write and rename so readers never see a partial snapshot
+        partial = path.with_suffix(".tmp")
+        partial.write_text(json.dumps(snapshot), encoding="utf-8")
+        partial.replace(path)
+
+    async def write_snapshots(self, directory: Path, interval: float) -> None:
+        """Keep this process's snapshot current until cancelled."""
+        while True:
+            self.write_snapshot(directory)
+            await asyncio.sleep(interval)
+
+
+def mark_process_dead(directory: Path, pid: int) -> None:
+    """Stop counting the gauges of exited worker `pid` (a gunicorn child_exit hook)."""
+    path = directory / f"{pid}.json"
+    try:
+        snapshot = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return
+    snapshot["live"] = False
+    partial = path.with_suffix(".tmp")
+    partial.write_text(json.dumps(snapshot), encoding="utf-8")
+    partial.replace(path)
+
+
+def render_snapshots(directory: Path) -> str:
+    """Render the sum of the snapshots in `directory`, sample by sample."""
+    families: Dict[str, Dict[str, Any]] = {}
+    for path in sorted(directory.glob("*.json")):
+        try:
+            snapshot = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            # Removed, or an exited worker's last write was cut short
+            continue
+        for family in snapshot["families"]:
+            if family["kind"] == "gauge" and not snapshot["live"]:
+                continue
+            merged = families.setdefault(family["name"], {**family, "samples": {}})
+            for sample_name, names, values, value in family["samples"]:
+                key = (sample_name, tuple(names), tuple(values))
+                merged["samples"][key] = merged["samples"].get(key, 0) + value
+
+    lines: List[str] = []
+    for name, family in families.items():
+        lines.extend(
+            _render_family(
+                name,
+                family["documentation"],
+                family["kind"],
+                [(*key, value) for key, value in family["samples"].items()],
+            )
+        )
+    return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_requests = registry.counter(
+    "http_requests_total", "HTTP requests handled", ("method", "route", "status")
+)
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "Time to handle an HTTP request",
+    ("method", "route"),
+)
+http_requests_in_flight = registry.gauge(
+    "http_requests_in_flight", "HTTP requests currently being handled"
+)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request counts, latencies and in-flight requests."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_requests_in_flight.dec()
+            # The router stores the matched route in the scope; label by its
+            # path template to keep cardinality bounded
+            route = scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            http_request_duration.observe(
+                time.perf_counter() - started, scope["method"], route_path
+            )
+            http_requests.inc(scope["method"], route_path, str(status_code))
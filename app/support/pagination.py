@@ -0,0 +1,59 @@
+import base64
+import binascii
+import json
+
+from datetime import datetime
+from typing import Tuple, Union
+
+SortValue = Union[datetime, int]
+
+# Ordering the original two-element cursors were issued for
+DEFAULT_SORT = "created_at"
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(
+    sort_value: SortValue, reading_log_id: int, sort: str = DEFAULT_SORT
+) -> str:
+    """
+    Encode a keyset position as an opaque, URL-safe cursor.
+
+    The cursor records the ordering it belongs to, so it can't be replayed
+    against a different one. Default-ordering cursors keep the original
+    (created_at, id) format.
+    """
+    value = sort_value.isoformat() if isinstance(sort_value, datetime) else sort_value
+    position = (
+        [value, reading_log_id]
+        if sort == DEFAULT_SORT
+        else [sort, value, reading_log_id]
+    )
+    payload = json.dumps(position, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str = DEFAULT_SORT) -> Tuple[SortValue, int]:
+    """Decode a cursor produced by `encode_cursor` back into its keyset position."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded))
+        if len(position) == 2:
+            cursor_sort, (value, reading_log_id) = DEFAULT_SORT, position
+        else:
+            cursor_sort, value, reading_log_id = position
+    except (binascii.Error, ValueError, TypeError) as e:
+        raise InvalidCursorError(f"Invalid cursor: {cursor}") from e
+
+    if cursor_sort != sort:
+        raise InvalidCursorError(
+            f"Cursor was issued for sort={cursor_sort}, not {sort}"
+        )
+    try:
+        if sort.lstrip("-") == "created_at":
+            return datetime.fromisoformat(value), int(reading_log_id)
+        return int(value), int(reading_log_id)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError(f"Invalid cursor: {cursor}") from e
@@ -0,0 +1,169 @@
+"""
+Per-request timing.
+
+`ServerTimingMiddleware` gives every request a `RequestTimings` through a
+context variable. Engine cursor events (see app.db.query_timing) add each SQL
+statement's duration to it, and `TimedRoute` marks when the endpoint returned,
+so the time after that until the response starts is serialization. The totals
+are sent in a Server-Timing header and logged when the response finishes, with
+warnings for likely N+1 query patterns and requests running too many queries.
+"""
+
+import asyncio
+import os
+import time
+
+from collections import Counter
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable, Dict, Optional
+
+from fastapi.routing import APIRoute
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.support.logging_support import get_logger
+
+# Set up logger
+logger = get_logger(__name__)
+
+# Send the Server-Timing header (timings are logged either way)
+SERVER_TIMING = os.getenv("SERVER_TIMING", "true").lower() == "true"
+
+# Warn when a request runs more SQL statements than this
+QUERY_COUNT_THRESHOLD = int(os.getenv("QUERY_COUNT_THRESHOLD", "20"))
+
+# Warn when one statement runs this many times in a request, a likely N+1
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "5"))
+
+
+class RequestTimings:
+    """Timings collected while handling one request."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.handler_done: Optional[float] = None
+        self.response_started: Optional[float] = None
+        self.db_seconds = 0.0
+        self.queries = 0
+        self.statements: Counter = Counter()
+
+    def record_query(self, statement: str, seconds: float) -> None:
+        self.queries += 1
+        self.db_seconds += seconds
+        self.statements[statement] += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Durations in milliseconds, measured up to now for unfinished phases."""
+        now = time.perf_counter()
+        handler_done = self.handler_done or self.response_started or now
+        response_started = self.response_started or now
+        return {
+            "total_ms": round((now - self.started) * 1000, 2),
+            "handler_ms": round((handler_done - self.started) * 1000, 2),
+            "serialize_ms": round(max(response_started - handler_done, 0) * 1000, 2),
+            "db_ms": round(self.db_seconds * 1000, 2),
+            "queries": self.queries,
+        }
+
+    def server_timing(self) -> str:
+        timings = self.as_dict()
+        return ", ".join(
+            [
+                f"app;dur={timings['handler_ms']}",
+                f'db;dur={timings["db_ms"]};desc="{self.queries} queries"',
+                f"serialize;dur={timings['serialize_ms']}",
+                f"total;dur={timings['total_ms']}",
+            ]
+        )
+
+
+current_timings: ContextVar[Optional[RequestTimings]] = ContextVar(
+    "current_timings", default=None
+)
+
+
+class TimedRoute(APIRoute):
+    """APIRoute that records when its endpoint returns."""
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        if asyncio.iscoroutinefunction(endpoint):
+            original = endpoint
+
+            # FastAPI reads the signature through __wrapped__, so parameters
+            # and dependencies are unchanged
+            @wraps(original)
+            async def endpoint(*args: Any, **endpoint_kwargs: Any) -> Any:
+                try:
+                    return await original(*args, **endpoint_kwargs)
+                finally:
+                    timings = current_timings.get()
+                    if timings is not None:
+                        timings.handler_done = time.perf_counter()
+
+        super().__init__(path, endpoint, **kwargs)
+
+
+class ServerTimingMiddleware:
+    """ASGI middleware that times each HTTP request."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                timings.response_started = time.perf_counter()
+                if SERVER_TIMING:
+                    message["headers"] = [
+                        *message.get("headers", []),
+                        (b"server-timing", timings.server_timing().encode()),
+                    ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_timings.reset(token)
+            _log_request(scope, status_code, timings)
+
+
+def _log_request(scope: Scope, status_code: int, timings: RequestTimings) -> None:
+    request = f"{scope['method']} {scope['path']}"
+    summary = timings.as_dict()
+    logger.info(
+        "%s %s total=%.1fms handler=%.1fms db=%.1fms queries=%s serialize=%.1fms",
+        request,
+        status_code,
+        summary["total_ms"],
+        summary["handler_ms"],
+        summary["db_ms"],
+        summary["queries"],
+        summary["serialize_ms"],
+        extra={"request": request, "status_code": status_code, **summary},
+    )
+
+    if timings.queries > QUERY_COUNT_THRESHOLD:
+        logger.warning(
+            "%s ran %s SQL statements (threshold %s)",
+            request,
+            timings.queries,
+            QUERY_COUNT_THRESHOLD,
+        )
+    for statement, count in timings.statements.items():
+        if count >= N_PLUS_ONE_THRESHOLD:
+            logger.warning(
+                "Possible N+1 in %s: statement ran %s times: %s",
+                request,
+                count,
+                " ".join(statement.split())[:200],
+            )
@@ -0,0 +1,197 @@
+"""
+Production server.
+
+`run_production_server` runs the application under gunicorn with uvicorn
+workers, one process per core by default, each using uvloop and httptools.
+Gunicorn owns the listening socket (so the backlog applies to all workers),
+restarts workers that die, and on SIGTERM stops accepting connections and gives
+workers SERVER_GRACEFUL_TIMEOUT seconds to finish in-flight requests and run
+the application's shutdown (which drains the ingestion queue).
+
+The application is imported in each worker after fork, and the engines that
+the launcher itself used are given fresh pools there, so no database
+connection is shared between processes.
+
+Settings:
+
+- WEB_CONCURRENCY: worker processes (default: CPUs available to the container,
+  allowing for CPU affinity and a cgroup CPU quota). Each worker has a sync and
+  an async engine, so PostgreSQL sees up to
+  WEB_CONCURRENCY * 2 * (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections
+- SERVER_KEEPALIVE: seconds to keep idle connections open (default 5); keep it
+  above the load balancer's idle timeout
+- SERVER_BACKLOG: pending connections queued by the kernel (default 2048)
+- SERVER_GRACEFUL_TIMEOUT: seconds workers get to finish on shutdown (default 30)
+- SERVER_TIMEOUT: seconds before a silent worker is restarted (default 60)
+- SERVER_MAX_REQUESTS: restart a worker after this many requests, 0 to never
+  (default 0), with up to SERVER_MAX_REQUESTS_JITTER extra so workers don't
+  restart together
+
+Gunicorn's and uvicorn's loggers hand their records to the root logger, so they
+are written in the configured LOG_FORMAT like the application's own.
+
+With more than one worker, /metrics would only show the worker that took the
+scrape; the server points METRICS_MULTIPROCESS_DIR (default: a fresh temporary
+directory) at a directory the workers share, so each reports the sum over all of
+them (see app.support.metrics).
+"""
+
+import logging
+import math
+import os
+import tempfile
+
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from gunicorn.app.base import BaseApplication
+from gunicorn.glogging import Logger
+from gunicorn.util import import_app
+from uvicorn.workers import UvicornWorker
+
+from app.db.database import dispose_engines_after_fork
+from app.support.logging_support import LOG_LEVELS, get_logger
+from app.support.metrics import mark_process_dead, multiprocess_dir
+
+# Set up logger
+logger = get_logger(__name__)
+
+
+def _cgroup_cpu_limit(root: Path = Path("/sys/fs/cgroup")) -> Optional[int]:
+    """The container's CPU quota rounded up to whole CPUs, None if unlimited."""
+    try:
+        # cgroup v2: "<quota> <period>", quota "max" when unlimited
+        quota, period = (root / "cpu.max").read_text().split()
+    except (OSError, ValueError):
+        try:
+            # cgroup v1: quota -1 when unlimited
+            quota = (root / "cpu" / "cpu.cfs_quota_us").read_text().strip()
+            period = (root / "cpu" / "cpu.cfs_period_us").read_text().strip()
+        except OSError:
+            return None
+    try:
+        quota_us, period_us = int(quota), int(period)
+    except ValueError:
+        return None
+    if quota_us <= 0 or period_us <= 0:
+        return None
+    return max(1, math.ceil(quota_us / period_us))
+
+
+def _available_cpus() -> int:
+    # os.cpu_count() sees the host's CPUs, ignoring affinity and cgroup quotas
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    limit = _cgroup_cpu_limit()
+    return cpus if limit is None else min(cpus, limit)
+
+
+SERVER_WORKERS = int(os.getenv("WEB_CONCURRENCY", str(_available_cpus())))
+SERVER_KEEPALIVE = int(os.getenv("SERVER_KEEPALIVE", "5"))
+SERVER_BACKLOG = int(os.getenv("SERVER_BACKLOG", "2048"))
+SERVER_GRACEFUL_TIMEOUT = int(os.getenv("SERVER_GRACEFUL_TIMEOUT", "30"))
+SERVER_TIMEOUT = int(os.getenv("SERVER_TIMEOUT", "60"))
+SERVER_MAX_REQUESTS = int(os.getenv("SERVER_MAX_REQUESTS", "0"))
+SERVER_MAX_REQUESTS_JITTER = int(os.getenv("SERVER_MAX_REQUESTS_JITTER", "0"))
+
+
+class ProductionLogger(Logger):
+    """Gunicorn logger that leaves writing records to the root logger's handler."""
+
+    def setup(self, cfg: Any) -> None:
+        super().setup(cfg)
+        for log in (self.error_log, self.access_log):
+            log.handlers = []
+            log.propagate = True
+
+
+class ProductionUvicornWorker(UvicornWorker):
+    """Uvicorn worker using the uvloop event loop and httptools HTTP parser."""
+
+    CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools"}
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        # UvicornWorker points uvicorn's loggers at gunicorn's handlers and
+        # stops them propagating; undo that, keeping any LOG_LEVELS override
+        for name in ("uvicorn.error", "uvicorn.access"):
+            uvicorn_logger = logging.getLogger(name)
+            uvicorn_logger.handlers = []
+            uvicorn_logger.setLevel(LOG_LEVELS.get(name, logging.NOTSET))
+            uvicorn_logger.propagate = True
+
+
+def _post_fork(server: Any, worker: Any) -> None:
+    dispose_engines_after_fork()
+
+
+def _child_exit(server: Any, worker: Any) -> None:
+    metrics_dir = multiprocess_dir()
+    if metrics_dir is not None:
+        mark_process_dead(metrics_dir, worker.pid)
+
+
+def _prepare_metrics_dir() -> None:
+    """Give the workers an empty directory to share their metrics through."""
+    directory = multiprocess_dir()
+    if directory is None:
+        directory = Path(tempfile.mkdtemp(prefix="reading-app-metrics-"))
+        os.environ["METRICS_MULTIPROCESS_DIR"] = str(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    # Snapshots from a previous run would add to this run's totals
+    for snapshot in directory.glob("*.json"):
+        snapshot.unlink()
+    logger.info("Workers share metrics through %s", directory)
+
+
+class ProductionServer(BaseApplication):
+    """Gunicorn application serving an ASGI app given as "module:attribute"."""
+
+    def __init__(self, app_uri: str, options: Dict[str, Any]) -> None:
+        self.app_uri = app_uri
+        self.options = options
+        super().__init__()
+
+    def load_config(self) -> None:
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self) -> Callable[..., Any]:
+        return import_app(self.app_uri)
+
+
+def run_production_server(host: str, port: int, app_uri: str = "app.main:app") -> None:
+    """Serve `app_uri` with gunicorn until the server is shut down."""
+    # Workers read it too (the cache default depends on the worker count)
+    os.environ["WEB_CONCURRENCY"] = str(SERVER_WORKERS)
+    if SERVER_WORKERS > 1 or multiprocess_dir() is not None:
+        _prepare_metrics_dir()
+    logger.info(
+        "Starting %s workers on %s:%s (keepalive=%ss, backlog=%s)",
+        SERVER_WORKERS,
+        host,
+        port,
+        SERVER_KEEPALIVE,
+        SERVER_BACKLOG,
+    )
+    ProductionServer(
+        app_uri,
+        {
+            "bind": f"{host}:{port}",
+            "workers": SERVER_WORKERS,
+            "worker_class": ProductionUvicornWorker,
+            "logger_class": ProductionLogger,
+            "keepalive": SERVER_KEEPALIVE,
+            "backlog": SERVER_BACKLOG,
+            "graceful_timeout": SERVER_GRACEFUL_TIMEOUT,
+            "timeout": SERVER_TIMEOUT,
+            "max_requests": SERVER_MAX_REQUESTS,
+            "max_requests_jitter": SERVER_MAX_REQUESTS_JITTER,
+            # Railway's proxy sets X-Forwarded-For/Proto
+            "forwarded_allow_ips": "*",
+            "post_fork": _post_fork,
+            "child_exit": _child_exit,
+        },
+    ).run()
@@ -0,0 +1,61 @@
+"""
+Throwaway databases for benchmarks and tests.
+
+`temporary_database_url` yields the URL of an empty database that is removed
+afterwards: a file in a temporary directory for SQLite, or a database created
+next to the one `base_url` points at for PostgreSQL. Export it as DATABASE_URL
+before `app.db.database` is first imported so the engines use it, and run the
+migrations to create the schema.
+"""
+
+import tempfile
+import uuid
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+from sqlalchemy.engine import make_url
+
+from app.support.logging_support import get_logger
+
+# Set up logger
+logger = get_logger(__name__)
+
+
+@contextmanager
+def temporary_database_url(base_url: Optional[str]) -> Iterator[str]:
+    """Create an empty database on the server `base_url` selects and drop it on exit."""
+    if not base_url or not base_url.startswith("postgresql"):
+        with tempfile.TemporaryDirectory(prefix="reading-app-") as directory:
+            yield f"sqlite:///{Path(directory) / 'reading_app.db'}"
+        return
+
+    import psycopg2
+
+    from psycopg2 import sql
+
+    url = make_url(base_url)
+    name = f"reading_app_tmp_{uuid.uuid4().hex[:12]}"
+    # libpq understands plain postgresql:// URLs, not SQLAlchemy driver names
+    admin = psycopg2.connect(
+        url.set(drivername="postgresql").render_as_string(hide_password=False)
+    )
+    admin.autocommit = True
+    try:
+        with admin.cursor() as cursor:
+            cursor.execute(sql.SQL("CREATE DATABASE {}").format(sql.Identifier(name)))
+        logger.info("Created temporary database %s", name)
+        try:
+            yield url.set(database=name).render_as_string(hide_password=False)
+        finally:
+            # FORCE (PostgreSQL 13+) closes connections the engines still pool
+            with admin.cursor() as cursor:
+                cursor.execute(
+                    sql.SQL("DROP DATABASE IF EXISTS {} WITH (FORCE)").format(
+                        sql.Identifier(name)
+                    )
+                )
+            logger.info("Dropped temporary database %s", name)
+    finally:
+        admin.close()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+"""
+Benchmark concurrent request throughput for sync vs async reading-log handlers.
+Both apps are driven in-process through httpx's ASGI transport, so the numbers
+show how far a single worker scales as concurrency rises. The "sync" app mirrors
+the threadpool-bound handlers the router used before it was ported to async.
+
+Each run uses a temporary database on the server DATABASE_URL selects (a
+temporary SQLite file by default), migrated and seeded through the bulk
+endpoint, and removed afterwards. The read cache is turned off so that both
+apps query the database for every request.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+from pathlib import Path
+from typing import List
+
+# Add the parent directory to the path so we can import the app
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+import anyio
+import httpx
+
+from fastapi import Depends, FastAPI, HTTPException
+from sqlmodel import Session, select
+
+from app.support.logging_support import get_logger
+from app.support.temporary_database import temporary_database_url
+
+# Set up logger
+logger = get_logger(__name__)
+
+
+def build_sync_app() -> FastAPI:
+    """Build an app serving the reads with the old synchronous handlers."""
+    from app.db.database import get_session
+    from app.models.reading_log import ReadingLog, ReadingLogRead
+
+    sync_app = FastAPI()
+
+    @sync_app.get("/reading-logs/", response_model=List[ReadingLogRead])
+    def read_reading_logs(*, db: Session = Depends(get_session), limit: int = 100):
+        return db.exec(select(ReadingLog).limit(limit)).all()
+
+    @sync_app.get("/reading-logs/{reading_log_id}", response_model=ReadingLogRead)
+    def read_reading_log(*, db: Session = Depends(get_session), reading_log_id: int):
+        reading_log = db.get(ReadingLog, reading_log_id)
+        if not reading_log:
+            raise HTTPException(status_code=404, detail="Reading log not found")
+        return reading_log
+
+    return sync_app
+
+
+def build_async_app() -> FastAPI:
+    """Build an app serving the current async reading-log router."""
+    from app.api.reading_logs import router as reading_logs_router
+
+    async_app = FastAPI()
+    async_app.include_router(reading_logs_router)
+    return async_app
+
+
+async def seed(app: FastAPI, rows: int) -> List[int]:
+    """Migrate the empty database and create `rows` reading logs through `app`."""
+    from app.api.reading_logs import BULK_MAX_BATCH_SIZE
+    from app.db.database import engine
+    from app.db.migrations import ensure_schema
+
+    ensure_schema(engine, "migrate")
+    ids: List[int] = []
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://benchmark"
+    ) as client:
+        for start in range(0, rows, BULK_MAX_BATCH_SIZE):
+            batch = [
+                {"duration": random.randint(5, 120), "description": "benchmark"}  # noqa: S311
+                for _ in range(min(BULK_MAX_BATCH_SIZE, rows - start))
+            ]
+            response = await client.post("/reading-logs/bulk", json=batch)
+            response.raise_for_status()
+            ids.extend(item["id"] for item in response.json())
+    return ids
+
+
+async def run_level(
+    app: FastAPI, ids: List[int], concurrency: int, total: int
+) -> float:
+    """Send `total` GET requests with `concurrency` in flight and return req/s."""
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://benchmark"
+    ) as client:
+
+        async def one(i: int) -> None:
+            async with semaphore:
+                if i % 4 == 0:
+                    response = await client.get("/reading-logs/", params={"limit": 20})
+                else:
+                    response = await client.get(f"/reading-logs/{ids[i % len(ids)]}")
+                response.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(total)))
+        elapsed = time.perf_counter() - started
+
+    return total / elapsed
+
+
+async def benchmark(args: argparse.Namespace) -> None:
+    """Seed, then run every concurrency level against both apps and log a comparison."""
+    apps = {"sync": build_sync_app(), "async": build_async_app()}
+    ids = await seed(apps["async"], args.rows)
+
+    # Match Starlette's default threadpool so the sync handlers are bounded the
+    # same way they are in a real worker.
+    anyio.to_thread.current_default_thread_limiter().total_tokens = args.threadpool
+
+    logger.info(
+        "%-12s %12s %12s %8s", "concurrency", "sync req/s", "async req/s", "ratio"
+    )
+    for concurrency in args.concurrency:
+        results = {}
+        for name, app in apps.items():
+            results[name] = await run_level(app, ids, concurrency, args.requests)
+        logger.info(
+            "%-12s %12.1f %12.1f %7.2fx",
+            concurrency,
+            results["sync"],
+            results["async"],
+            results["async"] / results["sync"],
+        )
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--requests", type=int, default=1000, help="Requests per concurrency level"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=lambda value: [int(level) for level in value.split(",")],
+        default=[1, 8, 32, 128, 256],
+        help="Comma-separated concurrency levels (default: 1,8,32,128,256)",
+    )
+    parser.add_argument(
+        "--rows", type=int, default=1000, help="Number of reading logs to seed"
+    )
+    parser.add_argument(
+        "--threadpool",
+        type=int,
+        default=40,
+        help="Threadpool size available to sync handlers (Starlette default: 40)",
+    )
+    args = parser.parse_args()
+
+    with temporary_database_url(os.getenv("DATABASE_URL")) as database_url:
+        # Read when the app's database module is first imported
+        os.environ["DATABASE_URL"] = database_url
+        # The sync app always queries the database; cached async reads would
+        # make the comparison meaningless
+        os.environ["CACHE_BACKEND"] = "none"
+        asyncio.run(benchmark(args))
+
+
+if __name__ == "__main__":
+    main()
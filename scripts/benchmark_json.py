@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+"""
+Microbenchmark the serialization of a reading-log list page.
+Compares FastAPI's default path (response_model validation, jsonable_encoder
+and JSONResponse) with the FAST_JSON path (plain dicts rendered by
+FastJSONResponse) on in-memory rows, so no database is involved.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Awaitable, Callable, List
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the app
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.api.reading_logs import READ_FIELDS
+from app.models.reading_log import ReadingLog, ReadingLogRead
+from app.support import json_response
+from app.support.json_response import FastJSONResponse, rows_to_dicts
+from app.support.logging_support import get_logger
+
+# Set up logger
+logger = get_logger(__name__)
+
+
+def build_rows(count: int) -> List[ReadingLog]:
+    """Build `count` reading logs shaped like rows loaded by the list endpoint."""
+    started = datetime(2025, 1, 1, 8, 0, 0)
+    return [
+        ReadingLog(
+            id=i,
+            duration=random.randint(5, 120),  # noqa: S311
+            description=f"Chapter {i} of a rather long book",
+            created_at=started + timedelta(minutes=i, microseconds=i),
+            updated_at=started + timedelta(days=1, minutes=i) if i % 3 == 0 else None,
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+# FastAPI builds this once per route, when the route is registered
+RESPONSE_FIELD = create_response_field(name="response", type_=List[ReadingLogRead])
+
+
+async def default_path(rows: List[ReadingLog]) -> bytes:
+    """What FastAPI does for a handler with response_model=List[ReadingLogRead]."""
+    content = await serialize_response(field=RESPONSE_FIELD, response_content=rows)
+    return JSONResponse(content).body
+
+
+async def fast_path(rows: List[ReadingLog]) -> bytes:
+    """What the list endpoint does with FAST_JSON enabled."""
+    return FastJSONResponse(rows_to_dicts(rows, READ_FIELDS)).body
+
+
+async def time_path(
+    render: Callable[[List[ReadingLog]], Awaitable[bytes]],
+    rows: List[ReadingLog],
+    iterations: int,
+) -> float:
+    """Return the mean time in microseconds to render one page."""
+    await render(rows)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await render(rows)
+    return (time.perf_counter() - started) / iterations * 1_000_000
+
+
+async def benchmark(args: argparse.Namespace) -> None:
+    """Check both paths agree, then time them."""
+    rows = build_rows(args.rows)
+    if json.loads(await default_path(rows)) != json.loads(await fast_path(rows)):
+        logger.error("The default and fast paths produce different JSON")
+        sys.exit(1)
+
+    paths = {"default": default_path, "fast": fast_path}
+    if json_response.orjson is not None:
+        # Also measure the fast path's fallback when orjson isn't installed
+        async def stdlib_path(rows: List[ReadingLog]) -> bytes:
+            with patch.object(json_response, "orjson", None):
+                return await fast_path(rows)
+
+        paths["fast (no orjson)"] = stdlib_path
+    else:
+        logger.warning("orjson is not installed; the fast path uses json.dumps")
+
+    results = {
+        name: await time_path(path, rows, args.iterations)
+        for name, path in paths.items()
+    }
+
+    logger.info("%-18s %14s %10s", "path", "us per page", "speedup")
+    for name, micros in results.items():
+        logger.info("%-18s %14.1f %9.2fx", name, micros, results["default"] / micros)
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100, help="Rows per page")
+    parser.add_argument(
+        "--iterations", type=int, default=2000, help="Pages rendered per path"
+    )
+    args = parser.parse_args()
+
+    asyncio.run(benchmark(args))
+
+
+if __name__ == "__main__":
+    main()
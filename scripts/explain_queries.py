@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+"""
+Script to check that the reading-log list queries use their indexes.
+Runs EXPLAIN (PostgreSQL) or EXPLAIN QUERY PLAN (SQLite) for offset, keyset and
+filtered pages built by the list endpoint's own query builder and exits non-zero
+if a plan doesn't use the expected index. Run `make db-migrate` first so the
+indexes exist.
+"""
+
+import sys
+
+from datetime import datetime
+from pathlib import Path
+
+# Add the parent directory to the path so we can import the app
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+from app.db.database import engine
+from app.db.listing import list_statement
+from app.db.query_plans import explain
+from app.models.reading_log import ReadingLogSort
+from app.support.logging_support import get_logger
+
+# Set up logger
+logger = get_logger(__name__)
+
+CREATED_AT_INDEX = "ix_readinglog_created_at_id"
+DURATION_INDEX = "ix_readinglog_duration_id"
+
+# The columns the endpoint selects for a full page
+COLUMNS = ("id", "duration", "description", "created_at", "updated_at")
+
+
+def main():
+    """Check the list query plans."""
+    queries = {
+        "offset page": (
+            list_statement(COLUMNS, ReadingLogSort.created_at, offset=1000),
+            CREATED_AT_INDEX,
+        ),
+        "keyset page": (
+            list_statement(
+                COLUMNS, ReadingLogSort.created_at, after=(datetime.utcnow(), 1)
+            ),
+            CREATED_AT_INDEX,
+        ),
+        "created_at range": (
+            list_statement(
+                COLUMNS,
+                ReadingLogSort.created_at,
+                created_after=datetime(2024, 1, 1),
+                created_before=datetime(2024, 2, 1),
+            ),
+            CREATED_AT_INDEX,
+        ),
+        "duration keyset page": (
+            list_statement(COLUMNS, ReadingLogSort.duration_desc, after=(60, 1)),
+            DURATION_INDEX,
+        ),
+        "duration range": (
+            list_statement(
+                COLUMNS, ReadingLogSort.duration_desc, min_duration=30, max_duration=60
+            ),
+            DURATION_INDEX,
+        ),
+    }
+
+    failed = False
+    for name, (statement, index) in queries.items():
+        plan = explain(engine, statement)
+        logger.info("%s plan:\n%s", name, plan)
+        if index in plan:
+            logger.info("%s uses %s", name, index)
+        else:
+            logger.error("%s does not use %s", name, index)
+            failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+"""
+Script to bulk import historical reading logs from a CSV or NDJSON file.
+Loads through COPY on PostgreSQL and batched INSERTs on SQLite, streaming the
+input, and reports rows per second. Use `-` to read from stdin.
+"""
+
+import argparse
+import sys
+
+from pathlib import Path
+
+# Add the parent directory to the path so we can import the app
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+from app.db.bulk_import import ImportFormatError, import_reading_logs
+from app.db.database import engine
+from app.models.reading_log import ExportFormat
+from app.support.logging_support import get_logger
+
+# Set up logger
+logger = get_logger(__name__)
+
+
+def main():
+    """Import reading logs."""
+    parser = argparse.ArgumentParser(description="Bulk import reading logs")
+    parser.add_argument("path", help="CSV or NDJSON file to import, or - for stdin")
+    parser.add_argument(
+        "--format",
+        choices=[f.value for f in ExportFormat],
+        help="Input format (default: inferred from the file extension, else ndjson)",
+    )
+    args = parser.parse_args()
+
+    import_format = ExportFormat(
+        args.format
+        or ("csv" if args.path.lower().endswith(".csv") else ExportFormat.ndjson)
+    )
+    logger.info("Importing %s as %s...", args.path, import_format.value)
+
+    try:
+        if args.path == "-":
+            result = import_reading_logs(engine, sys.stdin.buffer, import_format)
+        else:
+            with Path(args.path).open("rb") as stream:
+                result = import_reading_logs(engine, stream, import_format)
+    except ImportFormatError as e:
+        logger.error("Import failed, nothing was written: %s", e)
+        sys.exit(1)
+
+    logger.info(
+        "Imported %s rows in %.2f s (%.0f rows/s)",
+        result.rows,
+        result.seconds,
+        result.rows_per_second,
+    )
+
+
+if __name__ == "__main__":
+    main()
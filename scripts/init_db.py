@@ -10,7 +10,8 @@ from pathlib import Path
 # Add the parent directory to the path so we can import the app
 sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
 
-from app.db.database import create_db_and_tables
+from app.db.database import engine
+from app.db.migrations import run_migrations
 from app.support.logging_support import get_logger
 
 # Set up logger
@@ -20,7 +21,7 @@ logger = get_logger(__name__)
 def main():
     """Initialize the database."""
     logger.info("Initializing database...")
-    create_db_and_tables()
+    run_migrations(engine)
     logger.info("Database initialized successfully!")
 
 
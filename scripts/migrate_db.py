@@ -1,9 +1,11 @@
 #!/usr/bin/env python
 """
 Script for database migrations.
-This is a placeholder for future implementation of database migrations.
+Applies pending versioned migrations from app/db/migrations/versions. Safe to
+run repeatedly: when nothing is pending it costs a single query.
 """
 
+import argparse
 import sys
 
 from pathlib import Path
@@ -11,21 +13,42 @@ from pathlib import Path
 # Add the parent directory to the path so we can import the app
 sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
 
-from app.db.database import create_db_and_tables
+from app.db.database import engine
+from app.db.migrations import MIGRATIONS, applied_versions, run_migrations
 from app.support.logging_support import get_logger
 
 # Set up logger
 logger = get_logger(__name__)
 
 
+def show_status():
+    """Log every known migration and whether it has been applied."""
+    done = applied_versions(engine)
+    for migration in MIGRATIONS:
+        logger.info(
+            "%s %04d %s",
+            "applied" if migration.version in done else "pending",
+            migration.version,
+            migration.description,
+        )
+
+
 def main():
-    """
-    Run database migrations.
-    Currently, this just recreates the tables, but in the future,
-    this could be replaced with a proper migration system like Alembic.
-    """
+    """Run database migrations."""
+    parser = argparse.ArgumentParser(description="Run database migrations")
+    parser.add_argument(
+        "--status",
+        action="store_true",
+        help="List applied and pending migrations without running them",
+    )
+    args = parser.parse_args()
+
+    if args.status:
+        show_status()
+        return
+
     logger.info("Running database migrations...")
-    create_db_and_tables()
+    run_migrations(engine)
     logger.info("Database migrations completed successfully!")
 
 
@@ -17,7 +17,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
 from dotenv import load_dotenv
 from sqlmodel import SQLModel
 
-from app.db.database import create_db_and_tables
+from app.db.database import engine
+from app.db.migrations import run_migrations
 from app.support.logging_support import get_logger
 
 # Set up logger
@@ -77,17 +78,17 @@ def main():
             "Error importing models: %s\n%s", str(e), traceback.format_exc()
         )
         # Continue execution even if model import fails
-        # The create_db_and_tables function will attempt to import models again
+        # The migrations import the models they need themselves
 
-    # Try to create database tables with retries
+    # Try to apply migrations with retries
     for attempt in range(MAX_RETRIES):
         try:
             logger.info(
-                "Attempting to create database tables (attempt %s/%s)...",
+                "Attempting to apply database migrations (attempt %s/%s)...",
                 attempt + 1,
                 MAX_RETRIES,
             )
-            create_db_and_tables()
+            run_migrations(engine)
             logger.info("Database migrations completed successfully!")
             return
         except Exception as e:
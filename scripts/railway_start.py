@@ -1,11 +1,15 @@
 #!/usr/bin/env python
 """
 Script to start the application on Railway.
-This script properly handles the PORT environment variable and ensures database tables exist.
+This script properly handles the PORT environment variable and applies pending
+database migrations once, before the server starts, so the application itself
+can start without touching the schema. It then runs the multi-worker
+production server (see app.support.server).
 """
 
 import os
 import sys
+import time
 import traceback
 
 from pathlib import Path
@@ -13,33 +17,28 @@ from pathlib import Path
 # Add the parent directory to the path so we can import the app
 sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
 
-import uvicorn
-
 from dotenv import load_dotenv
 
-from app.db.database import create_db_and_tables
+from app.db.database import engine
+from app.db.migrations import run_migrations
 from app.support.logging_support import get_logger
+from app.support.server import run_production_server
 
 # Set up logger
 logger = get_logger(__name__)
 
 
 def ensure_database_ready():
-    """Ensure database is ready and tables exist."""
-    logger.info("Ensuring database is ready and tables exist...")
+    """Ensure database is ready and migrations are applied."""
+    logger.info("Ensuring database is ready and migrations are applied...")
 
     try:
-        # Import models to ensure they're registered with SQLModel
-        from app.models.reading_log import ReadingLog
-
-        # Log the imported models
-        models = [ReadingLog]
-        model_names = [model.__name__ for model in models]
-        logger.info("Imported models: %s", ", ".join(model_names))
-
-        # Create database tables
-        create_db_and_tables()
-        logger.info("Database tables created/verified successfully")
+        started = time.perf_counter()
+        run_migrations(engine)
+        logger.info(
+            "Database migrations verified in %.1f ms",
+            (time.perf_counter() - started) * 1000,
+        )
 
         return True
     except Exception as e:
@@ -99,19 +98,15 @@ def main():
 
         # Ensure database is ready before starting the application
         db_ready = ensure_database_ready()
-        if not db_ready:
+        if db_ready:
+            # The schema was just migrated; don't make the app check it again
+            os.environ.setdefault("DB_STARTUP_MODE", "skip")
+        else:
             logger.warning("Database may not be fully ready, but continuing startup...")
 
         # Run the application with proper error handling
-        logger.info("Starting uvicorn server...")
-        uvicorn.run(
-            "app.main:app",
-            host="0.0.0.0",  # noqa: S104
-            port=port,
-            log_level="info",
-            proxy_headers=True,  # Important for Railway's proxy setup
-            forwarded_allow_ips="*",  # Allow forwarded IPs from Railway's proxy
-        )
+        logger.info("Starting gunicorn with uvicorn workers...")
+        run_production_server("0.0.0.0", port)  # noqa: S104
     except Exception as e:
         logger.exception(
             "Failed to start application: %s\n%s", str(e), traceback.format_exc()
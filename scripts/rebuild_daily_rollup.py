@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+"""
+Script to rebuild the reading_log_daily rollup from the raw reading logs.
+Use it to repair the rollup if it has drifted, e.g. after rows were changed
+outside the API. Works through the raw rows a window of days at a time.
+"""
+
+import argparse
+import sys
+import time
+
+from pathlib import Path
+
+# Add the parent directory to the path so we can import the app
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+from app.db.database import engine
+from app.db.rollup import rebuild_daily_rollup
+from app.support.logging_support import get_logger
+
+# Set up logger
+logger = get_logger(__name__)
+
+
+def main():
+    """Rebuild the daily rollup."""
+    parser = argparse.ArgumentParser(description="Rebuild the daily reading rollup")
+    parser.add_argument(
+        "--batch-days",
+        type=int,
+        default=31,
+        help="Number of days aggregated per transaction (default: 31)",
+    )
+    args = parser.parse_args()
+
+    logger.info("Rebuilding daily rollup...")
+    started = time.perf_counter()
+    days = rebuild_daily_rollup(engine, batch_days=args.batch_days)
+    logger.info(
+        "Rebuilt %s days of rollup in %.1f s", days, time.perf_counter() - started
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -15,7 +15,7 @@ import uvicorn
 
 from dotenv import load_dotenv
 
-from app.support.logging_support import get_logger
+from app.support.logging_support import get_logger, uvicorn_log_config
 
 # Set up logger
 logger = get_logger(__name__)
@@ -30,6 +30,8 @@ def main():
     # Always use 0.0.0.0 to bind to all interfaces, making it accessible from outside the container
     host = "0.0.0.0"  # noqa: S104
     port = int(os.getenv("API_PORT", "8888"))
+    # Auto-reload watches the source tree; only worth it while developing
+    reload = os.getenv("ENVIRONMENT", "development") == "development"
 
     logger.info("Starting application on %s:%s", host, port)
     logger.info("API documentation available at:")
@@ -37,7 +39,13 @@ def main():
     logger.info("  - ReDoc: http://localhost:%s/redoc", port)
 
     # Run the application
-    uvicorn.run("app.main:app", host=host, port=port, reload=True)
+    uvicorn.run(
+        "app.main:app",
+        host=host,
+        port=port,
+        reload=reload,
+        log_config=uvicorn_log_config(),
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,65 @@
+"""
+Shared fixtures.
+
+The suite runs against a temporary database on the server DATABASE_URL selects
+(a SQLite file by default), created before the app is imported, migrated by
+the app's startup and dropped at the end. Every test starts with empty tables.
+"""
+
+import os
+
+from contextlib import ExitStack
+from typing import Any, Dict, Iterator, List
+
+import pytest
+
+from fastapi.testclient import TestClient
+
+from app.support.temporary_database import temporary_database_url
+
+_database = ExitStack()
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    # Read when app.db.database is first imported
+    os.environ["DATABASE_URL"] = _database.enter_context(
+        temporary_database_url(os.getenv("DATABASE_URL"))
+    )
+    # Cached reads would outlive the rows each test deletes
+    os.environ.setdefault("CACHE_BACKEND", "none")
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    _database.close()
+
+
+@pytest.fixture(scope="session")
+def client() -> Iterator[TestClient]:
+    """Client for the application, with its startup and shutdown run once."""
+    from app.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(autouse=True)
+def empty_tables(client: TestClient) -> None:
+    from sqlmodel import SQLModel
+
+    from app.db.database import engine
+
+    with engine.begin() as connection:
+        for table in reversed(SQLModel.metadata.sorted_tables):
+            connection.execute(table.delete())
+
+
+@pytest.fixture
+def create_reading_logs(client: TestClient):
+    """Create reading logs through the bulk endpoint and return the responses."""
+
+    def create(*items: Dict[str, Any]) -> List[Dict[str, Any]]:
+        response = client.post("/reading-logs/bulk", json=list(items))
+        assert response.status_code == 200, response.text
+        return response.json()
+
+    return create
@@ -0,0 +1,50 @@
+def test_bulk_create_returns_rows_in_request_order(client):
+    items = [
+        {"duration": duration, "description": f"item {i}"}
+        for i, duration in enumerate((40, 10, 30, 20))
+    ]
+
+    response = client.post("/reading-logs/bulk", json=items)
+
+    assert response.status_code == 200
+    created = response.json()
+    assert [(item["duration"], item["description"]) for item in created] == [
+        (item["duration"], item["description"]) for item in items
+    ]
+    assert [item["id"] for item in created] == sorted(item["id"] for item in created)
+
+
+def test_bulk_create_reports_errors_by_index_and_writes_nothing(client):
+    items = [
+        {"duration": 10},
+        {"description": "no duration"},
+        {"duration": 20},
+        {"duration": "long"},
+    ]
+
+    response = client.post("/reading-logs/bulk", json=items)
+
+    assert response.status_code == 422
+    errors = response.json()["detail"]
+    assert [error["index"] for error in errors] == [1, 3]
+    assert errors[0]["errors"][0]["loc"] == ["duration"]
+    assert errors[0]["errors"][0]["type"] == "missing"
+    assert errors[1]["errors"][0]["type"] == "int_parsing"
+    assert client.get("/reading-logs/").json() == []
+
+
+def test_bulk_create_rejects_oversized_batches(client, monkeypatch):
+    from app.api import reading_logs
+
+    monkeypatch.setattr(reading_logs, "BULK_MAX_BATCH_SIZE", 2)
+
+    response = client.post("/reading-logs/bulk", json=[{"duration": 10}] * 3)
+
+    assert response.status_code == 413
+
+
+def test_bulk_create_of_nothing_is_a_no_op(client):
+    response = client.post("/reading-logs/bulk", json=[])
+
+    assert response.status_code == 200
+    assert response.json() == []
@@ -0,0 +1,138 @@
+import asyncio
+
+import pytest
+
+from app.support.cache import Cache, LRUCache, RedisCache, create_cache
+
+
+class UnavailableRedis:
+    """Client whose every call fails, like a Redis server that went away."""
+
+    async def get(self, key):
+        raise ConnectionError("Connection refused")
+
+    async def set(self, key, value, ex=None, nx=False):
+        raise ConnectionError("Connection refused")
+
+    async def delete(self, key):
+        raise ConnectionError("Connection refused")
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(max_entries=2, ttl_seconds=60)
+
+    async def scenario():
+        await cache.set("a", 1)
+        await cache.set("b", 2)
+        await cache.get("a")
+        await cache.set("c", 3)
+        return [await cache.get(key) for key in ("a", "b", "c")]
+
+    assert asyncio.run(scenario()) == [1, None, 3]
+    assert cache.stats.evictions == 1
+
+
+class MemoryRedis:
+    """The slice of redis.asyncio.Redis the cache uses, ignoring expiry."""
+
+    def __init__(self):
+        self.values = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value.encode()
+        return True
+
+    async def delete(self, key):
+        self.values.pop(key, None)
+
+
+@pytest.mark.parametrize(
+    "cache",
+    [LRUCache(max_entries=10, ttl_seconds=60), RedisCache(MemoryRedis(), 60)],
+    ids=["memory", "redis"],
+)
+def test_read_racing_a_write_cannot_cache_the_old_row(cache):
+    async def scenario():
+        await cache.set("1", {"duration": 10})
+        # A read misses and loads the row, then a write commits and invalidates
+        # the key before the read gets to cache what it loaded
+        await cache.delete("1")
+        await cache.set("1", {"duration": 10})
+        return await cache.get("1")
+
+    assert asyncio.run(scenario()) is None
+
+
+def test_redis_cache_fails_open():
+    cache = RedisCache(UnavailableRedis(), ttl_seconds=60)
+
+    async def scenario():
+        await cache.set("1", {"id": 1})
+        value = await cache.get("1")
+        await cache.delete("1")
+        return value
+
+    assert asyncio.run(scenario()) is None
+    assert cache.stats.errors == 3
+    assert cache.stats.misses == 1
+
+
+@pytest.mark.parametrize(
+    ("environment", "expected"),
+    [
+        ({}, LRUCache),
+        ({"WEB_CONCURRENCY": "1"}, LRUCache),
+        ({"WEB_CONCURRENCY": "4"}, Cache),
+        ({"WEB_CONCURRENCY": "4", "CACHE_BACKEND": "memory"}, LRUCache),
+    ],
+)
+def test_default_backend_depends_on_worker_count(monkeypatch, environment, expected):
+    monkeypatch.delenv("CACHE_BACKEND", raising=False)
+    monkeypatch.delenv("WEB_CONCURRENCY", raising=False)
+    for name, value in environment.items():
+        monkeypatch.setenv(name, value)
+
+    assert type(create_cache("test")) is expected
+
+
+def test_cache_outage_does_not_fail_reads_or_committed_writes(
+    client, create_reading_logs, monkeypatch
+):
+    from app.api import reading_logs
+
+    monkeypatch.setattr(
+        reading_logs, "reading_log_cache", RedisCache(UnavailableRedis(), 60)
+    )
+    (created,) = create_reading_logs({"duration": 10})
+    url = f"/reading-logs/{created['id']}"
+
+    assert client.get(url).status_code == 200
+    updated = client.patch(url, json={"duration": 20})
+    assert updated.status_code == 200
+    assert updated.json()["duration"] == 20
+    assert client.delete(url).status_code == 200
+    assert client.get(url).status_code == 404
+
+
+def test_updates_and_deletes_invalidate_cached_reads(
+    client, create_reading_logs, monkeypatch
+):
+    from app.api import reading_logs
+
+    cache = LRUCache(max_entries=100, ttl_seconds=60)
+    monkeypatch.setattr(reading_logs, "reading_log_cache", cache)
+    (created,) = create_reading_logs({"duration": 10})
+    url = f"/reading-logs/{created['id']}"
+
+    assert client.get(url).json()["duration"] == 10
+    assert client.get(url).json()["duration"] == 10
+    assert cache.stats.hits == 1
+    client.patch(url, json={"duration": 20})
+    assert client.get(url).json()["duration"] == 20
+    client.delete(url)
+    assert client.get(url).status_code == 404
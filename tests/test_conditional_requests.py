@@ -0,0 +1,65 @@
+def test_read_etag_and_if_none_match(client, create_reading_logs):
+    (created,) = create_reading_logs({"duration": 10})
+    url = f"/reading-logs/{created['id']}"
+
+    etag = client.get(url).headers["ETag"]
+    not_modified = client.get(url, headers={"If-None-Match": etag})
+
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert client.get(url, headers={"If-None-Match": '"other"'}).status_code == 200
+
+
+def test_update_changes_the_etag(client, create_reading_logs):
+    (created,) = create_reading_logs({"duration": 10})
+    url = f"/reading-logs/{created['id']}"
+    etag = client.get(url).headers["ETag"]
+
+    updated = client.patch(url, json={"duration": 20}, headers={"If-Match": etag})
+
+    assert updated.status_code == 200
+    assert updated.headers["ETag"] != etag
+    assert client.get(url).headers["ETag"] == updated.headers["ETag"]
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_stale_if_match_is_rejected(client, create_reading_logs):
+    (created,) = create_reading_logs({"duration": 10})
+    url = f"/reading-logs/{created['id']}"
+    stale = client.get(url).headers["ETag"]
+    client.patch(url, json={"duration": 20})
+
+    assert (
+        client.patch(
+            url, json={"duration": 30}, headers={"If-Match": stale}
+        ).status_code
+        == 412
+    )
+    assert client.delete(url, headers={"If-Match": stale}).status_code == 412
+    assert client.get(url).json()["duration"] == 20
+
+
+def test_delete_with_current_if_match(client, create_reading_logs):
+    (created,) = create_reading_logs({"duration": 10})
+    url = f"/reading-logs/{created['id']}"
+    etag = client.get(url).headers["ETag"]
+
+    assert client.delete(url, headers={"If-Match": etag}).status_code == 200
+    assert client.get(url).status_code == 404
+
+
+def test_list_etag_tracks_the_page(client, create_reading_logs):
+    first, _ = create_reading_logs({"duration": 10}, {"duration": 20})
+    etag = client.get("/reading-logs/").headers["ETag"]
+
+    assert (
+        client.get("/reading-logs/", headers={"If-None-Match": etag}).status_code == 304
+    )
+
+    client.patch(f"/reading-logs/{first['id']}", json={"duration": 15})
+    changed = client.get("/reading-logs/", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+    sparse = client.get("/reading-logs/", params={"fields": "id"})
+    assert sparse.headers["ETag"] != changed.headers["ETag"]
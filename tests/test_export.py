@@ -0,0 +1,59 @@
+import csv
+import io
+import json
+
+from app.db import export
+from app.models.reading_log import ExportFormat
+
+
+def _export(client, export_format):
+    response = client.get("/reading-logs/export", params={"format": export_format})
+    assert response.status_code == 200
+    return response
+
+
+def test_csv_export_escapes_descriptions(client, create_reading_logs):
+    descriptions = [
+        "plain",
+        "commas, in it",
+        'a "quoted" title',
+        "two\nlines",
+        None,
+    ]
+    create_reading_logs(
+        *({"duration": 10, "description": text} for text in descriptions)
+    )
+
+    response = _export(client, "csv")
+
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert list(rows[0]) == list(export.EXPORT_COLUMNS)
+    # NULL is written as an empty field
+    assert [row["description"] for row in rows] == [
+        *descriptions[:-1],
+        "",
+    ]
+
+
+def test_ndjson_export_streams_every_row_across_batches(
+    client, create_reading_logs, monkeypatch
+):
+    monkeypatch.setattr(export, "EXPORT_BATCH_SIZE", 2)
+    created = create_reading_logs(*({"duration": minutes} for minutes in range(1, 6)))
+
+    async def chunks():
+        return [
+            chunk async for chunk in export.stream_reading_logs(ExportFormat.ndjson)
+        ]
+
+    assert len(client.portal.call(chunks)) == 3
+    lines = _export(client, "ndjson").text.splitlines()
+    exported = [json.loads(line) for line in lines]
+    assert [item["id"] for item in exported] == [item["id"] for item in created]
+    assert [item["duration"] for item in exported] == [1, 2, 3, 4, 5]
+    assert set(exported[0]) == set(export.EXPORT_COLUMNS)
+
+
+def test_csv_export_of_an_empty_table_is_just_the_header(client):
+    assert _export(client, "csv").text == ",".join(export.EXPORT_COLUMNS) + "\n"
@@ -0,0 +1,63 @@
+import pytest
+
+
+def test_sparse_fieldset_returns_only_the_requested_fields(client, create_reading_logs):
+    create_reading_logs({"duration": 10, "description": "essay"})
+
+    response = client.get("/reading-logs/", params={"fields": "duration, id"})
+
+    assert response.status_code == 200
+    (item,) = response.json()
+    # In ReadingLogRead order, whatever order they were asked for in
+    assert list(item) == ["duration", "id"]
+    assert item["duration"] == 10
+
+
+@pytest.mark.parametrize("fields", ["id,title", "", " , "])
+def test_unknown_or_empty_fieldset_is_rejected(client, fields):
+    response = client.get("/reading-logs/", params={"fields": fields})
+
+    assert response.status_code == 400
+
+
+def test_cursor_pages_work_without_the_key_fields(client, create_reading_logs):
+    create_reading_logs(*({"duration": duration} for duration in (30, 10, 20, 10)))
+
+    durations = []
+    cursor = None
+    while True:
+        response = client.get(
+            "/reading-logs/",
+            params={
+                "fields": "duration",
+                "sort": "duration",
+                "limit": 3,
+                **({"cursor": cursor} if cursor else {}),
+            },
+        )
+        assert response.status_code == 200
+        assert all(list(item) == ["duration"] for item in response.json())
+        durations.extend(item["duration"] for item in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+
+    assert durations == [10, 10, 20, 30]
+
+
+def test_etag_depends_on_the_fieldset(client, create_reading_logs):
+    create_reading_logs({"duration": 10})
+    sparse = client.get("/reading-logs/", params={"fields": "id"}).headers["ETag"]
+    full = client.get("/reading-logs/").headers["ETag"]
+
+    assert sparse != full
+    assert (
+        client.get(
+            "/reading-logs/", params={"fields": "id"}, headers={"If-None-Match": sparse}
+        ).status_code
+        == 304
+    )
+    assert (
+        client.get("/reading-logs/", headers={"If-None-Match": sparse}).status_code
+        == 200
+    )
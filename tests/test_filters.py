@@ -0,0 +1,73 @@
+import json
+
+import pytest
+
+
+@pytest.fixture
+def january(client):
+    records = [
+        {"duration": duration, "created_at": created_at}
+        for duration, created_at in (
+            (10, "2024-01-01T00:00:00"),
+            (20, "2024-01-01T12:00:00"),
+            (30, "2024-01-02T00:00:00"),
+            (40, "2024-01-03T00:00:00"),
+        )
+    ]
+    response = client.post(
+        "/reading-logs/import",
+        params={"format": "ndjson"},
+        content="\n".join(json.dumps(record) for record in records),
+    )
+    assert response.status_code == 200, response.text
+
+
+def _durations(client, **params):
+    response = client.get("/reading-logs/", params=params)
+    assert response.status_code == 200, response.text
+    return [item["duration"] for item in response.json()]
+
+
+def test_created_range_is_half_open(client, january):
+    assert _durations(
+        client,
+        created_after="2024-01-01T12:00:00",
+        created_before="2024-01-03T00:00:00",
+    ) == [20, 30]
+
+
+def test_created_bounds_with_offsets_are_compared_in_utc(client, january):
+    # 2024-01-01T12:00:00Z and 2024-01-03T00:00:00Z
+    assert _durations(
+        client,
+        created_after="2024-01-01T14:00:00+02:00",
+        created_before="2024-01-02T19:00:00-05:00",
+    ) == [20, 30]
+    # Mixing a naive and an aware bound is fine too
+    assert _durations(
+        client,
+        created_after="2024-01-01T12:00:00",
+        created_before="2024-01-02T00:00:00Z",
+    ) == [20]
+
+
+def test_duration_range_is_inclusive(client, january):
+    assert _durations(client, min_duration=20, max_duration=30) == [20, 30]
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {
+            "created_after": "2024-01-02T00:00:00",
+            "created_before": "2024-01-01T00:00:00",
+        },
+        {
+            "created_after": "2024-01-01T02:00:00+02:00",
+            "created_before": "2024-01-01T00:00:00",
+        },
+        {"min_duration": 30, "max_duration": 20},
+    ],
+)
+def test_empty_ranges_are_rejected(client, params):
+    assert client.get("/reading-logs/", params=params).status_code == 400
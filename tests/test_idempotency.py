@@ -0,0 +1,116 @@
+import pytest
+
+from app.api import reading_logs
+from app.db.ingest import IngestQueue
+
+
+def test_retry_replays_the_stored_response(client):
+    headers = {"Idempotency-Key": "create-1"}
+
+    first = client.post("/reading-logs/", json={"duration": 10}, headers=headers)
+    retry = client.post("/reading-logs/", json={"duration": 10}, headers=headers)
+
+    assert first.status_code == retry.status_code
+    assert retry.json() == first.json()
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert len(client.get("/reading-logs/").json()) == 1
+
+
+@pytest.mark.parametrize(
+    ("path", "first", "second"),
+    [
+        ("/reading-logs/", {"duration": 10}, {"duration": 20}),
+        ("/reading-logs/bulk", [{"duration": 10}], [{"duration": 20}]),
+    ],
+)
+def test_reused_key_with_another_body_is_rejected(client, path, first, second):
+    headers = {"Idempotency-Key": "reused"}
+    client.post(path, json=first, headers=headers)
+
+    response = client.post(path, json=second, headers=headers)
+
+    assert response.status_code == 422
+
+
+@pytest.mark.parametrize(
+    ("path", "body"),
+    [("/reading-logs/", {"duration": 10}), ("/reading-logs/bulk", [{"duration": 10}])],
+)
+def test_overlong_key_is_rejected(client, path, body):
+    response = client.post(path, json=body, headers={"Idempotency-Key": "k" * 256})
+
+    assert response.status_code == 422
+
+
+@pytest.fixture
+def queue(tmp_path, client, monkeypatch):
+    """Put the create endpoint in queue mode for the test."""
+    ingest_queue = IngestQueue(str(tmp_path), flush_interval=0)
+    client.portal.call(ingest_queue.start)
+    monkeypatch.setattr(reading_logs, "ingest_queue", ingest_queue)
+    yield ingest_queue
+    client.portal.call(ingest_queue.stop)
+
+
+def _operations(client):
+    metrics = client.get("/metrics").text
+    return next(
+        float(line.rsplit(" ", 1)[1])
+        for line in metrics.splitlines()
+        if line.startswith("reading_log_operations_total")
+        and 'operation="create"' in line
+    )
+
+
+def test_queued_retry_is_accepted_once(client, queue):
+    headers = {"Idempotency-Key": "queued"}
+    client.post("/reading-logs/", json={"duration": 10}, headers=headers)
+    before = _operations(client)
+
+    response = client.post("/reading-logs/", json={"duration": 10}, headers=headers)
+
+    assert response.status_code == 202
+    assert _operations(client) == before
+    client.portal.call(queue.stop)
+    assert len(client.get("/reading-logs/").json()) == 1
+
+
+def test_queued_reuse_with_another_body_is_rejected(client, queue):
+    headers = {"Idempotency-Key": "queued"}
+    client.post("/reading-logs/", json={"duration": 10}, headers=headers)
+
+    response = client.post("/reading-logs/", json={"duration": 20}, headers=headers)
+
+    assert response.status_code == 422
+    client.portal.call(queue.stop)
+    assert [item["duration"] for item in client.get("/reading-logs/").json()] == [10]
+
+
+def test_queued_create_does_not_touch_the_database(client, queue, monkeypatch):
+    async def unreachable(*args, **kwargs):
+        raise AssertionError("queued creates must not query idempotency keys")
+
+    monkeypatch.setattr(reading_logs, "find_response", unreachable)
+
+    response = client.post(
+        "/reading-logs/", json={"duration": 10}, headers={"Idempotency-Key": "a"}
+    )
+
+    assert response.status_code == 202
+
+
+def test_key_written_by_another_worker_is_skipped(tmp_path, client, queue):
+    headers = {"Idempotency-Key": "queued"}
+    client.post("/reading-logs/", json={"duration": 10}, headers=headers)
+    client.portal.call(queue.stop)
+    # A queue that never saw the key leaves it to the batch writer
+    other = IngestQueue(str(tmp_path / "other"), flush_interval=0)
+    client.portal.call(other.start)
+    try:
+        reading_logs.ingest_queue = other
+        response = client.post("/reading-logs/", json={"duration": 10}, headers=headers)
+    finally:
+        client.portal.call(other.stop)
+
+    assert response.status_code == 202
+    assert [item["duration"] for item in client.get("/reading-logs/").json()] == [10]
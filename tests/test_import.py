@@ -0,0 +1,96 @@
+import json
+
+from datetime import date
+
+import pytest
+
+from sqlmodel import select
+
+from app.db.database import engine
+from app.models.reading_log_daily import ReadingLogDaily
+
+
+def _import(client, body, import_format="ndjson"):
+    if isinstance(body, str):
+        body = body.encode()
+    return client.post(
+        "/reading-logs/import", params={"format": import_format}, content=body
+    )
+
+
+def _ndjson(*records):
+    return "\n".join(json.dumps(record) for record in records)
+
+
+def _all(client):
+    return client.get("/reading-logs/", params={"sort": "created_at"}).json()
+
+
+def test_import_ndjson_and_csv(client):
+    ndjson = _import(client, _ndjson({"duration": 10, "description": "a"}))
+    csv = _import(
+        client,
+        "duration,description,created_at\n20,b,2024-01-02T03:04:05\n",
+        "csv",
+    )
+
+    assert ndjson.status_code == csv.status_code == 200
+    assert ndjson.json()["rows"] == csv.json()["rows"] == 1
+    assert [(item["duration"], item["description"]) for item in _all(client)] == [
+        (20, "b"),
+        (10, "a"),
+    ]
+
+
+@pytest.mark.parametrize(
+    ("body", "import_format", "line"),
+    [
+        (_ndjson({"duration": 10}) + "\n{not json", "ndjson", 2),
+        (_ndjson({"duration": 10}, {"duration": 20}, {"duration": "x"}), "ndjson", 3),
+        ("duration,description\n10,a\n,missing duration\n", "csv", 3),
+    ],
+)
+def test_import_reports_the_failing_line_and_writes_nothing(
+    client, body, import_format, line
+):
+    response = _import(client, body, import_format)
+
+    assert response.status_code == 422
+    assert response.json()["detail"].startswith(f"Line {line}:")
+    assert _all(client) == []
+
+
+def test_import_rejects_invalid_utf8(client):
+    response = _import(client, b'{"duration": 10, "description": "caf\xe9"}\n')
+
+    assert response.status_code == 422
+    assert "UTF-8" in response.json()["detail"]
+    assert _all(client) == []
+
+
+def test_import_stores_empty_descriptions_as_null(client):
+    _import(client, _ndjson({"duration": 10, "description": ""}))
+    _import(client, "duration,description\n20,\n", "csv")
+
+    assert [item["description"] for item in _all(client)] == [None, None]
+
+
+def test_import_converts_offsets_to_utc(client):
+    response = _import(
+        client,
+        _ndjson(
+            {
+                "duration": 10,
+                "created_at": "2024-06-01T23:30:00-02:00",
+                "updated_at": "2024-06-02T09:00:00+09:00",
+            }
+        ),
+    )
+    assert response.status_code == 200, response.text
+
+    (reading_log,) = _all(client)
+    assert reading_log["created_at"] == "2024-06-02T01:30:00"
+    assert reading_log["updated_at"] == "2024-06-02T00:00:00"
+    with engine.connect() as connection:
+        days = connection.execute(select(ReadingLogDaily.day)).scalars().all()
+    assert days == [date(2024, 6, 2)]
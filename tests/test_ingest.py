@@ -0,0 +1,112 @@
+import fcntl
+import json
+import os
+import time
+
+import pytest
+
+from app.db.ingest import IngestQueue, IngestQueueFullError
+from app.models.reading_log import ReadingLog
+
+
+@pytest.fixture
+def run(client):
+    """Run a coroutine function on the application's event loop."""
+    return client.portal.call
+
+
+def _is_locked(path):
+    with open(path, "a", encoding="utf-8") as spool:
+        try:
+            fcntl.flock(spool, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return True
+        return False
+
+
+def test_spool_is_locked_before_it_is_visible(tmp_path, run):
+    queue = IngestQueue(str(tmp_path))
+    run(queue.start)
+    try:
+        (spool,) = tmp_path.iterdir()
+        assert spool.suffix == ".ndjson"
+        assert _is_locked(spool)
+    finally:
+        run(queue.stop)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_orphaned_spools_are_replayed_once(tmp_path, run, client):
+    orphan = tmp_path / "1-1.ndjson"
+    orphan.write_text(
+        "\n".join(
+            json.dumps(
+                {
+                    "idempotency_key": key,
+                    "duration": 10,
+                    "description": None,
+                    "created_at": "2024-01-01T00:00:00",
+                }
+            )
+            for key in ("a", "b", "a")
+        )
+        + "\n"
+    )
+    stale = tmp_path / "2-2.locking"
+    stale.touch()
+    os.utime(stale, (time.time() - 3600, time.time() - 3600))
+    starting = tmp_path / "3-3.locking"
+    starting.touch()
+
+    queue = IngestQueue(str(tmp_path), flush_interval=0)
+    run(queue.start)
+    run(queue.stop)
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["3-3.locking"]
+    assert len(client.get("/reading-logs/").json()) == 2
+
+
+def test_torn_spool_line_is_quarantined(tmp_path, run, client):
+    entry = {"duration": 10, "description": None, "created_at": "2024-01-01T00:00:00"}
+    orphan = tmp_path / "1-1.ndjson"
+    orphan.write_text(
+        "".join(
+            json.dumps({"idempotency_key": key, **entry}) + "\n" for key in ("a", "b")
+        )
+        # A crash mid-write leaves the last line cut short
+        + '{"idempotency_key": "c", "dura'
+    )
+
+    queue = IngestQueue(str(tmp_path), flush_interval=0)
+    run(queue.start)
+    try:
+        accepted = run(
+            queue.enqueue, "d", "fingerprint", ReadingLog(duration=5, description=None)
+        )
+    finally:
+        run(queue.stop)
+
+    assert accepted
+    assert queue.failures == 0
+    assert len(client.get("/reading-logs/").json()) == 3
+    assert not orphan.exists()
+    assert (tmp_path / "1-1.corrupt").read_text() == '{"idempotency_key": "c", "dura\n'
+
+
+def test_dead_writer_rejects_new_reading_logs(tmp_path, run, monkeypatch):
+    async def fail() -> None:
+        raise RuntimeError("writer failed")
+
+    queue = IngestQueue(str(tmp_path))
+    monkeypatch.setattr(queue, "_replay_orphaned_spools", fail)
+    run(queue.start)
+    try:
+        with pytest.raises(IngestQueueFullError):
+            run(
+                queue.enqueue,
+                "a",
+                "fingerprint",
+                ReadingLog(duration=5, description=None),
+            )
+    finally:
+        run(queue.stop)
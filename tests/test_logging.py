@@ -0,0 +1,76 @@
+import json
+import logging
+import queue
+import random
+import sys
+
+import pytest
+
+from app.support.logging_support import (
+    JSONFormatter,
+    SamplingFilter,
+    _NonBlockingQueueHandler,
+)
+
+
+def _record(name="app", level=logging.INFO, msg="hello %s", args=("world",), **extra):
+    record = logging.LogRecord(name, level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_sampling_keeps_the_configured_fraction():
+    sampling = SamplingFilter({"noisy": 0.25})
+    random.seed(1)
+
+    kept = sum(sampling.filter(_record("noisy.child")) for _ in range(4000))
+
+    assert 900 < kept < 1100
+
+
+@pytest.mark.parametrize(
+    ("name", "level", "rates", "kept"),
+    [
+        ("noisy", logging.INFO, {"noisy": 0.0}, False),
+        ("noisy", logging.WARNING, {"noisy": 0.0}, True),
+        ("noisy.child", logging.DEBUG, {"noisy": 0.0, "noisy.child": 1.0}, True),
+        ("noisier", logging.INFO, {"noisy": 0.0}, True),
+        ("other", logging.INFO, {"noisy": 0.0}, True),
+    ],
+)
+def test_sampling_applies_to_loggers_and_their_children(name, level, rates, kept):
+    assert SamplingFilter(rates).filter(_record(name, level)) is kept
+
+
+def test_json_formatter_fields():
+    record = _record(request_id="abc", status=200)
+    record.created = 1700000000.123456
+
+    entry = json.loads(JSONFormatter().format(record))
+
+    assert entry == {
+        "timestamp": "2023-11-14T22:13:20.123Z",
+        "level": "INFO",
+        "logger": "app",
+        "message": "hello world",
+        "request_id": "abc",
+        "status": 200,
+    }
+
+
+def test_json_formatter_includes_the_traceback_rendered_on_the_caller():
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = _record(level=logging.ERROR)
+        record.exc_info = sys.exc_info()
+    handler = _NonBlockingQueueHandler(queue.SimpleQueue())
+
+    prepared = handler.prepare(record)
+    entry = json.loads(JSONFormatter().format(prepared))
+
+    # Rendered before queueing, so the listener thread needs no live objects
+    assert prepared.exc_info is None and prepared.args is None
+    assert entry["message"] == "hello world"
+    assert entry["exception"].startswith("Traceback")
+    assert "ValueError: boom" in entry["exception"]
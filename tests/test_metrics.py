@@ -0,0 +1,98 @@
+import json
+
+from app.support import metrics
+from app.support.metrics import MetricsRegistry, mark_process_dead
+
+
+def _registry():
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests", ("route",))
+    in_flight = registry.gauge("in_flight", "Requests in flight")
+    latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    return registry, requests, in_flight, latency
+
+
+def test_exposition_format():
+    registry, requests, in_flight, latency = _registry()
+    requests.inc('/a"b')
+    requests.inc('/a"b', amount=2)
+    in_flight.set(3)
+    for value in (0.05, 0.1, 0.5, 20):
+        latency.observe(value)
+
+    assert registry.render().splitlines() == [
+        "# HELP requests_total Requests",
+        "# TYPE requests_total counter",
+        'requests_total{route="/a\\"b"} 3',
+        "# HELP in_flight Requests in flight",
+        "# TYPE in_flight gauge",
+        "in_flight 3",
+        "# HELP latency_seconds Latency",
+        "# TYPE latency_seconds histogram",
+        # Buckets are cumulative, and a bound counts as inside its bucket
+        'latency_seconds_bucket{le="0.1"} 2',
+        'latency_seconds_bucket{le="1.0"} 3',
+        'latency_seconds_bucket{le="+Inf"} 4',
+        "latency_seconds_sum 20.65",
+        "latency_seconds_count 4",
+    ]
+
+
+def test_routes_are_labelled_by_template_or_unmatched(client):
+    client.get("/reading-logs/123456")
+    client.get("/no-such-page")
+
+    exposition = client.get("/metrics").text
+
+    assert (
+        'http_requests_total{method="GET",route="/reading-logs/{reading_log_id}",'
+        'status="404"}' in exposition
+    )
+    assert (
+        'http_requests_total{method="GET",route="unmatched",status="404"}' in exposition
+    )
+
+
+def test_worker_snapshots_are_summed(tmp_path, monkeypatch):
+    for pid, (count, in_flight_now) in {101: (2, 1), 102: (5, 4)}.items():
+        registry, requests, in_flight, latency = _registry()
+        requests.inc("/a", amount=count)
+        in_flight.set(in_flight_now)
+        latency.observe(0.5)
+        monkeypatch.setattr(metrics.os, "getpid", lambda pid=pid: pid)
+        registry.write_snapshot(tmp_path)
+
+    mark_process_dead(tmp_path, 101)
+    lines = metrics.render_snapshots(tmp_path).splitlines()
+
+    assert json.loads((tmp_path / "101.json").read_text())["live"] is False
+    # Exited workers still count towards counters and histograms, not gauges
+    assert 'requests_total{route="/a"} 7' in lines
+    assert "in_flight 4" in lines
+    assert 'latency_seconds_bucket{le="1.0"} 2' in lines
+    assert "latency_seconds_count 2" in lines
+
+
+def test_metrics_endpoint_reports_every_worker(client, tmp_path, monkeypatch):
+    other = {
+        "live": True,
+        "families": [
+            {
+                "name": "reading_log_operations_total",
+                "documentation": "Reading log operations",
+                "kind": "counter",
+                "samples": [
+                    ["reading_log_operations_total", ["operation"], ["import"], 1000]
+                ],
+            }
+        ],
+    }
+    (tmp_path / "1.json").write_text(json.dumps(other))
+    monkeypatch.setenv("METRICS_MULTIPROCESS_DIR", str(tmp_path))
+
+    exposition = client.get("/metrics").text
+
+    assert 'reading_log_operations_total{operation="import"}' in exposition
+    assert exposition.count("# TYPE reading_log_operations_total counter") == 1
+    own = [line for line in exposition.splitlines() if "http_requests_total{" in line]
+    assert own
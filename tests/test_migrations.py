@@ -0,0 +1,91 @@
+import pytest
+
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.exc import OperationalError
+from sqlmodel import SQLModel
+
+from app.db.migrations import (
+    LATEST_VERSION,
+    MIGRATIONS,
+    apply_migration,
+    current_version,
+    ensure_schema,
+    run_migrations,
+)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrations.db'}")
+    yield engine
+    engine.dispose()
+
+
+def test_migrations_apply_once_in_order(engine):
+    assert run_migrations(engine) == [migration.version for migration in MIGRATIONS]
+    assert run_migrations(engine) == []
+    assert current_version(engine) == LATEST_VERSION
+
+
+def test_migrated_schema_matches_the_models(engine):
+    run_migrations(engine)
+    inspector = inspect(engine)
+
+    for table in SQLModel.metadata.sorted_tables:
+        columns = {
+            column["name"]: column["nullable"]
+            for column in inspector.get_columns(table.name)
+        }
+        assert columns == {column.name: column.nullable for column in table.columns}
+        indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+        assert {index.name for index in table.indexes} <= indexes
+
+
+def test_rollup_migration_backfills_existing_reading_logs(engine):
+    rollup = next(migration for migration in MIGRATIONS if migration.version == 3)
+    run_migrations(engine)
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "INSERT INTO readinglog (duration, created_at) VALUES "
+                "(10, '2024-01-01 08:00:00'), (20, '2024-01-01 22:00:00'), "
+                "(5, '2024-01-02 00:30:00')"
+            )
+        )
+        connection.execute(text("DELETE FROM schema_migrations WHERE version = 3"))
+
+    apply_migration(engine, rollup)
+
+    with engine.connect() as connection:
+        rows = connection.execute(
+            text(
+                "SELECT day, total_duration, count FROM reading_log_daily ORDER BY day"
+            )
+        ).all()
+    assert [tuple(row) for row in rows] == [("2024-01-01", 30, 2), ("2024-01-02", 5, 1)]
+
+
+def test_check_mode_refuses_an_unmigrated_database(engine):
+    with pytest.raises(RuntimeError, match="version 0"):
+        ensure_schema(engine, "check")
+
+    run_migrations(engine)
+    ensure_schema(engine, "check")
+
+
+def test_check_mode_reports_an_unreachable_database_as_such():
+    unreachable = create_engine("sqlite:////nonexistent/dir/migrations.db")
+
+    with pytest.raises(OperationalError):
+        ensure_schema(unreachable, "check")
+
+
+def test_skip_mode_leaves_the_database_alone(engine):
+    ensure_schema(engine, "skip")
+
+    assert inspect(engine).get_table_names() == []
+
+
+def test_unknown_startup_mode_is_rejected(engine):
+    with pytest.raises(ValueError, match="DB_STARTUP_MODE"):
+        ensure_schema(engine, "upgrade")
@@ -0,0 +1,90 @@
+from typing import List
+
+import pytest
+
+from fastapi.testclient import TestClient
+
+
+def _pages(client: TestClient, **params) -> List[List[int]]:
+    """Follow X-Next-Cursor from the first page and return the IDs per page."""
+    pages = []
+    cursor = None
+    while True:
+        response = client.get(
+            "/reading-logs/",
+            params={**params, **({"cursor": cursor} if cursor else {})},
+        )
+        assert response.status_code == 200, response.text
+        pages.append([item["id"] for item in response.json()])
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.parametrize(
+    ("sort", "key"),
+    [
+        ("created_at", lambda item: (item["created_at"], item["id"])),
+        ("-created_at", lambda item: (item["created_at"], item["id"])),
+        ("duration", lambda item: (item["duration"], item["id"])),
+        ("-duration", lambda item: (item["duration"], item["id"])),
+    ],
+)
+def test_cursor_pages_cover_every_row_once_in_order(
+    client, create_reading_logs, sort, key
+):
+    # Repeated durations exercise the id tiebreaker
+    created = create_reading_logs(
+        *({"duration": duration} for duration in (30, 10, 30, 20, 10, 30, 20))
+    )
+    expected = [
+        item["id"] for item in sorted(created, key=key, reverse=sort.startswith("-"))
+    ]
+
+    pages = _pages(client, sort=sort, limit=3)
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert [reading_log_id for page in pages for reading_log_id in page] == expected
+
+
+def test_full_last_page_is_followed_by_an_empty_one(client, create_reading_logs):
+    create_reading_logs(*({"duration": 10} for _ in range(4)))
+
+    assert [len(page) for page in _pages(client, limit=2)] == [2, 2, 0]
+
+
+def test_cursor_respects_filters(client, create_reading_logs):
+    created = create_reading_logs(
+        *({"duration": duration} for duration in (5, 50, 15, 60, 25))
+    )
+    expected = sorted(
+        (item for item in created if item["duration"] >= 15),
+        key=lambda item: (item["duration"], item["id"]),
+    )
+
+    pages = _pages(client, sort="duration", min_duration=15, limit=2)
+
+    assert [reading_log_id for page in pages for reading_log_id in page] == [
+        item["id"] for item in expected
+    ]
+
+
+def test_zero_limit_returns_an_empty_page(client, create_reading_logs):
+    create_reading_logs({"duration": 10})
+
+    response = client.get("/reading-logs/", params={"limit": 0})
+
+    assert response.status_code == 200
+    assert response.json() == []
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_cursor_from_another_sort_is_rejected(client, create_reading_logs):
+    create_reading_logs({"duration": 10}, {"duration": 20})
+    cursor = client.get(
+        "/reading-logs/", params={"sort": "duration", "limit": 1}
+    ).headers["X-Next-Cursor"]
+
+    response = client.get("/reading-logs/", params={"cursor": cursor, "limit": 1})
+
+    assert response.status_code == 400
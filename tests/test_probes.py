@@ -0,0 +1,90 @@
+import asyncio
+
+from contextlib import asynccontextmanager
+
+import pytest
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+
+import app.main
+
+from app.db.database import async_engine
+from app.db.readiness import ReadinessCheck
+
+
+class CountingEngine:
+    """Stands in for an AsyncEngine, counting queries that take a moment each."""
+
+    def __init__(self):
+        self.queries = 0
+
+    @asynccontextmanager
+    async def connect(self):
+        yield self
+
+    async def execute(self, statement):
+        self.queries += 1
+        await asyncio.sleep(0.01)
+
+
+@pytest.fixture
+def statements():
+    """Statements sent to the application's database, as a list."""
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+
+def test_result_is_reused_until_it_expires():
+    engine = CountingEngine()
+
+    async def scenario():
+        cached = ReadinessCheck(engine, cache_seconds=60)
+        results = await asyncio.gather(*(cached.check() for _ in range(10)))
+        await cached.check()
+        expiring = ReadinessCheck(engine, cache_seconds=0)
+        await expiring.check()
+        await expiring.check()
+        return results
+
+    results = asyncio.run(scenario())
+
+    assert results == [(True, None)] * 10
+    # One query shared by the concurrent probes, then one per expired check
+    assert engine.queries == 3
+
+
+def test_readyz_is_503_while_the_database_is_unreachable(client, monkeypatch):
+    unreachable = create_async_engine("sqlite+aiosqlite:////nonexistent/dir/db.sqlite")
+    monkeypatch.setattr(app.main, "readiness", ReadinessCheck(unreachable))
+
+    response = client.get("/readyz")
+
+    assert response.status_code == 503
+    # Only the exception type, never connection details
+    assert response.json() == {"status": "unavailable", "error": "OperationalError"}
+
+
+def test_readyz_queries_once_per_cache_period(client, monkeypatch, statements):
+    monkeypatch.setattr(
+        app.main, "readiness", ReadinessCheck(async_engine, cache_seconds=60)
+    )
+
+    responses = [client.get("/readyz") for _ in range(3)]
+
+    assert [response.status_code for response in responses] == [200] * 3
+    assert statements == ["SELECT 1"]
+
+
+def test_livez_never_touches_the_database(client, statements):
+    response = client.get("/livez")
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "alive"}
+    assert statements == []
@@ -0,0 +1,59 @@
+from datetime import datetime
+
+import pytest
+
+from app.db.database import engine
+from app.db.listing import list_statement
+from app.db.query_plans import explain
+from app.models.reading_log import ReadingLogSort
+
+CREATED_AT_INDEX = "ix_readinglog_created_at_id"
+DURATION_INDEX = "ix_readinglog_duration_id"
+
+FULL_PAGE = ("id", "duration", "description", "created_at", "updated_at")
+
+
+@pytest.mark.parametrize(
+    ("sort", "options", "index"),
+    [
+        (ReadingLogSort.created_at, {"offset": 1000}, CREATED_AT_INDEX),
+        (ReadingLogSort.created_at_desc, {}, CREATED_AT_INDEX),
+        (
+            ReadingLogSort.created_at,
+            {"after": (datetime(2024, 1, 1), 1)},
+            CREATED_AT_INDEX,
+        ),
+        (
+            ReadingLogSort.created_at_desc,
+            {"after": (datetime(2024, 1, 1), 1)},
+            CREATED_AT_INDEX,
+        ),
+        (
+            ReadingLogSort.created_at,
+            {
+                "created_after": datetime(2024, 1, 1),
+                "created_before": datetime(2024, 2, 1),
+            },
+            CREATED_AT_INDEX,
+        ),
+        (ReadingLogSort.duration, {"after": (60, 1)}, DURATION_INDEX),
+        (ReadingLogSort.duration_desc, {"after": (60, 1)}, DURATION_INDEX),
+        (
+            ReadingLogSort.duration_desc,
+            {"min_duration": 30, "max_duration": 60},
+            DURATION_INDEX,
+        ),
+    ],
+)
+def test_list_query_uses_its_index(sort, options, index):
+    plan = explain(engine, list_statement(FULL_PAGE, sort, **options))
+
+    assert index in plan, plan
+
+
+def test_sparse_fieldset_query_uses_its_index():
+    statement = list_statement(
+        ("id", "created_at", "updated_at"), ReadingLogSort.created_at
+    )
+
+    assert CREATED_AT_INDEX in explain(engine, statement)
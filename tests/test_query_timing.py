@@ -0,0 +1,20 @@
+import pytest
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.db.query_timing import instrument_queries
+
+
+def test_failed_statements_leave_no_start_times(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'timing.db'}")
+    instrument_queries(engine)
+
+    with engine.connect() as connection:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                connection.execute(text("SELECT * FROM missing"))
+        connection.execute(text("SELECT 1"))
+
+        assert connection.info["query_started"] == []
+    engine.dispose()
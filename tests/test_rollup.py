@@ -0,0 +1,119 @@
+import json
+
+from datetime import date, datetime
+
+from sqlalchemy import func, select
+from sqlmodel import col
+
+from app.db.database import engine
+from app.db.rollup import daily_deltas, rebuild_daily_rollup
+from app.models.reading_log import ReadingLog
+from app.models.reading_log_daily import ReadingLogDaily
+
+
+def _rollup():
+    with engine.connect() as connection:
+        rows = connection.execute(
+            select(
+                ReadingLogDaily.day,
+                ReadingLogDaily.total_duration,
+                ReadingLogDaily.count,
+            )
+            .where(col(ReadingLogDaily.count) > 0)
+            .order_by(ReadingLogDaily.day)
+        ).all()
+    return {day: (total, count) for day, total, count in rows}
+
+
+def _recomputed():
+    with engine.connect() as connection:
+        rows = connection.execute(
+            select(ReadingLog.created_at, ReadingLog.duration)
+        ).all()
+    return dict(
+        sorted(
+            daily_deltas(
+                (created_at, duration, 1) for created_at, duration in rows
+            ).items()
+        )
+    )
+
+
+def _today():
+    with engine.connect() as connection:
+        return (
+            connection.execute(select(func.min(ReadingLog.created_at)))
+            .scalar_one()
+            .date()
+        )
+
+
+def test_daily_deltas_sum_per_day_and_drop_no_ops():
+    deltas = daily_deltas(
+        [
+            (datetime(2024, 1, 1, 8), 10, 1),
+            (datetime(2024, 1, 1, 20), 15, 1),
+            (datetime(2024, 1, 2, 8), 5, 0),
+            (datetime(2024, 1, 2, 9), -5, 0),
+        ]
+    )
+
+    assert deltas == {date(2024, 1, 1): (25, 2)}
+
+
+def test_write_endpoints_keep_the_rollup_current(client, create_reading_logs):
+    single = client.post("/reading-logs/", json={"duration": 10}).json()
+    bulk = create_reading_logs({"duration": 20}, {"duration": 30})
+    day = _today()
+    assert _rollup() == {day: (60, 3)}
+
+    client.patch(f"/reading-logs/{single['id']}", json={"duration": 25})
+    assert _rollup() == {day: (75, 3)}
+
+    client.delete(f"/reading-logs/{bulk[0]['id']}")
+    assert _rollup() == {day: (55, 2)}
+    assert _rollup() == _recomputed()
+
+
+def test_import_adds_to_the_rollup_per_day(client):
+    records = [
+        {"duration": 10, "created_at": "2024-05-01T10:00:00"},
+        {"duration": 20, "created_at": "2024-05-01T23:00:00"},
+        {"duration": 30, "created_at": "2024-05-02T01:00:00"},
+    ]
+    response = client.post(
+        "/reading-logs/import",
+        params={"format": "ndjson"},
+        content="\n".join(json.dumps(record) for record in records),
+    )
+    assert response.status_code == 200, response.text
+
+    assert _rollup() == {date(2024, 5, 1): (30, 2), date(2024, 5, 2): (30, 1)}
+
+
+def test_rebuild_matches_the_raw_rows(client, create_reading_logs):
+    create_reading_logs({"duration": 10}, {"duration": 20})
+    with engine.begin() as connection:
+        # Drift the rollup away from the raw rows
+        connection.execute(ReadingLogDaily.__table__.update().values(count=99))  # type: ignore[attr-defined]
+
+    written = rebuild_daily_rollup(engine)
+
+    assert written == 1
+    assert _rollup() == _recomputed() == {_today(): (30, 2)}
+
+
+def test_null_duration_update_is_rejected(client):
+    reading_log = client.post("/reading-logs/", json={"duration": 10}).json()
+
+    response = client.patch(
+        f"/reading-logs/{reading_log['id']}", json={"duration": None}
+    )
+
+    assert response.status_code == 422
+    assert _rollup() == {_today(): (10, 1)}
+    described = client.patch(
+        f"/reading-logs/{reading_log['id']}", json={"description": "kept"}
+    )
+    assert described.status_code == 200
+    assert described.json()["duration"] == 10
@@ -0,0 +1,39 @@
+def _search(client, q, **params):
+    response = client.get("/reading-logs/search", params={"q": q, **params})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_search_matches_every_term(client, create_reading_logs):
+    create_reading_logs(
+        {"duration": 10, "description": "a history of rome"},
+        {"duration": 20, "description": "roman poetry"},
+        {"duration": 30, "description": "history and poetry of greece"},
+        {"duration": 40},
+    )
+
+    assert sorted(item["duration"] for item in _search(client, "history")) == [10, 30]
+    assert [item["duration"] for item in _search(client, "poetry history")] == [30]
+    assert _search(client, "cookbook") == []
+
+
+def test_search_results_are_ranked_and_paged(client, create_reading_logs):
+    create_reading_logs(
+        {"duration": 10, "description": "novel"},
+        {"duration": 20, "description": "novel novel novel"},
+    )
+
+    results = _search(client, "novel")
+    assert [item["duration"] for item in results] == [20, 10]
+    assert results[0]["rank"] >= results[1]["rank"]
+    assert [item["duration"] for item in _search(client, "novel", offset=1)] == [10]
+
+
+def test_search_input_cannot_inject_operators(client, create_reading_logs):
+    create_reading_logs({"duration": 10, "description": 'say "hello" OR'})
+
+    assert [item["duration"] for item in _search(client, '"hello" OR')] == [10]
+
+
+def test_blank_query_is_rejected(client):
+    assert client.get("/reading-logs/search", params={"q": "  "}).status_code == 400
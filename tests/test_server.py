@@ -0,0 +1,65 @@
+import logging
+
+import pytest
+
+from gunicorn.config import Config
+
+from app.support.server import (
+    ProductionLogger,
+    ProductionUvicornWorker,
+    _cgroup_cpu_limit,
+)
+
+
+@pytest.mark.parametrize(
+    ("files", "limit"),
+    [
+        ({"cpu.max": "max 100000\n"}, None),
+        ({"cpu.max": "150000 100000\n"}, 2),
+        ({"cpu.max": "50000 100000\n"}, 1),
+        ({"cpu/cpu.cfs_quota_us": "400000\n", "cpu/cpu.cfs_period_us": "100000\n"}, 4),
+        ({"cpu/cpu.cfs_quota_us": "-1\n", "cpu/cpu.cfs_period_us": "100000\n"}, None),
+        ({}, None),
+    ],
+)
+def test_cgroup_cpu_limit(tmp_path, files, limit):
+    for name, content in files.items():
+        path = tmp_path / name
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(content)
+
+    assert _cgroup_cpu_limit(tmp_path) == limit
+
+
+@pytest.fixture
+def restore_loggers():
+    names = ("gunicorn.error", "gunicorn.access", "uvicorn.error", "uvicorn.access")
+    saved = {
+        name: (
+            logging.getLogger(name).handlers,
+            logging.getLogger(name).level,
+            logging.getLogger(name).propagate,
+        )
+        for name in names
+    }
+    yield
+    for name, (handlers, level, propagate) in saved.items():
+        log = logging.getLogger(name)
+        log.handlers, log.propagate = handlers, propagate
+        log.setLevel(level)
+
+
+def test_server_loggers_propagate_to_the_root_handler(restore_loggers):
+    cfg = Config()
+    gunicorn_log = ProductionLogger(cfg)
+    ProductionUvicornWorker(0, 0, [], None, 30, cfg, gunicorn_log)
+
+    for name in (
+        "gunicorn.error",
+        "gunicorn.access",
+        "uvicorn.error",
+        "uvicorn.access",
+    ):
+        log = logging.getLogger(name)
+        assert log.handlers == []
+        assert log.propagate
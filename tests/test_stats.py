@@ -0,0 +1,68 @@
+import json
+
+
+def _import(client, *records):
+    response = client.post(
+        "/reading-logs/import",
+        params={"format": "ndjson"},
+        content="\n".join(json.dumps(record) for record in records),
+    )
+    assert response.status_code == 200, response.text
+
+
+def test_stats_per_day_week_and_month(client):
+    _import(
+        client,
+        # Monday and Wednesday of one week, then the next Monday
+        {"duration": 10, "created_at": "2024-01-01T08:00:00"},
+        {"duration": 20, "created_at": "2024-01-01T21:00:00"},
+        {"duration": 30, "created_at": "2024-01-03T12:00:00"},
+        {"duration": 40, "created_at": "2024-01-08T12:00:00"},
+        {"duration": 50, "created_at": "2024-02-01T12:00:00"},
+    )
+
+    def buckets(bucket):
+        response = client.get("/reading-logs/stats", params={"bucket": bucket})
+        assert response.status_code == 200, response.text
+        return [
+            (item["period_start"], item["total_minutes"], item["session_count"])
+            for item in response.json()["buckets"]
+        ]
+
+    assert buckets("day") == [
+        ("2024-01-01", 30, 2),
+        ("2024-01-03", 30, 1),
+        ("2024-01-08", 40, 1),
+        ("2024-02-01", 50, 1),
+    ]
+    assert buckets("week") == [
+        ("2024-01-01", 60, 3),
+        ("2024-01-08", 40, 1),
+        ("2024-01-29", 50, 1),
+    ]
+    assert buckets("month") == [("2024-01-01", 100, 4), ("2024-02-01", 50, 1)]
+
+
+def test_stats_date_range_is_inclusive(client):
+    _import(
+        client,
+        {"duration": 10, "created_at": "2024-03-01T00:00:00"},
+        {"duration": 20, "created_at": "2024-03-02T23:59:59"},
+        {"duration": 40, "created_at": "2024-03-03T00:00:00"},
+    )
+
+    response = client.get(
+        "/reading-logs/stats", params={"start": "2024-03-01", "end": "2024-03-02"}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["total_minutes"] == 30
+    assert response.json()["session_count"] == 2
+
+
+def test_stats_rejects_reversed_range(client):
+    response = client.get(
+        "/reading-logs/stats", params={"start": "2024-03-02", "end": "2024-03-01"}
+    )
+
+    assert response.status_code == 400